@@ -1,4 +1,38 @@
 from .auth_entity import User, BannedRefreshToken, Token, Profile
-from .cars_entity import Car, Image
+from .cars_entity import (
+    Car,
+    CarEvent,
+    CarFilter,
+    CarPatch,
+    CarPriceChange,
+    CarStat,
+    CarValuation,
+    Image,
+    VinInfo,
+)
+from .outbox_entity import OutboxMessage
+from .page_entity import ResultCount
+from .saved_search_entity import SavedSearch
+from .storage_entity import ImageBlob, StoredObject, UploadForm
 
-__all__ = ["User", "BannedRefreshToken", "Token", "Profile", "Car", "Image"]
+__all__ = [
+    "User",
+    "BannedRefreshToken",
+    "Token",
+    "Profile",
+    "Car",
+    "CarEvent",
+    "CarFilter",
+    "CarPatch",
+    "CarPriceChange",
+    "CarStat",
+    "CarValuation",
+    "Image",
+    "VinInfo",
+    "OutboxMessage",
+    "ResultCount",
+    "SavedSearch",
+    "ImageBlob",
+    "StoredObject",
+    "UploadForm",
+]
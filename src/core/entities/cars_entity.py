@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Any, List, Optional
 from uuid import UUID, uuid4
 from datetime import datetime
 
@@ -22,12 +22,16 @@ class Car:
     features: List[str] = field(
         default_factory=list
     )  # Список особенностей/опций (e.g., "ABS", "Airbags", "Navigation", "Sunroof")
+    latitude: Optional[float] = None  # Где находится машина
+    longitude: Optional[float] = None
     images: List["Image"] = field(
         default_factory=list
     )  # Список изображений (связь с другой сущностью)
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
     id: UUID = field(default_factory=uuid4)
+    version: int = 1  # Версия строки для оптимистичной блокировки
+    status: str = "active"  # "active", "sold" или "expired"
 
 
 @dataclass
@@ -39,3 +43,85 @@ class Image:  # Отдельная сущность для изображени
     created_at: datetime = field(default_factory=datetime.now)
     uploaded_at: datetime = field(default_factory=datetime.now)
     id: UUID = field(default_factory=uuid4)
+    blob_sha256: Optional[str] = None  # общий объект в хранилище, если загружено
+
+
+@dataclass
+class CarPriceChange:  # Запись истории цены
+    car_id: UUID
+    new_price: float
+    old_price: Optional[float] = None  # None для первой цены объявления
+    changed_at: datetime = field(default_factory=datetime.now)
+    id: UUID = field(default_factory=uuid4)
+
+
+@dataclass
+class CarEvent:  # Изменение в каталоге, приходит из NOTIFY триггера на cars
+    op: str  # "insert", "update", "delete" или "resync" после переподключения
+    car_id: Optional[UUID] = None
+    car: Optional[dict[str, Any]] = None  # строка после изменения (до - для delete)
+    old: Optional[dict[str, Any]] = None  # строка до изменения, только для update
+    truncated: bool = False  # payload не влез в NOTIFY, данные нужно перечитать
+
+
+@dataclass
+class CarValuation:  # Перцентили цен сегмента из car_valuation_stats
+    make: str
+    model: str
+    year: int
+    mileage_band: int  # -1 - по всем пробегам года
+    listings: int
+    p10: float
+    p25: float
+    median: float
+    p75: float
+    p90: float
+    refreshed_at: datetime
+
+
+@dataclass
+class CarStat:  # Агрегат каталога по одному значению измерения
+    dimension: str  # "make", "body_style" или "year"
+    value: str
+    count: int
+    price_sum: float
+    min_price: float
+    max_price: float
+
+    @property
+    def avg_price(self) -> float:
+        return self.price_sum / self.count
+
+
+@dataclass
+class CarFilter:  # Условия отбора машин для поиска и массовых операций
+    ids: Optional[List[UUID]] = None
+    make: Optional[str] = None
+    model: Optional[str] = None
+    body_style: Optional[str] = None
+    fuel_type: Optional[str] = None
+    condition: Optional[str] = None
+    min_year: Optional[int] = None
+    max_year: Optional[int] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+
+    def is_empty(self) -> bool:
+        return all(value is None for value in vars(self).values())
+
+
+@dataclass
+class CarPatch:  # Изменение, применяемое ко всем отобранным машинам
+    set_price: Optional[float] = None  # новая цена
+    price_delta: Optional[float] = None  # прибавка к цене, может быть < 0
+    price_percent: Optional[float] = None  # изменение цены в процентах, -5 = скидка 5%
+    condition: Optional[str] = None
+
+
+@dataclass
+class VinInfo:  # Результат офлайн-расшифровки VIN
+    vin: str
+    valid: bool  # 17 допустимых символов
+    make: Optional[str] = None  # по WMI, None если производитель не в таблице
+    model_year: Optional[int] = None
+    check_digit_valid: Optional[bool] = None  # None - проверка не применяется
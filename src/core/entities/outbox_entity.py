@@ -0,0 +1,13 @@
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import UUID, uuid4
+from datetime import datetime
+
+
+@dataclass
+class OutboxMessage:  # Побочный эффект записи, выполняется фоновым диспетчером
+    topic: str  # например "car.created"
+    payload: dict[str, Any]
+    attempts: int = 0  # сколько раз сообщение забирали, включая текущий
+    created_at: datetime = field(default_factory=datetime.now)
+    id: UUID = field(default_factory=uuid4)
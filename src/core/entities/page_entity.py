@@ -0,0 +1,7 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class ResultCount:  # Всего результатов для заголовка "N результатов"
+    value: int
+    exact: bool = True  # False - оценка планировщика, не меньше лимита подсчета
@@ -0,0 +1,50 @@
+from dataclasses import dataclass, field
+from typing import Optional
+from uuid import UUID, uuid4
+from datetime import datetime
+
+from core.entities.cars_entity import Car
+
+
+@dataclass
+class SavedSearch:  # Сохраненный поиск покупателя, по нему рассылаются уведомления
+    user_id: UUID
+    name: str
+    make: Optional[str] = None
+    model: Optional[str] = None
+    fuel_type: Optional[str] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    min_year: Optional[int] = None
+    max_year: Optional[int] = None
+    min_mileage: Optional[int] = None
+    max_mileage: Optional[int] = None
+    created_at: datetime = field(default_factory=datetime.now)
+    id: UUID = field(default_factory=uuid4)
+
+    def matches(self, car: Car) -> bool:
+        # Развернуто вручную: вызывается для каждого кандидата при записи машины
+        if self.make is not None and (
+            normalize_value(car.make) != normalize_value(self.make)
+        ):
+            return False
+        if self.model is not None and (
+            normalize_value(car.model) != normalize_value(self.model)
+        ):
+            return False
+        if self.fuel_type is not None and (
+            normalize_value(car.fuel_type) != normalize_value(self.fuel_type)
+        ):
+            return False
+        return (
+            (self.min_price is None or car.price >= self.min_price)
+            and (self.max_price is None or car.price <= self.max_price)
+            and (self.min_year is None or car.year >= self.min_year)
+            and (self.max_year is None or car.year <= self.max_year)
+            and (self.min_mileage is None or car.mileage >= self.min_mileage)
+            and (self.max_mileage is None or car.mileage <= self.max_mileage)
+        )
+
+
+def normalize_value(value: Optional[str]) -> Optional[str]:
+    return value.strip().casefold() if value is not None else None
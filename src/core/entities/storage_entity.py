@@ -0,0 +1,30 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass
+class StoredObject:  # Метаданные объекта в хранилище (ответ на HEAD)
+    key: str
+    size: int  # байт
+    content_type: Optional[str] = None
+    sha256: Optional[str] = None  # hex, если хранилище его сообщает
+
+
+@dataclass
+class ImageBlob:  # Содержимое изображения, общее для одинаковых загрузок
+    sha256: str  # hex, он же ключ объекта
+    size: int
+    content_type: str
+    ref_count: int = 0  # изображений, ссылающихся на объект
+    uploaded: bool = False  # объект проверен в хранилище
+    created_at: datetime = field(default_factory=datetime.now)
+    released_at: Optional[datetime] = None  # когда перестал использоваться
+
+
+@dataclass
+class UploadForm:  # Presigned POST: браузер отправляет файл прямо в хранилище
+    url: str
+    key: str
+    fields: dict[str, str] = field(default_factory=dict)  # поля формы до файла
+    expires_at: datetime = field(default_factory=datetime.now)
@@ -69,6 +69,20 @@ class InvalidTokenError(HTTPException):
         )
 
 
+class ForbiddenError(HTTPException):
+    def __init__(self, detail: str = "Forbidden"):
+        super().__init__(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+
+
+class PreconditionFailedError(HTTPException):
+    def __init__(self, etag: str, detail: str = "Precondition failed"):
+        super().__init__(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=detail,
+            headers={"ETag": etag},
+        )
+
+
 class InvalidRequestError(HTTPException):
     def __init__(self, detail: str = "Invalid request"):
         super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
@@ -92,3 +106,12 @@ class UnsupportedGrantTypeError(HTTPException):
 class InvalidScopeError(HTTPException):
     def __init__(self, detail: str = "Invalid scope"):
         super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+class TooManyRequestsError(HTTPException):
+    def __init__(self, retry_after: int, detail: str = "Too many requests"):
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)},
+        )
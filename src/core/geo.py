@@ -0,0 +1,85 @@
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+GEOHASH_PRECISION = 9  # ~4.8 x 4.8 м, хранится в cars.geohash
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def encode_geohash(lat: float, lon: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        target, span = (lon, lon_range) if even else (lat, lat_range)
+        middle = (span[0] + span[1]) / 2
+        value <<= 1
+        if target >= middle:
+            value |= 1
+            span[0] = middle
+        else:
+            span[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+
+def cell_size(precision: int) -> tuple[float, float]:
+    """Returns (lat, lon) degrees covered by one cell of the given precision."""
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180 / 2**lat_bits, 360 / 2**lon_bits
+
+
+def covering_cells(
+    lat: float, lon: float, radius_km: float, max_cells: int = 16
+) -> list[str]:
+    """Geohash prefixes whose cells together cover the circle.
+
+    Picks the finest precision at which the bounding box of the circle
+    spans at most `max_cells` cells, so the database scans a few narrow
+    index ranges instead of the whole table.
+    """
+    angle = radius_km / EARTH_RADIUS_KM
+    dlat = math.degrees(angle)
+    south, north = max(-90.0, lat - dlat), min(90.0, lat + dlat)
+    # Самая широкая точка круга лежит ближе к полюсу, чем его центр
+    ratio = math.sin(angle) / max(math.cos(math.radians(lat)), 1e-12)
+    if south == -90.0 or north == 90.0 or ratio >= 1:
+        dlon = 180.0
+    else:
+        dlon = math.degrees(math.asin(ratio))
+
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_step, lon_step = cell_size(precision)
+        rows = math.floor((north + 90) / lat_step) - math.floor((south + 90) / lat_step)
+        columns = math.floor((lon + dlon + 180) / lon_step) - math.floor(
+            (lon - dlon + 180) / lon_step
+        )
+        if (rows + 1) * (columns + 1) <= max_cells:
+            break
+    else:
+        return [""]  # круг больше полушария - подходит любая ячейка
+
+    cells = set()
+    lat_index = math.floor((south + 90) / lat_step)
+    while lat_index * lat_step - 90 <= north and lat_index * lat_step < 180:
+        cell_lat = lat_index * lat_step - 90 + lat_step / 2
+        lon_index = math.floor((lon - dlon + 180) / lon_step)
+        while lon_index * lon_step - 180 <= lon + dlon:
+            cell_lon = (lon_index * lon_step + lon_step / 2) % 360 - 180
+            cells.add(encode_geohash(cell_lat, cell_lon, precision))
+            lon_index += 1
+        lat_index += 1
+    return sorted(cells)
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi, dlambda = phi2 - phi1, math.radians(lon2 - lon1)
+    a = (
+        math.sin(dphi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
@@ -0,0 +1,13 @@
+from .saved_search_index import SavedSearchIndex, saved_search_index
+from .similarity_index import SimilarityIndex, similarity_index
+from .suggest_index import SUGGEST_KINDS, SuggestIndex, suggest_index
+
+__all__ = [
+    "SavedSearchIndex",
+    "saved_search_index",
+    "SimilarityIndex",
+    "similarity_index",
+    "SUGGEST_KINDS",
+    "SuggestIndex",
+    "suggest_index",
+]
@@ -0,0 +1,246 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Hashable, Iterable
+from uuid import UUID
+
+from core.entities import Car, SavedSearch
+from core.entities.saved_search_entity import normalize_value
+
+EQUALITY_FIELDS = ("make", "model", "fuel_type")
+RANGE_FIELDS = ("price", "year", "mileage")
+
+
+class _Node:
+    __slots__ = ("center", "by_low", "by_high", "left", "right")
+
+    def __init__(self, center, by_low, by_high, left, right):
+        self.center = center
+        self.by_low = by_low  # (low, key) по возрастанию low
+        self.by_high = by_high  # (high, key) по убыванию high
+        self.left = left
+        self.right = right
+
+
+class IntervalTree:
+    """Centered interval tree answering "which intervals contain x".
+
+    The tree itself is static. Additions go to a small pending list, and
+    removals become tombstones. Both are merged into a rebuilt tree once
+    they outgrow a fraction of the indexed set, which keeps single-search
+    writes cheap and stabbing queries O(log n + k).
+    """
+
+    def __init__(self, rebuild_ratio: float = 0.1, min_pending: int = 256):
+        self.rebuild_ratio = rebuild_ratio
+        self.min_pending = min_pending
+        self._intervals: dict[Hashable, tuple[float, float]] = {}
+        self._root: _Node | None = None
+        self._pending: dict[Hashable, tuple[float, float]] = {}
+        self._removed: set[Hashable] = set()
+
+    def __len__(self) -> int:
+        return len(self._intervals)
+
+    def load(self, intervals: dict[Hashable, tuple[float, float]]) -> None:
+        self._intervals = {
+            key: (low, high) for key, (low, high) in intervals.items() if low <= high
+        }
+        self.rebuild()
+
+    def add(self, key: Hashable, low: float, high: float) -> None:
+        if key in self._intervals:
+            self.remove(key)
+        if low > high:
+            return  # пустой интервал не содержит ни одной точки
+        self._intervals[key] = (low, high)
+        self._pending[key] = (low, high)
+        self._maybe_rebuild()
+
+    def remove(self, key: Hashable) -> None:
+        if self._intervals.pop(key, None) is None:
+            return
+        if self._pending.pop(key, None) is None:
+            self._removed.add(key)
+        self._maybe_rebuild()
+
+    def stab(self, point: float) -> list[Hashable]:
+        result = []
+        node = self._root
+        while node is not None:
+            if point < node.center:
+                for low, key in node.by_low:
+                    if low > point:
+                        break
+                    result.append(key)
+                node = node.left
+            elif point > node.center:
+                for high, key in node.by_high:
+                    if high < point:
+                        break
+                    result.append(key)
+                node = node.right
+            else:
+                result.extend(key for _, key in node.by_low)
+                break
+        if self._removed:
+            result = [key for key in result if key not in self._removed]
+        result.extend(
+            key for key, (low, high) in self._pending.items() if low <= point <= high
+        )
+        return result
+
+    def _maybe_rebuild(self) -> None:
+        changes = len(self._pending) + len(self._removed)
+        if changes > max(self.min_pending, len(self._intervals) * self.rebuild_ratio):
+            self.rebuild()
+
+    def rebuild(self) -> None:
+        self._root = self._build(
+            [(low, high, key) for key, (low, high) in self._intervals.items()]
+        )
+        self._pending.clear()
+        self._removed.clear()
+
+    @classmethod
+    def _build(cls, intervals: list[tuple[float, float, Hashable]]) -> _Node | None:
+        if not intervals:
+            return None
+        endpoints = sorted(point for low, high, _ in intervals for point in (low, high))
+        center = endpoints[len(endpoints) // 2]
+        left, right, here = [], [], []
+        for interval in intervals:
+            if interval[1] < center:
+                left.append(interval)
+            elif interval[0] > center:
+                right.append(interval)
+            else:
+                here.append(interval)
+        return _Node(
+            center=center,
+            by_low=sorted(
+                ((low, key) for low, _, key in here), key=lambda item: item[0]
+            ),
+            by_high=sorted(
+                ((high, key) for _, high, key in here),
+                key=lambda item: item[0],
+                reverse=True,
+            ),
+            left=cls._build(left),
+            right=cls._build(right),
+        )
+
+
+class SavedSearchIndex:
+    """In-memory index of saved search predicates.
+
+    Every search is stored once, under its most selective predicate (its
+    "anchor"). Equality anchors go into buckets keyed by normalized value,
+    and range anchors go into per-field interval trees. To match a car, only
+    the buckets for its own make/model/fuel_type and the intervals that
+    contain its price/year/mileage are read. Those candidates are then
+    checked in full, so a search that can never match is never looked at.
+    """
+
+    def __init__(self):
+        self.as_of: datetime | None = None  # когда прочитан загруженный снимок
+        self._reset()
+
+    def __len__(self) -> int:
+        return len(self._searches)
+
+    def _reset(self) -> None:
+        self._searches: dict[UUID, SavedSearch] = {}
+        self._anchors: dict[UUID, tuple[str, str | None]] = {}
+        self._buckets = {name: defaultdict(set) for name in EQUALITY_FIELDS}
+        self._trees = {name: IntervalTree() for name in RANGE_FIELDS}
+        self._unconstrained: set[UUID] = set()
+
+    def load(
+        self, searches: Iterable[SavedSearch], as_of: datetime | None = None
+    ) -> None:
+        """Replaces the whole index, building every interval tree once."""
+        self._reset()
+        self.as_of = as_of
+        intervals = {name: {} for name in RANGE_FIELDS}
+        for search in searches:
+            self._searches[search.id] = search
+            name, value = self._anchors[search.id] = _anchor(search)
+            if name in intervals:
+                intervals[name][search.id] = _range_bounds(search, name)
+            else:
+                self._store(search.id, name, value)
+        for name in RANGE_FIELDS:
+            self._trees[name].load(intervals[name])
+
+    def add(self, search: SavedSearch) -> None:
+        if search.id in self._searches:
+            self.remove(search.id)
+        self._searches[search.id] = search
+        name, value = self._anchors[search.id] = _anchor(search)
+        if name in self._trees:
+            self._trees[name].add(search.id, *_range_bounds(search, name))
+        else:
+            self._store(search.id, name, value)
+
+    def remove(self, search_id: UUID) -> None:
+        if self._searches.pop(search_id, None) is None:
+            return
+        name, value = self._anchors.pop(search_id)
+        if name in self._trees:
+            self._trees[name].remove(search_id)
+        elif name in self._buckets:
+            bucket = self._buckets[name][value]
+            bucket.discard(search_id)
+            if not bucket:
+                del self._buckets[name][value]
+        else:
+            self._unconstrained.discard(search_id)
+
+    def match(self, car: Car) -> list[SavedSearch]:
+        """Returns every saved search the car satisfies."""
+        candidates = [self._unconstrained]
+        for name in EQUALITY_FIELDS:
+            bucket = self._buckets[name].get(normalize_value(getattr(car, name)))
+            if bucket:
+                candidates.append(bucket)
+        for name in RANGE_FIELDS:
+            if self._trees[name]:
+                candidates.append(self._trees[name].stab(getattr(car, name)))
+
+        return [
+            search
+            for group in candidates
+            for search_id in group
+            if (search := self._searches[search_id]).matches(car)
+        ]
+
+    def _store(self, search_id: UUID, name: str, value: str | None) -> None:
+        if name in self._buckets:
+            self._buckets[name][value].add(search_id)
+        else:
+            self._unconstrained.add(search_id)
+
+
+def _anchor(search: SavedSearch) -> tuple[str, str | None]:
+    """Picks the predicate the search is indexed under: equality first."""
+    for name in EQUALITY_FIELDS:
+        value = normalize_value(getattr(search, name))
+        if value is not None:
+            return name, value
+    for name in RANGE_FIELDS:
+        if _range_bounds(search, name) is not None:
+            return name, None
+    return "*", None
+
+
+def _range_bounds(search: SavedSearch, name: str) -> tuple[float, float] | None:
+    low, high = getattr(search, f"min_{name}"), getattr(search, f"max_{name}")
+    if low is None and high is None:
+        return None
+    return (
+        float("-inf") if low is None else low,
+        float("inf") if high is None else high,
+    )
+
+
+saved_search_index = SavedSearchIndex()
@@ -0,0 +1,186 @@
+from typing import Any, AsyncIterable, Iterable, Mapping
+from uuid import UUID
+
+import numpy as np
+
+NUMERIC_FEATURES = ("price", "year", "mileage", "engine_capacity")
+CATEGORICAL_FEATURES = ("make", "body_style", "fuel_type", "transmission")
+
+
+class SimilarityIndex:
+    """In-memory feature matrix of the catalog for nearest-neighbour queries.
+
+    Features are stored column by column as float32, so a query streams
+    each column once through preallocated buffers. Numeric features are
+    z-normalized with running column sums: a write costs O(1) and the
+    statistics never need a full pass. Categorical features are integer
+    codes; a mismatch adds 2, the squared distance between one-hot vectors.
+    Free rows hold NaN, which argpartition sorts last, so no mask is needed.
+    """
+
+    def __init__(self, capacity: int = 1024, categorical_weight: float = 1.0):
+        self.categorical_weight = categorical_weight
+        self._allocate_storage(capacity)
+        self._ids: list[UUID | None] = [None] * capacity
+        self._rows: dict[UUID, int] = {}
+        self._free: list[int] = []
+        self._size = 0  # строки [0, _size) когда-либо использовались
+        self._vocab: list[dict[str, int]] = [{} for _ in CATEGORICAL_FEATURES]
+        self._sum = np.zeros(len(NUMERIC_FEATURES))
+        self._sum_sq = np.zeros(len(NUMERIC_FEATURES))
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, car_id: UUID) -> bool:
+        return car_id in self._rows
+
+    def load(self, cars: Iterable[tuple[UUID, Mapping[str, Any]]]) -> None:
+        """Replaces the whole matrix in one pass."""
+        cars = list(cars)
+        staged = SimilarityIndex(max(1024, len(cars)), self.categorical_weight)
+        staged._extend(cars)
+        self.__dict__.update(vars(staged))
+
+    async def load_chunks(
+        self, chunks: AsyncIterable[list[tuple[UUID, Mapping[str, Any]]]]
+    ) -> None:
+        """Replaces the whole matrix with rows arriving in chunks.
+
+        Chunks are appended to a staged matrix that replaces the current one
+        only at the end: queries made between chunks see the old catalog.
+        """
+        staged = SimilarityIndex(categorical_weight=self.categorical_weight)
+        async for chunk in chunks:
+            staged._extend(chunk)
+        self.__dict__.update(vars(staged))
+
+    def upsert(self, car_id: UUID, values: Mapping[str, Any]) -> None:
+        row = self._rows.get(car_id)
+        if row is None:
+            row = self._allocate()
+            self._rows[car_id] = row
+            self._ids[row] = car_id
+        else:
+            self._account(row, -1)
+        self._numeric[:, row] = self._numeric_values(values)
+        self._codes[:, row] = self._encode(values)
+        self._account(row, +1)
+
+    def remove(self, car_id: UUID) -> None:
+        row = self._rows.pop(car_id, None)
+        if row is None:
+            return
+        self._account(row, -1)
+        self._numeric[:, row] = np.nan
+        self._ids[row] = None
+        self._free.append(row)
+
+    def similar(
+        self, values: Mapping[str, Any], k: int = 10, exclude: UUID | None = None
+    ) -> list[tuple[UUID, float]]:
+        """Returns up to k (car_id, distance) pairs, nearest first."""
+        n = self._size
+        count = len(self._rows)
+        excluded = self._rows.get(exclude) if exclude is not None else None
+        k = min(k, count - (excluded is not None))
+        if k <= 0:
+            return []
+        mean = self._sum / count
+        std = np.sqrt(np.maximum(self._sum_sq / count - mean**2, 0.0))
+        inv_std = np.divide(1.0, std, out=np.zeros_like(std), where=std > 0)
+        query = self._numeric_values(values)
+
+        distance = np.zeros(n, dtype=np.float32)
+        column = np.empty(n, dtype=np.float32)
+        for j, point in enumerate(query):
+            np.subtract(self._numeric[j, :n], np.float32(point), out=column)
+            np.multiply(column, np.float32(inv_std[j]), out=column)
+            np.square(column, out=column)
+            np.add(distance, column, out=distance)
+        mismatches = column
+        mismatches.fill(0)
+        mismatch = np.empty(n, dtype=bool)
+        for j, code in enumerate(self._lookup(values)):
+            np.not_equal(self._codes[j, :n], code, out=mismatch)
+            np.add(mismatches, mismatch, out=mismatches)
+        np.multiply(mismatches, np.float32(2 * self.categorical_weight), out=mismatches)
+        np.add(distance, mismatches, out=distance)
+
+        if excluded is not None:
+            distance[excluded] = np.nan
+        nearest = np.argpartition(distance, k - 1)[:k]
+        nearest = nearest[np.argsort(distance[nearest])]
+        return [(self._ids[row], float(distance[row])) for row in nearest]
+
+    @staticmethod
+    def _numeric_values(values: Mapping[str, Any]) -> list[float]:
+        return [float(values[name] or 0) for name in NUMERIC_FEATURES]
+
+    @staticmethod
+    def _categories(values: Mapping[str, Any]) -> list[str]:
+        return [
+            str(values[name] or "").strip().casefold() for name in CATEGORICAL_FEATURES
+        ]
+
+    def _encode(self, values: Mapping[str, Any]) -> list[int]:
+        """Codes of a stored car; unseen values are added to the vocabulary."""
+        return [
+            vocab.setdefault(value, len(vocab))
+            for vocab, value in zip(self._vocab, self._categories(values))
+        ]
+
+    def _lookup(self, values: Mapping[str, Any]) -> list[int]:
+        """Codes of a query; unseen values get -1, which matches no car."""
+        return [
+            vocab.get(value, -1)
+            for vocab, value in zip(self._vocab, self._categories(values))
+        ]
+
+    def _extend(self, cars: list[tuple[UUID, Mapping[str, Any]]]) -> None:
+        """Appends new cars after the used rows, in bulk."""
+        start, end = self._size, self._size + len(cars)
+        while end > self._numeric.shape[1]:
+            self._grow()
+        if not cars:
+            return
+        numeric = [self._numeric_values(values) for _, values in cars]
+        codes = [self._encode(values) for _, values in cars]
+        self._numeric[:, start:end] = np.array(numeric, dtype=np.float64).T
+        self._codes[:, start:end] = np.array(codes, dtype=np.int32).T
+        for row, (car_id, _) in enumerate(cars, start):
+            self._ids[row] = car_id
+            self._rows[car_id] = row
+        self._size = end
+        added = self._numeric[:, start:end].astype(np.float64)
+        self._sum += added.sum(axis=1)
+        self._sum_sq += (added**2).sum(axis=1)
+
+    def _account(self, row: int, sign: int) -> None:
+        values = self._numeric[:, row].astype(np.float64)
+        self._sum += sign * values
+        self._sum_sq += sign * values**2
+
+    def _allocate(self) -> int:
+        if self._free:
+            return self._free.pop()
+        if self._size == self._numeric.shape[1]:
+            self._grow()
+        self._size += 1
+        return self._size - 1
+
+    def _allocate_storage(self, capacity: int) -> None:
+        self._numeric = np.full(
+            (len(NUMERIC_FEATURES), capacity), np.nan, dtype=np.float32
+        )
+        self._codes = np.zeros((len(CATEGORICAL_FEATURES), capacity), dtype=np.int32)
+
+    def _grow(self) -> None:
+        numeric, codes = self._numeric, self._codes
+        self._allocate_storage(numeric.shape[1] * 2)
+        self._numeric[:, : numeric.shape[1]] = numeric
+        self._codes[:, : codes.shape[1]] = codes
+        self._ids.extend([None] * (self._numeric.shape[1] - len(self._ids)))
+
+
+similarity_index = SimilarityIndex()
@@ -0,0 +1,95 @@
+import heapq
+from bisect import bisect_left, insort
+from typing import Any, Iterable, Mapping
+
+SUGGEST_KINDS = ("make", "model", "feature")
+
+
+class SuggestIndex:
+    """Prefix index of catalog terms for typeahead, ranked by popularity.
+
+    Terms are kept as a sorted list of (normalized term, kind) pairs, so all
+    completions of a prefix form one contiguous slice found by bisection.
+    Each term carries the number of cars using it; a car write moves the
+    counts of its old and new terms, and a term is dropped once unused.
+    """
+
+    def __init__(self):
+        self._terms: list[tuple[str, str]] = []
+        self._counts: dict[tuple[str, str], int] = {}
+        self._labels: dict[tuple[str, str], str] = {}  # написание для ответа
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def load(self, terms: Iterable[tuple[str, str, int]]) -> None:
+        """Replaces the index with (kind, value, count) triples."""
+        counts: dict[tuple[str, str], int] = {}
+        labels: dict[tuple[str, str], str] = {}
+        for kind, value, count in terms:
+            key = (self._normalize(value), kind)
+            if key[0] and count > 0:
+                counts[key] = counts.get(key, 0) + count
+                labels.setdefault(key, value.strip())
+        self._terms = sorted(counts)
+        self._counts, self._labels = counts, labels
+
+    def apply(
+        self,
+        old: Mapping[str, Any] | None = None,
+        new: Mapping[str, Any] | None = None,
+    ) -> None:
+        """Moves counts from the terms of the old car row to the new one."""
+        for kind, value in self.car_terms(old):
+            self._add(kind, value, -1)
+        for kind, value in self.car_terms(new):
+            self._add(kind, value, +1)
+
+    def suggest(
+        self, prefix: str, limit: int = 10, kinds: Iterable[str] | None = None
+    ) -> list[tuple[str, str, int]]:
+        """Returns up to `limit` (kind, value, count), most popular first."""
+        prefix = self._normalize(prefix)
+        if not prefix:
+            return []
+        start = bisect_left(self._terms, (prefix, ""))
+        end = bisect_left(self._terms, (prefix + "\uffff", ""), lo=start)
+        matches = self._terms[start:end]
+        if kinds is not None:
+            kinds = set(kinds)
+            matches = [key for key in matches if key[1] in kinds]
+        # Как sorted(reverse=True): при равной популярности - по алфавиту
+        best = heapq.nlargest(limit, matches, key=self._counts.get)
+        return [(key[1], self._labels[key], self._counts[key]) for key in best]
+
+    @staticmethod
+    def car_terms(row: Mapping[str, Any] | None) -> set[tuple[str, str]]:
+        if not row:
+            return set()
+        terms = {("make", row.get("make")), ("model", row.get("model"))}
+        features = row.get("features") or ()
+        if isinstance(features, str):
+            features = features.split(",")
+        terms.update(("feature", feature) for feature in features)
+        return {(kind, value.strip()) for kind, value in terms if value}
+
+    @staticmethod
+    def _normalize(value: str) -> str:
+        return " ".join(value.lower().split())
+
+    def _add(self, kind: str, value: str, delta: int) -> None:
+        key = (self._normalize(value), kind)
+        if not key[0]:
+            return
+        count = self._counts.get(key, 0) + delta
+        if count > 0:
+            if key not in self._counts:
+                insort(self._terms, key)
+                self._labels[key] = value
+            self._counts[key] = count
+        elif key in self._counts:
+            del self._counts[key], self._labels[key]
+            del self._terms[bisect_left(self._terms, key)]
+
+
+suggest_index = SuggestIndex()
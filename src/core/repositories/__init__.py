@@ -1,9 +1,20 @@
 from .auth_repository import IUserRepository, IBannedRefreshTokenRepository
 from .cars_repository import ICarRepository, IImageRepository
+from .outbox_repository import IOutboxRepository
+from .saved_search_repository import ISavedSearchRepository
+from .storage import IImageBlobRepository, IObjectStorage
+from .unit_of_work import IUnitOfWork
+from .valuation_repository import IValuationRepository
 
 __all__ = [
     "IUserRepository",
     "IBannedRefreshTokenRepository",
     "ICarRepository",
     "IImageRepository",
+    "IOutboxRepository",
+    "ISavedSearchRepository",
+    "IImageBlobRepository",
+    "IObjectStorage",
+    "IUnitOfWork",
+    "IValuationRepository",
 ]
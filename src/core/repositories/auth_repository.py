@@ -1,7 +1,9 @@
+from datetime import datetime
 from typing import List
 from abc import ABC, abstractmethod
 
 from core.entities.auth_entity import BannedRefreshToken, User
+from core.entities.page_entity import ResultCount
 
 
 class IUserRepository(ABC):
@@ -14,6 +16,10 @@ class IUserRepository(ABC):
     async def get_multi(self, offset: int, limit: int, *args, **kwargs) -> List[User]:
         pass
 
+    @abstractmethod
+    async def count(self, exact_limit: int | None = None, **filters) -> ResultCount:
+        pass
+
     @abstractmethod
     async def create(self, data: User) -> User:
         pass
@@ -32,10 +38,18 @@ class IBannedRefreshTokenRepository(ABC):
     async def get(self, *args, **kwargs) -> BannedRefreshToken | None:
         pass
 
+    @abstractmethod
+    async def is_banned(self, jti: str) -> bool:
+        pass
+
     @abstractmethod
     async def create(self, data: BannedRefreshToken) -> BannedRefreshToken:
         pass
 
+    @abstractmethod
+    async def delete_older_than(self, created_before: datetime) -> int:
+        pass
+
 class IProfileRepository(ABC):
 
     @abstractmethod
@@ -1,5 +1,17 @@
 from abc import ABC, abstractmethod
-from ..entities import Car, Image
+from datetime import timedelta
+from typing import Any, AsyncIterator
+from uuid import UUID
+
+from ..entities import (
+    Car,
+    CarFilter,
+    CarPatch,
+    CarPriceChange,
+    CarStat,
+    Image,
+    ResultCount,
+)
 
 
 class ICarRepository(ABC):
@@ -16,13 +28,102 @@ class ICarRepository(ABC):
         pass
 
     @abstractmethod
-    def update(self, data: Car, **filters) -> Car:
+    def create_many(self, cars: list[Car]) -> list[Car]:
+        pass
+
+    @abstractmethod
+    def update(
+        self, car_id: UUID, data: Car, expected_version: int | None = None
+    ) -> Car | None:
+        pass
+
+    @abstractmethod
+    def get_archived(self, car_id: UUID) -> Car | None:
+        pass
+
+    @abstractmethod
+    def expire_listings(self, older_than: timedelta) -> int:
+        pass
+
+    @abstractmethod
+    def archive_listings(self, batch_size: int) -> list[UUID]:
+        pass
+
+    @abstractmethod
+    def get_version(self, car_id: UUID) -> int | None:
         pass
 
     @abstractmethod
     def delete(self, **filters) -> Car:
         pass
 
+    @abstractmethod
+    def search(
+        self,
+        car_filter: CarFilter,
+        near: tuple[float, float] | None = None,
+        radius_km: float | None = None,
+        offset: int = 0,
+        limit: int = 50,
+    ) -> list[tuple[Car, float | None]]:
+        pass
+
+    @abstractmethod
+    def count(
+        self,
+        car_filter: CarFilter,
+        near: tuple[float, float] | None = None,
+        radius_km: float | None = None,
+        exact_limit: int | None = None,
+    ) -> ResultCount:
+        pass
+
+    @abstractmethod
+    def bulk_update(self, car_filter: CarFilter, patch: CarPatch) -> list[UUID]:
+        pass
+
+    @abstractmethod
+    def bulk_delete(self, car_filter: CarFilter) -> list[UUID]:
+        pass
+
+    @abstractmethod
+    def get_price_history(self, car_id: UUID, limit: int = 100) -> list[CarPriceChange]:
+        pass
+
+    @abstractmethod
+    def create_price_history_partitions(self, months_ahead: int) -> None:
+        pass
+
+    @abstractmethod
+    def get_stats(self, dimensions: list[str] | None = None) -> list[CarStat]:
+        pass
+
+    @abstractmethod
+    def fold_stats(self) -> int:
+        pass
+
+    @abstractmethod
+    def get_many(self, ids: list[UUID]) -> list[Car]:
+        pass
+
+    @abstractmethod
+    def get_features(self, ids: list[UUID]) -> list[tuple[UUID, dict[str, Any]]]:
+        pass
+
+    @abstractmethod
+    def iter_features(
+        self, chunk_size: int = 10_000
+    ) -> AsyncIterator[list[tuple[UUID, dict[str, Any]]]]:
+        pass
+
+    @abstractmethod
+    def get_ids_by_vins(self, vins: list[str]) -> dict[str, UUID]:
+        pass
+
+    @abstractmethod
+    def get_suggest_terms(self) -> list[tuple[str, str, int]]:
+        pass
+
 
 class IImageRepository(ABC):
     @abstractmethod
@@ -37,6 +138,10 @@ class IImageRepository(ABC):
     def create(self, data) -> Image:
         pass
 
+    @abstractmethod
+    def create_many(self, images: list[Image]) -> list[Image]:
+        pass
+
     @abstractmethod
     def update(self, data: Image, **filters) -> Image:
         pass
@@ -0,0 +1,31 @@
+from abc import ABC, abstractmethod
+from typing import Any
+from uuid import UUID
+
+from ..entities import OutboxMessage
+
+
+class IOutboxRepository(ABC):
+    @abstractmethod
+    async def add(self, topic: str, payload: dict[str, Any]) -> None:
+        pass
+
+    @abstractmethod
+    async def add_many(self, topic: str, payloads: list[dict[str, Any]]) -> None:
+        pass
+
+    @abstractmethod
+    async def claim(self, limit: int, lease: float) -> list[OutboxMessage]:
+        pass
+
+    @abstractmethod
+    async def complete(self, ids: list[UUID]) -> None:
+        pass
+
+    @abstractmethod
+    async def retry(self, message_id: UUID, error: str, delay: float) -> None:
+        pass
+
+    @abstractmethod
+    async def fail(self, message_id: UUID, error: str) -> None:
+        pass
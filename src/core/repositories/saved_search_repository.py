@@ -0,0 +1,31 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from uuid import UUID
+
+from ..entities import SavedSearch
+
+
+class ISavedSearchRepository(ABC):
+    @abstractmethod
+    async def get_multi(self, offset: int, limit: int, **filters) -> list[SavedSearch]:
+        pass
+
+    @abstractmethod
+    async def get_all(self) -> list[SavedSearch]:
+        pass
+
+    @abstractmethod
+    async def get_created_since(self, since: datetime) -> list[SavedSearch]:
+        pass
+
+    @abstractmethod
+    async def get_existing_ids(self, ids: list[UUID]) -> set[UUID]:
+        pass
+
+    @abstractmethod
+    async def create(self, data: SavedSearch) -> SavedSearch:
+        pass
+
+    @abstractmethod
+    async def delete(self, search_id: UUID, user_id: UUID) -> bool:
+        pass
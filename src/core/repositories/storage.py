@@ -0,0 +1,56 @@
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Iterable
+
+from ..entities import ImageBlob, StoredObject, UploadForm
+
+
+class IObjectStorage(ABC):
+    @abstractmethod
+    def url(self, key: str) -> str:
+        """URL under which an object is stored in images.url."""
+        pass
+
+    @abstractmethod
+    def presign_get(
+        self, keys: Iterable[str], expires_in: int, now: datetime | None = None
+    ) -> dict[str, str]:
+        """Returns {key: URL} a browser can load for `expires_in` seconds."""
+        pass
+
+    @abstractmethod
+    def create_upload(
+        self, key: str, content_type: str, size: int, sha256: str, expires_in: int
+    ) -> UploadForm:
+        pass
+
+    @abstractmethod
+    async def head(self, key: str) -> StoredObject | None:
+        pass
+
+    @abstractmethod
+    async def sha256(self, key: str) -> str | None:
+        """Hashes the stored object; for backends that do not report it."""
+        pass
+
+    @abstractmethod
+    async def delete(self, keys: list[str]) -> None:
+        pass
+
+
+class IImageBlobRepository(ABC):
+    @abstractmethod
+    def get(self, sha256: str) -> ImageBlob | None:
+        pass
+
+    @abstractmethod
+    def reserve(self, blob: ImageBlob) -> ImageBlob:
+        pass
+
+    @abstractmethod
+    def mark_uploaded(self, sha256: str, size: int, content_type: str) -> bool:
+        pass
+
+    @abstractmethod
+    def delete_released(self, older_than: timedelta, limit: int) -> list[str]:
+        pass
@@ -0,0 +1,29 @@
+from abc import ABC, abstractmethod
+
+from .cars_repository import ICarRepository, IImageRepository
+from .outbox_repository import IOutboxRepository
+
+
+class IUnitOfWork(ABC):
+    """Repositories sharing one transaction that is committed once.
+
+    Leaving the `async with` block without commit() rolls the work back.
+    """
+
+    cars: ICarRepository
+    images: IImageRepository
+    outbox: IOutboxRepository
+
+    async def __aenter__(self) -> "IUnitOfWork":
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        await self.rollback()
+
+    @abstractmethod
+    async def commit(self) -> None:
+        pass
+
+    @abstractmethod
+    async def rollback(self) -> None:
+        pass
@@ -0,0 +1,15 @@
+from abc import ABC, abstractmethod
+
+from ..entities import CarValuation
+
+
+class IValuationRepository(ABC):
+    @abstractmethod
+    async def get_segment(
+        self, make: str, model: str, year: int, mileage_bands: list[int]
+    ) -> list[CarValuation]:
+        pass
+
+    @abstractmethod
+    async def refresh(self) -> bool:
+        pass
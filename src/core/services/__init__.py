@@ -1,4 +1,15 @@
 from .auth_service import AuthService, BannedTokensService, UserService
 from .car_service import CarService
+from .image_service import ImageUploadService
+from .saved_search_service import SavedSearchService
+from .valuation_service import ValuationService
 
-__all__ = ["AuthService", "BannedTokensService", "UserService", "CarService"]
+__all__ = [
+    "AuthService",
+    "BannedTokensService",
+    "UserService",
+    "CarService",
+    "ImageUploadService",
+    "SavedSearchService",
+    "ValuationService",
+]
@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import List, Optional
 from uuid import UUID, uuid4
 
@@ -6,27 +7,37 @@ import jwt
 
 from core.repositories import IUserRepository, IBannedRefreshTokenRepository
 from core.entities.auth_entity import BannedRefreshToken, Token, User
+from core.entities.page_entity import ResultCount
 from core.exceptions import (
     AlreadyExists,
+    DuplicateEntryError,
     InvalidGrantError,
     InvalidTokenError,
     NotFoundError,
     InvalidCredentials,
+    TokenExpiredError,
 )
-from passlib.context import CryptContext
 
 from settings import get_settings
 
 config = get_settings()
 
 
+@lru_cache
+def get_password_context():
+    """Returns the process-wide bcrypt context, importing passlib on first use."""
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
 class AuthService:
     def __init__(
         self, user_repo: IUserRepository, token_repo: IBannedRefreshTokenRepository
     ):
         self.user_repo = user_repo
         self.token_repo = token_repo
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        self.pwd_context = get_password_context()
 
     async def register(self, email: str, password: str) -> User:
         existing_user = await self.user_repo.get(email=email)  # Исправлено
@@ -46,6 +57,37 @@ class AuthService:
         if not self.verify_password(password, user.hashed_password):
             raise InvalidCredentials("Incorrect email or password")
 
+        return self._issue_tokens(str(user.id), scopes or [])
+
+    async def refresh(self, token: str) -> Token:
+        """Exchanges a refresh token for a new token pair and revokes the old one.
+
+        Neither the user row nor the password hash is touched: the signed
+        payload already carries the subject and scopes.
+        """
+        try:
+            payload = jwt.decode(
+                token, config.secret_key, algorithms=[config.algorithm]
+            )
+        except jwt.ExpiredSignatureError:
+            raise TokenExpiredError()
+        except jwt.PyJWTError:
+            raise InvalidTokenError()
+        jti: str = payload.get("jti")
+        user_id: str = payload.get("sub")
+        if payload.get("type") != "refresh" or not jti or not user_id:
+            raise InvalidTokenError()
+
+        # Уникальный jti в черном списке - одновременно проверка отзыва и ротация:
+        # повторное (или конкурентное) использование токена упрется в constraint
+        try:
+            await self.token_repo.create(jti)
+        except DuplicateEntryError:
+            raise InvalidTokenError("Refresh token has been revoked")
+
+        return self._issue_tokens(user_id, payload.get("scopes") or [])
+
+    def _issue_tokens(self, user_id: str, scopes: List[str]) -> Token:
         access_token_expires = timedelta(
             minutes=config.access_token_expire_minutes
         )  # Исправлено
@@ -53,11 +95,11 @@ class AuthService:
             days=config.refresh_token_expire_days
         )  # Исправлено
         access_token = self.create_access_token(
-            data={"sub": str(user.id), "scopes": scopes or []},  # Use user.id
+            data={"sub": user_id, "scopes": scopes},
             expires_delta=access_token_expires,
         )
         refresh_token = self.create_refresh_token(
-            data={"sub": str(user.id), "scopes": scopes or []},  # Use user.id
+            data={"sub": user_id, "scopes": scopes},
             expires_delta=refresh_token_expires,
         )
 
@@ -67,7 +109,7 @@ class AuthService:
             token_type="bearer",
             access_token_expires=datetime.now(timezone.utc) + access_token_expires,
             refresh_token_expires=datetime.now(timezone.utc) + refresh_token_expires,
-            scopes=scopes or [],
+            scopes=scopes,
         )
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
@@ -141,6 +183,8 @@ class AuthService:
                 await self.token_repo.create(jti)  # Исправлено
         except jwt.PyJWTError:  # Исправлено
             raise InvalidTokenError()
+        except DuplicateEntryError:
+            pass  # токен уже отозван
 
 
 class BannedTokensService:
@@ -156,11 +200,27 @@ class BannedTokensService:
             raise AlreadyExists("User already exists")
         return await self.repo.create(data)
 
+    async def purge_expired(self, max_age: timedelta) -> int:
+        """Удаляет записи старше срока жизни refresh токена: они уже истекли."""
+        now = datetime.now(timezone.utc).replace(tzinfo=None)  # created_at в UTC
+        return await self.repo.delete_older_than(now - max_age)
+
 
 class UserService:
     def __init__(self, repo: IUserRepository):
         self.repo = repo
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        self.pwd_context = get_password_context()
 
     async def get(self, id: UUID) -> User | None:
         return await self.repo.get(id=id)
+
+    async def get_users(
+        self, offset: int = 0, limit: int = 100, **filters
+    ) -> list[User]:
+        return await self.repo.get_multi(offset, limit, **filters)
+
+    async def count_users(
+        self, exact_limit: int | None = None, **filters
+    ) -> ResultCount:
+        """Total for get_users; exact only up to `exact_limit`, if given."""
+        return await self.repo.count(exact_limit, **filters)
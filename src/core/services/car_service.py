@@ -1,25 +1,221 @@
+from datetime import timedelta
 from uuid import UUID
+from core.indexes import SimilarityIndex, SuggestIndex
+from core.repositories import IUnitOfWork
 from core.repositories.cars_repository import ICarRepository
-from core.entities import Car
-from core.entities import Image
+from core.entities import Car, CarFilter, CarPatch, CarPriceChange, CarStat
+from core.entities import Image, ResultCount, VinInfo
+from core.exceptions import PreconditionFailedError
+from core.vin import decode_vin, normalize_vin
+from utils.query_cache import QueryCache
+
+
+def car_etag(version: int) -> str:
+    return f'"{version}"'
 
 
 class CarService:
 
-    def __init__(self, cars_repository: ICarRepository):
+    def __init__(
+        self,
+        cars_repository: ICarRepository,
+        similarity_index: SimilarityIndex | None = None,
+        uow: IUnitOfWork | None = None,
+        suggest_index: SuggestIndex | None = None,
+        query_cache: QueryCache | None = None,
+    ):
         self.cars_repository = cars_repository
+        self.similarity_index = similarity_index
+        self.uow = uow
+        self.suggest_index = suggest_index
+        self.query_cache = query_cache
 
     def get_all_cars(self) -> list[Car]:
         return self.cars_repository.get()
 
-    def get_car_by_id(self, car_id: UUID) -> Car | None:
-        return self.cars_repository.get(id=car_id)
+    async def get_car_by_id(self, car_id: UUID) -> Car | None:
+        """Looks in the hot table first, then in the archive of sold cars."""
+        car = await self.cars_repository.get(id=car_id)
+        if car is None:
+            car = await self.cars_repository.get_archived(car_id)
+        return car
+
+    async def create_car(self, car_data: Car, images: list | None = None) -> Car:
+        """Creates the car with its images in a single transaction.
 
-    def create_car(self, car_data: Car) -> Car:
-        return self.cars_repository.create(car_data)
+        `images` are objects with url, description and is_main attributes.
+        """
+        async with self.uow:
+            [car] = await self.uow.cars.create_many([car_data])
+            car.images = await self.uow.images.create_many(
+                [
+                    Image(
+                        car_id=car.id,
+                        url=image.url,
+                        description=image.description,
+                        is_main=image.is_main,
+                    )
+                    for image in images or []
+                ]
+            )
+            await self.uow.commit()
+        return car
 
-    def update_car(self, car_id: UUID, car_data: Car) -> Car:
-        return self.cars_repository.update(id=car_id, model=car_data)
+    async def update_car(
+        self, car_id: UUID, car_data: Car, expected_version: int | None = None
+    ) -> Car | None:
+        """Replaces the car if it is still at `expected_version`.
+
+        Returns None for a missing car and raises PreconditionFailedError,
+        carrying the current ETag, when someone else has updated it first.
+        """
+        car = await self.cars_repository.update(car_id, car_data, expected_version)
+        if car is None and expected_version is not None:
+            # Только на неудачном пути: отличаем конфликт от удаленной машины
+            version = await self.cars_repository.get_version(car_id)
+            if version is not None:
+                raise PreconditionFailedError(
+                    car_etag(version), detail="The car was modified by someone else"
+                )
+        return car
 
     def delete_car(self, car_id: UUID) -> bool:
         return self.cars_repository.delete(id=car_id)
+
+    async def bulk_update(self, car_filter: CarFilter, patch: CarPatch) -> list[UUID]:
+        """Returns ids of the updated cars."""
+        return await self.cars_repository.bulk_update(car_filter, patch)
+
+    async def bulk_delete(self, car_filter: CarFilter) -> list[UUID]:
+        """Returns ids of the deleted cars."""
+        return await self.cars_repository.bulk_delete(car_filter)
+
+    async def check_vins(
+        self, vins: list[str]
+    ) -> list[tuple[VinInfo, UUID | None]]:
+        """Decodes each VIN and finds the car already listed under it.
+
+        Results follow the input order, duplicates collapsed. Only valid
+        VINs are looked up, all in one query.
+        """
+        decoded = [decode_vin(vin) for vin in dict.fromkeys(map(normalize_vin, vins))]
+        existing = await self.cars_repository.get_ids_by_vins(
+            [info.vin for info in decoded if info.valid]
+        )
+        return [(info, existing.get(info.vin)) for info in decoded]
+
+    async def search_cars(
+        self,
+        car_filter: CarFilter,
+        near: tuple[float, float] | None = None,
+        radius_km: float | None = None,
+        offset: int = 0,
+        limit: int = 50,
+    ) -> list[tuple[Car, float | None]]:
+        """Returns (car, distance in km) pairs; distance is None without `near`."""
+
+        def load():
+            return self.cars_repository.search(
+                car_filter, near=near, radius_km=radius_km, offset=offset, limit=limit
+            )
+
+        if self.query_cache is None:
+            return await load()
+        key = self.query_cache.make_key(
+            "cars.search",
+            **vars(car_filter),
+            near=near,
+            radius_km=radius_km,
+            offset=offset,
+            limit=limit,
+        )
+        return await self.query_cache.get_or_load(key, load)
+
+    async def count_cars(
+        self,
+        car_filter: CarFilter,
+        near: tuple[float, float] | None = None,
+        radius_km: float | None = None,
+        exact_limit: int | None = None,
+    ) -> ResultCount:
+        """Total for search_cars; exact only up to `exact_limit` matches."""
+
+        def load():
+            return self.cars_repository.count(
+                car_filter, near=near, radius_km=radius_km, exact_limit=exact_limit
+            )
+
+        if self.query_cache is None:
+            return await load()
+        key = self.query_cache.make_key(
+            "cars.count",
+            **vars(car_filter),
+            near=near,
+            radius_km=radius_km,
+            exact_limit=exact_limit,
+        )
+        return await self.query_cache.get_or_load(key, load)
+
+    def get_price_history(self, car_id: UUID, limit: int = 100) -> list[CarPriceChange]:
+        return self.cars_repository.get_price_history(car_id, limit=limit)
+
+    async def archive_listings(
+        self, expire_after: timedelta, batch_size: int = 1000
+    ) -> int:
+        """Expires stale listings and moves inactive ones to the archive.
+
+        Works in batches, each in its own transaction, so locks stay short.
+        """
+        await self.cars_repository.expire_listings(expire_after)
+        archived = 0
+        while True:
+            ids = await self.cars_repository.archive_listings(batch_size)
+            archived += len(ids)
+            if len(ids) < batch_size:
+                return archived
+
+    async def create_price_history_partitions(self, months_ahead: int = 2) -> None:
+        await self.cars_repository.create_price_history_partitions(months_ahead)
+
+    async def fold_stats(self) -> int:
+        return await self.cars_repository.fold_stats()
+
+    async def get_stats(
+        self, dimensions: list[str] | None = None
+    ) -> dict[str, list[CarStat]]:
+        """Returns catalog aggregates grouped by dimension."""
+        stats: dict[str, list[CarStat]] = {}
+        for stat in await self.cars_repository.get_stats(dimensions):
+            stats.setdefault(stat.dimension, []).append(stat)
+        return stats
+
+    async def get_similar_cars(
+        self, car_id: UUID, limit: int = 10
+    ) -> list[tuple[Car, float]] | None:
+        """Returns the nearest cars with distances, or None for an unknown car."""
+        car = await self.cars_repository.get(id=car_id)
+        if car is None:
+            return None
+        nearest = self.similarity_index.similar(vars(car), k=limit, exclude=car_id)
+        distances = dict(nearest)
+        cars = await self.cars_repository.get_many(list(distances))
+        return [(similar, distances[similar.id]) for similar in cars]
+
+    async def load_similarity_index(self) -> int:
+        """Rebuilds the feature matrix from the database, chunk by chunk."""
+        await self.similarity_index.load_chunks(self.cars_repository.iter_features())
+        return len(self.similarity_index)
+
+    async def load_suggest_index(self) -> int:
+        """Rebuilds the typeahead index from the distinct catalog values."""
+        self.suggest_index.load(await self.cars_repository.get_suggest_terms())
+        return len(self.suggest_index)
+
+    async def refresh_similarity(self, car_ids: list[UUID]) -> None:
+        """Re-reads the given cars into the index; missing ones are removed."""
+        rows = dict(await self.cars_repository.get_features(car_ids))
+        for car_id in car_ids:
+            if car_id in rows:
+                self.similarity_index.upsert(car_id, rows[car_id])
+            else:
+                self.similarity_index.remove(car_id)
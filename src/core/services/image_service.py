@@ -0,0 +1,128 @@
+from datetime import timedelta
+from uuid import UUID
+
+from core.entities import Image, ImageBlob, UploadForm
+from core.exceptions import InvalidRequestError, NotFoundError
+from core.repositories import (
+    ICarRepository,
+    IImageBlobRepository,
+    IImageRepository,
+    IObjectStorage,
+)
+from utils.logger import get_logger
+
+logger = get_logger()
+
+IMAGE_CONTENT_TYPES = frozenset({"image/jpeg", "image/png", "image/webp"})
+
+
+def blob_key(sha256: str) -> str:
+    return f"blobs/sha256/{sha256}"
+
+
+class ImageUploadService:
+    """Two-step image upload straight to the object storage.
+
+    Objects are stored under the SHA-256 of their content, which the client
+    computes while reading the file. Identical photos share one object:
+    if it is already stored, no upload form is issued and the client goes
+    straight to completing. The API only signs forms and reads object
+    metadata; it reads an object back only to hash it when the storage
+    does not report the checksum itself.
+    """
+
+    def __init__(
+        self,
+        images_repository: IImageRepository,
+        blobs_repository: IImageBlobRepository,
+        cars_repository: ICarRepository,
+        storage: IObjectStorage,
+        max_size: int,
+        upload_ttl: int,
+    ):
+        self.images_repository = images_repository
+        self.blobs_repository = blobs_repository
+        self.cars_repository = cars_repository
+        self.storage = storage
+        self.max_size = max_size
+        self.upload_ttl = upload_ttl
+
+    async def create_upload(
+        self, car_id: UUID, content_type: str, size: int, sha256: str
+    ) -> tuple[ImageBlob, UploadForm | None]:
+        """Returns the blob and a form to upload it, None if already stored."""
+        if content_type not in IMAGE_CONTENT_TYPES:
+            raise InvalidRequestError(f"Unsupported image type: {content_type}")
+        if not 0 < size <= self.max_size:
+            raise InvalidRequestError("Image is too large")
+        await self._ensure_car(car_id)
+        blob = await self.blobs_repository.reserve(
+            ImageBlob(sha256=sha256, size=size, content_type=content_type)
+        )
+        if blob.uploaded:
+            return blob, None
+        form = self.storage.create_upload(
+            blob_key(sha256), content_type, size, sha256, self.upload_ttl
+        )
+        return blob, form
+
+    async def complete_upload(
+        self,
+        car_id: UUID,
+        sha256: str,
+        description: str | None = None,
+        is_main: bool = False,
+    ) -> Image:
+        """Attaches the stored content to the car as a new image."""
+        await self._ensure_car(car_id)
+        blob = await self.blobs_repository.get(sha256)
+        if blob is None:
+            raise NotFoundError("Upload not found or expired")
+        if not blob.uploaded:
+            await self._verify(blob)
+        return await self.images_repository.create(
+            Image(
+                car_id=car_id,
+                url=self.storage.url(blob_key(sha256)),
+                description=description,
+                is_main=is_main,
+                blob_sha256=sha256,
+            )
+        )
+
+    async def collect_garbage(self, grace: timedelta, batch_size: int) -> int:
+        """Deletes objects no image has referenced for longer than `grace`.
+
+        The grace period covers uploads in progress: a reserved blob has no
+        references until its upload is completed.
+        """
+        collected = 0
+        while keys := await self.blobs_repository.delete_released(grace, batch_size):
+            await self.storage.delete([blob_key(sha256) for sha256 in keys])
+            collected += len(keys)
+            if len(keys) < batch_size:
+                break
+        return collected
+
+    async def _verify(self, blob: ImageBlob) -> None:
+        stored = await self.storage.head(blob_key(blob.sha256))
+        if stored is None:
+            raise NotFoundError("Uploaded image not found")
+        if not 0 < stored.size <= self.max_size:
+            raise InvalidRequestError("Uploaded image has an invalid size")
+        if stored.content_type not in IMAGE_CONTENT_TYPES:
+            raise InvalidRequestError("Uploaded file is not a supported image")
+        # Ключ принимается только с подтвержденным хешем: хранилище могло
+        # проигнорировать контрольную сумму из формы загрузки
+        sha256 = stored.sha256 or await self.storage.sha256(stored.key)
+        if sha256 != blob.sha256:
+            await self.storage.delete([stored.key])
+            raise InvalidRequestError("Uploaded image does not match its checksum")
+        await self.blobs_repository.mark_uploaded(
+            blob.sha256, stored.size, stored.content_type
+        )
+        logger.info("Stored image blob %s (%d bytes)", blob.sha256, stored.size)
+
+    async def _ensure_car(self, car_id: UUID) -> None:
+        if await self.cars_repository.get_version(car_id) is None:
+            raise NotFoundError("Car not found")
@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from core.entities import Car, SavedSearch
+from core.indexes import SavedSearchIndex
+from core.repositories import ISavedSearchRepository
+from utils.logger import get_logger
+
+logger = get_logger()
+
+# Запас на задержку коммита и расхождение часов между воркерами
+SNAPSHOT_MARGIN = timedelta(minutes=1)
+
+
+class SavedSearchService:
+    def __init__(self, repo: ISavedSearchRepository, index: SavedSearchIndex):
+        self.repo = repo
+        self.index = index
+
+    async def get_user_searches(
+        self, user_id: UUID, offset: int = 0, limit: int = 100
+    ) -> list[SavedSearch]:
+        return await self.repo.get_multi(offset, limit, user_id=user_id)
+
+    async def create(self, data: SavedSearch) -> SavedSearch:
+        search = await self.repo.create(data)
+        self.index.add(search)
+        return search
+
+    async def delete(self, search_id: UUID, user_id: UUID) -> bool:
+        deleted = await self.repo.delete(search_id, user_id)
+        if deleted:
+            self.index.remove(search_id)
+        return deleted
+
+    async def load_index(self) -> int:
+        """Rebuilds the in-memory index from the database."""
+        as_of = datetime.now(timezone.utc).replace(tzinfo=None)
+        self.index.load(await self.repo.get_all(), as_of)
+        return len(self.index)
+
+    async def match_car(self, car: Car) -> list[UUID]:
+        """Returns ids of users whose saved searches the car satisfies.
+
+        The index is this worker's snapshot: searches created or deleted
+        through other workers since its last load are missing from it.
+        Searches created after the snapshot are read from the database and
+        checked directly, and every match is confirmed to still exist.
+        """
+        matched = {search.id: search for search in self.index.match(car)}
+        since = self.index.as_of - SNAPSHOT_MARGIN if self.index.as_of else datetime.min
+        for search in await self.repo.get_created_since(since):
+            if search.matches(car):
+                matched[search.id] = search
+        existing = await self.repo.get_existing_ids(list(matched))
+        user_ids = list({matched[search_id].user_id for search_id in existing})
+        if user_ids:
+            logger.info(
+                "Car %s matches saved searches of %d users", car.id, len(user_ids)
+            )
+        return user_ids
@@ -0,0 +1,34 @@
+from core.entities import CarValuation
+from core.repositories import IValuationRepository
+
+MILEAGE_BAND = 20_000  # должен совпадать с шагом в car_valuation_stats
+ALL_MILEAGES = -1
+
+
+class ValuationService:
+    def __init__(self, repo: IValuationRepository, min_listings: int = 5):
+        self.repo = repo
+        self.min_listings = min_listings
+
+    async def get_valuation(
+        self, make: str, model: str, year: int, mileage: int | None = None
+    ) -> CarValuation | None:
+        """Returns percentiles for the mileage band of the car.
+
+        A band with fewer than min_listings cars falls back to the whole
+        model year, whose percentiles are less skewed by single outliers.
+        """
+        bands = [ALL_MILEAGES]
+        if mileage is not None:
+            bands.append(mileage // MILEAGE_BAND)
+        segments = {
+            segment.mileage_band: segment
+            for segment in await self.repo.get_segment(make, model, year, bands)
+        }
+        band = segments.get(bands[-1])
+        if band is not None and band.listings >= self.min_listings:
+            return band
+        return segments.get(ALL_MILEAGES)
+
+    async def refresh(self) -> bool:
+        return await self.repo.refresh()
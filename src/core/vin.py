@@ -0,0 +1,65 @@
+import csv
+from datetime import date
+from functools import cache, lru_cache
+from pathlib import Path
+
+from core.entities import VinInfo
+
+WMI_TABLE_PATH = Path(__file__).parent / "data" / "wmi.csv"
+VIN_LENGTH = 17
+VIN_CHARS = frozenset("0123456789ABCDEFGHJKLMNPRSTUVWXYZ")  # без I, O и Q
+# Код года (10-й символ) повторяется каждые 30 лет, начиная с 1980
+YEAR_CODES = "ABCDEFGHJKLMNPRSTVWXY123456789"
+TRANSLITERATION = {
+    **{str(digit): digit for digit in range(10)},
+    **dict(zip("ABCDEFGH", range(1, 9))),
+    **dict(zip("JKLMN", range(1, 6))),
+    "P": 7,
+    "R": 9,
+    **dict(zip("STUVWXYZ", range(2, 10))),
+}
+CHECK_WEIGHTS = (8, 7, 6, 5, 4, 3, 2, 10, 0, 9, 8, 7, 6, 5, 4, 3, 2)
+
+
+@cache
+def wmi_table() -> dict[str, str]:
+    """World manufacturer identifiers to makes, read once per process."""
+    with WMI_TABLE_PATH.open(newline="", encoding="utf-8") as file:
+        return {row["wmi"]: row["make"] for row in csv.DictReader(file)}
+
+
+def normalize_vin(vin: str) -> str:
+    return vin.strip().upper()
+
+
+@lru_cache(maxsize=65536)
+def decode_vin(vin: str) -> VinInfo:
+    """Decodes make and model year offline. Expects a normalized VIN."""
+    if len(vin) != VIN_LENGTH or not VIN_CHARS.issuperset(vin):
+        return VinInfo(vin=vin, valid=False)
+    return VinInfo(
+        vin=vin,
+        valid=True,
+        make=wmi_table().get(vin[:3]),
+        model_year=_model_year(vin[9]),
+        # Контрольная цифра обязательна только для Северной Америки
+        check_digit_valid=_check_digit(vin) == vin[8] if vin[0] in "12345" else None,
+    )
+
+
+def _model_year(code: str) -> int | None:
+    index = YEAR_CODES.find(code)
+    if index < 0:
+        return None
+    # Из годов с одинаковым кодом берется последний, не позже следующего
+    latest = date.today().year + 1
+    year = 1980 + index
+    return year + (latest - year) // 30 * 30
+
+
+def _check_digit(vin: str) -> str:
+    total = sum(
+        TRANSLITERATION[char] * weight for char, weight in zip(vin, CHECK_WEIGHTS)
+    )
+    remainder = total % 11
+    return "X" if remainder == 10 else str(remainder)
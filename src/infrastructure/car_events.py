@@ -0,0 +1,216 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Callable
+from uuid import UUID
+
+import asyncpg
+import orjson
+
+from core.entities import CarEvent
+from settings import get_settings
+from utils.logger import get_logger
+
+config = get_settings()
+logger = get_logger()
+
+CAR_EVENTS_CHANNEL = "car_events"
+
+# Сервер тоже закрывает соединение с исчезнувшим воркером, а не держит его
+KEEPALIVE_SETTINGS = {
+    "tcp_keepalives_idle": "30",
+    "tcp_keepalives_interval": "10",
+    "tcp_keepalives_count": "3",
+}
+
+
+@dataclass
+class CarEventFilter:
+    ops: frozenset[str] | None = None
+    make: str | None = None
+    model: str | None = None
+    min_price: float | None = None
+    max_price: float | None = None
+
+    def matches(self, event: CarEvent) -> bool:
+        if self.ops is not None and event.op not in self.ops and event.op != "resync":
+            return False
+        if event.car is None:
+            return True  # усеченное событие фильтровать не по чему
+        return self._matches_row(event.car) or (
+            event.old is not None and self._matches_row(event.old)
+        )
+
+    def _matches_row(self, row: dict) -> bool:
+        if self.make is not None and str(row.get("make", "")).casefold() != self.make:
+            return False
+        if self.model is not None and (
+            str(row.get("model", "")).casefold() != self.model
+        ):
+            return False
+        price = row.get("price")
+        if self.min_price is not None and (price is None or price < self.min_price):
+            return False
+        if self.max_price is not None and (price is None or price > self.max_price):
+            return False
+        return True
+
+
+class Subscription:
+    """A bounded per-client buffer. A client that falls behind is dropped."""
+
+    def __init__(self, event_filter: CarEventFilter, buffer_size: int):
+        self.filter = event_filter
+        self.queue: asyncio.Queue[CarEvent | None] = asyncio.Queue(buffer_size + 1)
+        self.buffer_size = buffer_size
+        self.dropped = False
+
+    def push(self, event: CarEvent) -> bool:
+        if self.queue.qsize() >= self.buffer_size:
+            self.close()
+            return False
+        self.queue.put_nowait(event)
+        return True
+
+    def close(self):
+        """Discards buffered events and wakes the reader with the end marker."""
+        self.dropped = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+    async def get(self, timeout: float) -> CarEvent | None:
+        """Waits for the next event; raises TimeoutError when idle for `timeout`."""
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+class CarEventBroadcaster:
+    """Holds one LISTEN connection per worker and fans NOTIFY out in memory.
+
+    Two kinds of consumers exist: SSE subscriptions with their own filters and
+    bounded buffers, and in-process listeners (indexes, caches) that are
+    called synchronously for every event.
+    """
+
+    def __init__(self, dsn: str, buffer_size: int, ping_interval: float):
+        self.dsn = dsn
+        self.buffer_size = buffer_size
+        self.ping_interval = ping_interval
+        self._subscriptions: set[Subscription] = set()
+        self._listeners: list[Callable[[CarEvent], None]] = []
+        self._task: asyncio.Task | None = None
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscriptions)
+
+    def add_listener(self, callback: Callable[[CarEvent], None]):
+        self._listeners.append(callback)
+
+    def subscribe(self, event_filter: CarEventFilter) -> Subscription:
+        subscription = Subscription(event_filter, self.buffer_size)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscriptions.discard(subscription)
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        for subscription in list(self._subscriptions):
+            subscription.close()
+        self._subscriptions.clear()
+
+    async def _listen(self):
+        delay, connected_before = 1, False
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(
+                    self.dsn, server_settings=KEEPALIVE_SETTINGS
+                )
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _: lost.set())
+                await connection.add_listener(CAR_EVENTS_CHANNEL, self._on_notify)
+                logger.info("Listening to %s", CAR_EVENTS_CHANNEL)
+                if connected_before:
+                    # Пока соединения не было, события терялись
+                    self.publish(CarEvent(op="resync"))
+                connected_before, delay = True, 1
+                await self._watch(connection, lost)
+                logger.warning("LISTEN connection lost, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("LISTEN connection failed, retrying in %s s", delay)
+            finally:
+                if connection is not None and not connection.is_closed():
+                    # По истечении таймаута соединение просто обрывается
+                    await connection.close(timeout=self.ping_interval)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30)
+
+    async def _watch(self, connection: asyncpg.Connection, lost: asyncio.Event):
+        """Returns once the connection is closed or stops answering.
+
+        A half-open TCP connection (a NAT or proxy dropped it silently) is
+        never reported as closed, and LISTEN would just stay quiet forever.
+        """
+        while True:
+            try:
+                await asyncio.wait_for(lost.wait(), self.ping_interval)
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await connection.fetchval("SELECT 1", timeout=self.ping_interval)
+            except (
+                asyncio.TimeoutError,
+                asyncpg.PostgresError,
+                asyncpg.InterfaceError,
+                OSError,
+            ):
+                return
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str):
+        data = orjson.loads(payload)
+        self.publish(
+            CarEvent(
+                op=data["op"],
+                car_id=UUID(data["id"]),
+                car=data.get("car"),
+                old=data.get("old"),
+                truncated=data.get("truncated", False),
+            )
+        )
+
+    def publish(self, event: CarEvent):
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception:
+                logger.exception("Car event listener %r failed", listener)
+        dropped = [
+            subscription
+            for subscription in self._subscriptions
+            if subscription.filter.matches(event) and not subscription.push(event)
+        ]
+        for subscription in dropped:
+            self._subscriptions.discard(subscription)
+        if dropped:
+            logger.info("Dropped %d slow car event subscribers", len(dropped))
+
+
+car_events = CarEventBroadcaster(
+    config.postgres_dsn, config.car_events_buffer_size, config.car_events_ping_seconds
+)
@@ -1,4 +1,17 @@
 from .auth_models import BannedRefreshToken, Profile, User
 from .base_model import BaseModelMixin
-from .cars_models import CarModel, ImageModel
-__all__ = ["BannedRefreshToken", "Profile", "User", "BaseModelMixin", "CarModel", "ImageModel"]
\ No newline at end of file
+from .cars_models import (
+    CarArchiveModel,
+    CarModel,
+    CarPriceHistoryModel,
+    CarStatsDeltaModel,
+    CarStatsModel,
+    ImageArchiveModel,
+    ImageBlobModel,
+    ImageModel,
+)
+from .job_models import JobRun, MatviewRefresh
+from .outbox_models import OutboxModel
+from .rate_limit_models import RateLimitBucket
+from .saved_search_models import SavedSearchModel
+__all__ = ["BannedRefreshToken", "Profile", "User", "BaseModelMixin", "CarArchiveModel", "CarModel", "CarPriceHistoryModel", "CarStatsDeltaModel", "CarStatsModel", "ImageArchiveModel", "ImageBlobModel", "ImageModel", "JobRun", "MatviewRefresh", "OutboxModel", "RateLimitBucket", "SavedSearchModel"]
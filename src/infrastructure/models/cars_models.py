@@ -1,15 +1,38 @@
 from datetime import datetime
 from uuid import uuid4
-from sqlalchemy import Integer, String, Float, ForeignKey, DateTime, Boolean
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    CheckConstraint,
+    DateTime,
+    Float,
+    ForeignKey,
+    Identity,
+    Index,
+    Integer,
+    String,
+    func,
+    text,
+)
 from sqlalchemy.orm import relationship, mapped_column, Mapped
 from sqlalchemy.dialects.postgresql import UUID
 
 from infrastructure.postgres_db import Base
-from infrastructure.models.base_model import BaseModelMixin
+from infrastructure.models.base_model import BaseModelMixin, utc_now
 
 
 class CarModel(Base, BaseModelMixin):
     __tablename__ = "cars"
+    __table_args__ = (
+        Index("ix_cars_geohash", "geohash"),
+        # Неактивных строк мало: они живут в cars только до переноса в архив
+        Index("ix_cars_inactive", "id", postgresql_where=text("status <> 'active'")),
+        # min/max группы car_stats пересчитываются по индексу, без скана cars
+        Index("ix_cars_make_price", "make", "price"),
+        Index("ix_cars_body_style_price", "body_style", "price"),
+        Index("ix_cars_year_price", "year", "price"),
+        CheckConstraint("price > 0", name="ck_cars_price_positive"),
+    )
 
     make: Mapped[str] = mapped_column(String, nullable=False)
     model: Mapped[str] = mapped_column(String, nullable=False)
@@ -25,6 +48,19 @@ class CarModel(Base, BaseModelMixin):
     condition: Mapped[str] = mapped_column(String, default="Used")
     vin: Mapped[str] = mapped_column(String, unique=True)
     features: Mapped[str] = mapped_column(String)
+    latitude: Mapped[float] = mapped_column(Float, nullable=True)
+    longitude: Mapped[float] = mapped_column(Float, nullable=True)
+    # Считается из координат при записи; collation "C" делает диапазоны
+    # префиксов (geohash >= 'ucf' AND geohash < 'ucf~') индексными
+    geohash: Mapped[str] = mapped_column(String(12, collation="C"), nullable=True)
+    # Растет на 1 при каждом изменении строки, отдается клиентам как ETag
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default=text("1")
+    )
+    # active, sold или expired; неактивные переносит в cars_archive задача
+    status: Mapped[str] = mapped_column(
+        String, nullable=False, default="active", server_default=text("'active'")
+    )
 
     images: Mapped[list["ImageModel"]] = relationship(
         "ImageModel", back_populates="car", cascade="all, delete-orphan"
@@ -40,5 +76,147 @@ class ImageModel(Base, BaseModelMixin):
     url: Mapped[str] = mapped_column(String, nullable=False)
     description: Mapped[str] = mapped_column(String)
     is_main: Mapped[bool] = mapped_column(Boolean, default=False)
+    # Загруженные после дедупликации; у внешних и старых изображений NULL
+    blob_sha256: Mapped[str] = mapped_column(
+        String(64), ForeignKey("image_blobs.sha256"), nullable=True, index=True
+    )
 
     car: Mapped["CarModel"] = relationship("CarModel", back_populates="images")
+
+
+class CarArchiveModel(Base, BaseModelMixin):
+    """Проданные и снятые объявления, перенесенные из cars.
+
+    Same columns as cars, without its unique and search indexes: a VIN may
+    come back as a new listing, and archived cars are only read by id.
+    """
+
+    __tablename__ = "cars_archive"
+
+    make: Mapped[str] = mapped_column(String, nullable=False)
+    model: Mapped[str] = mapped_column(String, nullable=False)
+    year: Mapped[int] = mapped_column(Integer, nullable=False)
+    price: Mapped[float] = mapped_column(Float, nullable=False)
+    mileage: Mapped[int] = mapped_column(Integer, nullable=False)
+    fuel_type: Mapped[str] = mapped_column(String, nullable=False)
+    engine_capacity: Mapped[float] = mapped_column(Float, nullable=False)
+    transmission: Mapped[str] = mapped_column(String, nullable=False)
+    body_style: Mapped[str] = mapped_column(String, nullable=False)
+    color: Mapped[str] = mapped_column(String, nullable=False)
+    description: Mapped[str] = mapped_column(String)
+    condition: Mapped[str] = mapped_column(String, default="Used")
+    vin: Mapped[str] = mapped_column(String, index=True)
+    features: Mapped[str] = mapped_column(String)
+    latitude: Mapped[float] = mapped_column(Float, nullable=True)
+    longitude: Mapped[float] = mapped_column(Float, nullable=True)
+    geohash: Mapped[str] = mapped_column(String(12, collation="C"), nullable=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    status: Mapped[str] = mapped_column(String, nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=utc_now, server_default=func.now()
+    )
+
+
+class ImageArchiveModel(Base, BaseModelMixin):
+    __tablename__ = "images_archive"
+
+    car_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), nullable=False, index=True)
+    url: Mapped[str] = mapped_column(String, nullable=False)
+    description: Mapped[str] = mapped_column(String)
+    is_main: Mapped[bool] = mapped_column(Boolean, default=False)
+    blob_sha256: Mapped[str] = mapped_column(
+        String(64), ForeignKey("image_blobs.sha256"), nullable=True, index=True
+    )
+
+
+class ImageBlobModel(Base):
+    """Объект в хранилище, общий для всех изображений с тем же содержимым.
+
+    ref_count is maintained by triggers on images and images_archive in the
+    same transaction as the image write. Once it drops to zero released_at
+    is set, and the blob is garbage collected after a grace period.
+    """
+
+    __tablename__ = "image_blobs"
+    __table_args__ = (
+        Index(
+            "ix_image_blobs_released",
+            "released_at",
+            postgresql_where=text("ref_count = 0"),
+        ),
+    )
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)  # hex
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    content_type: Mapped[str] = mapped_column(String, nullable=False)
+    ref_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default=text("0")
+    )
+    # False, пока объект не проверен после загрузки
+    uploaded: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, default=False, server_default=text("false")
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=utc_now, server_default=func.now()
+    )
+    released_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+
+
+class CarPriceHistoryModel(Base):
+    """История цен, секционирована по месяцам (RANGE по changed_at).
+
+    The primary key starts with car_id, so the history of one car is a
+    single index range scan in every monthly partition.
+    """
+
+    __tablename__ = "car_price_history"
+    __table_args__ = {"postgresql_partition_by": "RANGE (changed_at)"}
+
+    car_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    changed_at: Mapped[datetime] = mapped_column(
+        DateTime, primary_key=True, default=utc_now
+    )
+    id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid4
+    )
+    old_price: Mapped[float] = mapped_column(Float, nullable=True)
+    new_price: Mapped[float] = mapped_column(Float, nullable=False)
+
+
+class CarStatsModel(Base):
+    """Агрегаты каталога по make, body_style и year.
+
+    Car writes only append to car_stats_deltas; the car_stats_fold job adds
+    the deltas up periodically, so writers never contend on these rows and
+    dashboard reads touch one row per group.
+    """
+
+    __tablename__ = "car_stats"
+
+    dimension: Mapped[str] = mapped_column(String, primary_key=True)
+    value: Mapped[str] = mapped_column(String, primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    price_sum: Mapped[float] = mapped_column(Float, nullable=False)
+    min_price: Mapped[float] = mapped_column(Float, nullable=False)
+    max_price: Mapped[float] = mapped_column(Float, nullable=False)
+
+
+class CarStatsDeltaModel(Base):
+    """Изменения car_stats, еще не свернутые в агрегаты.
+
+    Statement-level triggers on cars append one row per affected group and
+    statement. Prices of removed rows are kept as a range, so the fold only
+    rescans a group when one of its extremes may have been removed.
+    """
+
+    __tablename__ = "car_stats_deltas"
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    dimension: Mapped[str] = mapped_column(String, nullable=False)
+    value: Mapped[str] = mapped_column(String, nullable=False)
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    price_sum: Mapped[float] = mapped_column(Float, nullable=False)
+    min_price: Mapped[float] = mapped_column(Float, nullable=True)  # добавленных
+    max_price: Mapped[float] = mapped_column(Float, nullable=True)
+    removed_min: Mapped[float] = mapped_column(Float, nullable=True)  # удаленных
+    removed_max: Mapped[float] = mapped_column(Float, nullable=True)
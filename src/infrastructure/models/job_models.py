@@ -0,0 +1,34 @@
+from datetime import datetime
+from sqlalchemy import BigInteger, DateTime, Float, String
+from sqlalchemy.orm import mapped_column, Mapped
+
+from infrastructure.postgres_db import Base
+
+
+class JobRun(Base):
+    """Последний запуск периодической задачи, общий для всех воркеров и узлов."""
+
+    __tablename__ = "job_runs"
+
+    name: Mapped[str] = mapped_column(String, primary_key=True)
+    last_started_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    last_finished_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    last_status: Mapped[str] = mapped_column(String, nullable=False)
+    last_error: Mapped[str] = mapped_column(String, nullable=True)
+    last_duration_ms: Mapped[float] = mapped_column(Float, nullable=True)
+    runs: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+
+class MatviewRefresh(Base):
+    """Время последнего REFRESH материализованного представления."""
+
+    __tablename__ = "matview_refreshes"
+
+    view_name: Mapped[str] = mapped_column(String, primary_key=True)
+    refreshed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
@@ -0,0 +1,41 @@
+from datetime import datetime
+from uuid import UUID, uuid4
+from sqlalchemy import DateTime, Index, Integer, String, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import mapped_column, Mapped
+
+from infrastructure.postgres_db import Base
+
+
+class OutboxModel(Base):
+    """Побочный эффект записи, сохраненный в той же транзакции.
+
+    Rows are deleted once their handler succeeds. A row that exhausts its
+    attempts keeps failed_at set and is left for inspection. A claimed row
+    is leased until locked_until; after that another worker may take it.
+    """
+
+    __tablename__ = "outbox"
+    __table_args__ = (
+        Index(
+            "ix_outbox_pending",
+            "available_at",
+            postgresql_where=text("failed_at IS NULL"),
+        ),
+    )
+
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
+    topic: Mapped[str] = mapped_column(String, nullable=False)
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    available_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    last_error: Mapped[str] = mapped_column(String, nullable=True)
+    failed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
+    locked_until: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
@@ -0,0 +1,17 @@
+from datetime import datetime
+from sqlalchemy import Boolean, DateTime, Float, String
+from sqlalchemy.orm import mapped_column, Mapped
+
+from infrastructure.postgres_db import Base
+
+
+class RateLimitBucket(Base):
+    """Состояние token bucket, общее для всех воркеров (RATE_LIMIT_BACKEND=postgres)."""
+
+    __tablename__ = "rate_limit_buckets"
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    key: Mapped[str] = mapped_column(String, primary_key=True)
+    tokens: Mapped[float] = mapped_column(Float, nullable=False)
+    allowed: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,28 @@
+from uuid import UUID
+from sqlalchemy import Float, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import mapped_column, Mapped
+
+from infrastructure.models.base_model import BaseModelMixin
+from infrastructure.postgres_db import Base
+
+
+class SavedSearchModel(Base, BaseModelMixin):
+    __tablename__ = "saved_searches"
+    __table_args__ = (
+        # Поиски новее снимка индекса воркера читаются при каждом сопоставлении
+        Index("ix_saved_searches_created_at", "created_at"),
+    )
+
+    user_id: Mapped[UUID] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    name: Mapped[str] = mapped_column(String, nullable=False)
+    make: Mapped[str] = mapped_column(String, nullable=True)
+    model: Mapped[str] = mapped_column(String, nullable=True)
+    fuel_type: Mapped[str] = mapped_column(String, nullable=True)
+    min_price: Mapped[float] = mapped_column(Float, nullable=True)
+    max_price: Mapped[float] = mapped_column(Float, nullable=True)
+    min_year: Mapped[int] = mapped_column(Integer, nullable=True)
+    max_year: Mapped[int] = mapped_column(Integer, nullable=True)
+    min_mileage: Mapped[int] = mapped_column(Integer, nullable=True)
+    max_mileage: Mapped[int] = mapped_column(Integer, nullable=True)
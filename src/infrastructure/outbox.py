@@ -0,0 +1,136 @@
+import asyncio
+from collections import defaultdict
+from typing import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.entities import OutboxMessage
+from infrastructure.postgres_db import database
+from infrastructure.repositories import OutboxRepository
+from settings import get_settings
+from utils.logger import get_logger
+
+config = get_settings()
+logger = get_logger()
+
+OutboxHandler = Callable[[AsyncSession, OutboxMessage], Awaitable[None]]
+
+
+class OutboxDispatcher:
+    """Runs the side effects of car writes outside of the request.
+
+    Every worker leases batches with FOR UPDATE SKIP LOCKED and commits
+    the claim at once, so no transaction stays open while handlers run.
+    Each message then gets its own transaction: its handlers run and the
+    message is deleted together, and a failure rolls both back and retries
+    the message with exponential backoff. Delivery is at least once, also
+    after a lease expires mid-batch, so handlers must be idempotent.
+    """
+
+    def __init__(
+        self, batch_size: int, poll_interval: float, max_attempts: int, lease: float
+    ):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.lease = lease
+        self._handlers: dict[str, list[OutboxHandler]] = defaultdict(list)
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def register(self, topic: str):
+        """Decorator adding a handler for `topic`."""
+
+        def decorator(handler: OutboxHandler) -> OutboxHandler:
+            self._handlers[topic].append(handler)
+            return handler
+
+        return decorator
+
+    def wake(self, *_):
+        """Starts the next batch now instead of after the poll interval."""
+        self._wakeup.set()
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                processed = await self.dispatch_batch()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Outbox dispatch failed")
+                processed = 0
+            if processed >= self.batch_size:
+                continue  # очередь не пуста, берем следующую пачку сразу
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def dispatch_batch(self) -> int:
+        async with database.session_factory() as session:
+            repo = OutboxRepository(session)
+            messages = await repo.claim(self.batch_size, self.lease)
+            await session.commit()
+            for message in messages:
+                if message.attempts > self.max_attempts:
+                    # Аренды истекали, не дойдя до обработки ошибки: воркер падал
+                    await repo.fail(message.id, "Lease expired too many times")
+                    await session.commit()
+                    continue
+                try:
+                    for handler in self._handlers.get(message.topic, ()):
+                        await handler(session, message)
+                    await repo.complete([message.id])
+                except Exception as error:
+                    await session.rollback()
+                    await self._reschedule(repo, message, error)
+                await session.commit()
+        return len(messages)
+
+    async def _reschedule(
+        self, repo: OutboxRepository, message: OutboxMessage, error: Exception
+    ):
+        attempt = message.attempts
+        if attempt >= self.max_attempts:
+            logger.error(
+                "Outbox message %s (%s) failed for good after %d attempts: %r",
+                message.id,
+                message.topic,
+                attempt,
+                error,
+            )
+            await repo.fail(message.id, repr(error))
+            return
+        delay = min(2**attempt, 300)
+        logger.warning(
+            "Outbox message %s (%s) failed, retry in %d s: %r",
+            message.id,
+            message.topic,
+            delay,
+            error,
+        )
+        await repo.retry(message.id, repr(error), delay)
+
+
+outbox_dispatcher = OutboxDispatcher(
+    config.outbox_batch_size,
+    config.outbox_poll_seconds,
+    config.outbox_max_attempts,
+    config.outbox_lease_seconds,
+)
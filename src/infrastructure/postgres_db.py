@@ -1,9 +1,13 @@
+import asyncio
 from asyncio import current_task
-from contextlib import asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Awaitable, Callable
 
 from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     create_async_engine,
+    AsyncConnection,
+    AsyncEngine,
     AsyncSession,
     async_scoped_session,
 )
@@ -27,13 +31,62 @@ Base = declarative_base()
 
 
 class Database:
-    def __init__(self, url: str, echo: bool = False):
-        self.engine = create_async_engine(url=url, echo=echo)
+    def __init__(self, url: str, echo: bool = False, **engine_options):
+        self.url = url
+        self.echo = echo
+        self.engine_options = engine_options
+        self.engine: AsyncEngine | None = None
+        self.session_factory: async_sessionmaker[AsyncSession] | None = None
 
+    def connect(self):
+        """Creates the engine and its connection pool in the current process.
+
+        Called from the application lifespan, so every worker gets its own
+        pool instead of inheriting one created at import time.
+        """
+        if self.engine is not None:
+            return
+        self.engine = create_async_engine(
+            url=self.url, echo=self.echo, **self.engine_options
+        )
         self.session_factory = async_sessionmaker(
             bind=self.engine, autoflush=False, autocommit=False, expire_on_commit=False
         )
 
+    async def disconnect(self):
+        """Closes every pooled connection of the current process."""
+        if self.engine is None:
+            return
+        await self.engine.dispose()
+        self.engine = None
+        self.session_factory = None
+
+    async def warm_up(
+        self,
+        connections: int,
+        prime: Callable[[AsyncSession], Awaitable[None]] | None = None,
+    ):
+        """Opens `connections` pooled connections at once and runs `prime` on each.
+
+        asyncpg prepares statements per connection, so priming every one of
+        them moves the first-use cost out of real requests.
+        """
+        connections = min(connections, self.engine.pool.size())
+        async with AsyncExitStack() as stack:
+            opened = await asyncio.gather(
+                *(
+                    stack.enter_async_context(self.engine.connect())
+                    for _ in range(connections)
+                )
+            )
+            if prime is not None:
+                await asyncio.gather(*(self._prime(conn, prime) for conn in opened))
+
+    @staticmethod
+    async def _prime(connection: AsyncConnection, prime):
+        async with AsyncSession(bind=connection) as session:
+            await prime(session)
+
     def get_scope_session(self):
         return async_scoped_session(
             session_factory=self.session_factory, scopefunc=current_task
@@ -53,4 +106,11 @@ class Database:
 
 
 # database = Database(config.database_url)
-database: Database = Database(config.database_url)
\ No newline at end of file
+database: Database = Database(
+    config.database_url,
+    pool_size=config.db_pool_size,
+    max_overflow=config.db_max_overflow,
+    pool_timeout=config.db_pool_timeout,
+    pool_recycle=config.db_pool_recycle,
+    pool_pre_ping=True,
+)
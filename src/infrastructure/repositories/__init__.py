@@ -1,4 +1,19 @@
 from .auth_repository import TokenRepository, UserRepository, ProfileRepository
-from .cars_repository import CarRepository
+from .cars_repository import CarRepository, ImageBlobRepository, ImageRepository
+from .outbox_repository import OutboxRepository
+from .saved_search_repository import SavedSearchRepository
+from .unit_of_work import UnitOfWork
+from .valuation_repository import ValuationRepository
 
-__all__ = ["TokenRepository", "UserRepository", "ProfileRepository", "CarRepository"]
+__all__ = [
+    "TokenRepository",
+    "UserRepository",
+    "ProfileRepository",
+    "CarRepository",
+    "ImageRepository",
+    "ImageBlobRepository",
+    "OutboxRepository",
+    "SavedSearchRepository",
+    "UnitOfWork",
+    "ValuationRepository",
+]
@@ -1,7 +1,8 @@
+from datetime import datetime
 from typing import List
 from uuid import UUID
 
-from sqlalchemy import insert, select
+from sqlalchemy import delete, insert, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -11,8 +12,10 @@ from core.entities.auth_entity import Profile
 from core.entities.auth_entity import User as UserEntity
 from core.repositories.auth_repository import IProfileRepository, IUserRepository
 from core.entities import BannedRefreshToken as BannedRefreshTokenEntity
+from core.entities import ResultCount
 from infrastructure.models import BannedRefreshToken as BannedRefreshTokenModel
 from infrastructure.models import User as UserModel
+from infrastructure.repositories.row_count import count_rows
 
 
 class TokenRepository(IBannedRefreshTokenRepository):
@@ -32,13 +35,22 @@ class TokenRepository(IBannedRefreshTokenRepository):
             created_at=token.created_at,
         )
 
+    async def is_banned(self, jti: str) -> bool:
+        stmt = select(BannedRefreshTokenModel.id).filter_by(jti=jti)
+        result = await self.db.execute(stmt)
+        return result.first() is not None
+
     async def create(self, jti: str) -> BannedRefreshTokenEntity:
         token_model = BannedRefreshTokenModel(
             jti=jti,
         )
 
-        self.db.add(token_model)
-        await self.db.commit()
+        try:
+            self.db.add(token_model)
+            await self.db.commit()
+        except IntegrityError:
+            await self.db.rollback()
+            raise DuplicateEntryError(f"Token {jti} is already banned")
         await self.db.refresh(token_model)
 
         token_entity = BannedRefreshTokenEntity(
@@ -49,6 +61,14 @@ class TokenRepository(IBannedRefreshTokenRepository):
 
         return token_entity
 
+    async def delete_older_than(self, created_before: datetime) -> int:
+        stmt = delete(BannedRefreshTokenModel).where(
+            BannedRefreshTokenModel.created_at < created_before
+        )
+        result = await self.db.execute(stmt)
+        await self.db.commit()
+        return result.rowcount
+
 
 class UserRepository(IUserRepository):
     def __init__(self, db: AsyncSession):
@@ -73,7 +93,32 @@ class UserRepository(IUserRepository):
         )
 
     async def get_multi(self, offset: int, limit: int, **filters) -> List[UserEntity]:
-        pass
+        stmt = (
+            select(UserModel)
+            .filter_by(**filters)
+            .order_by(UserModel.created_at, UserModel.id)
+            .offset(offset)
+            .limit(limit)
+        )
+        users = (await self.db.scalars(stmt)).all()
+        return [
+            UserEntity(
+                id=user.id,
+                email=user.email,
+                hashed_password=user.hashed_password,
+                last_login=user.last_login,
+                is_active=user.is_active,
+                is_superuser=user.is_superuser,
+                created_at=user.created_at,
+                updated_at=user.updated_at,
+                blocked_at=user.blocked_at,
+            )
+            for user in users
+        ]
+
+    async def count(self, exact_limit: int | None = None, **filters) -> ResultCount:
+        stmt = select(UserModel.id).filter_by(**filters)
+        return await count_rows(self.db, stmt, exact_limit)
 
     async def create(self, data: UserEntity) -> UserEntity:
         try:
@@ -1,25 +1,124 @@
-from typing import List, Optional
+import math
+from datetime import timedelta
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 from uuid import UUID
 
-from sqlalchemy import delete, select, update
+from sqlalchemy import (
+    ARRAY,
+    Numeric,
+    String,
+    and_,
+    any_,
+    bindparam,
+    case,
+    cast,
+    delete,
+    func,
+    insert,
+    inspect,
+    literal_column,
+    null,
+    or_,
+    select,
+    text,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Result
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
+from sqlalchemy.sql import Executable
 from sqlalchemy.ext.asyncio import AsyncSession  # AsyncEngine
 
 from core.entities import Car as CarEntity
+from core.entities import CarFilter, CarPatch
+from core.entities import CarPriceChange as CarPriceChangeEntity
+from core.entities import CarStat as CarStatEntity
 from core.entities import Image as ImageEntity
-from infrastructure.models import CarModel
-from core.repositories import ICarRepository, IImageRepository
-from infrastructure.models.cars_models import (
-    ImageModel,
-)  # Corrected import path if needed
+from core.entities import ImageBlob as ImageBlobEntity
+from core.entities import ResultCount
+from core.exceptions import InvalidRequestError
+from core.geo import EARTH_RADIUS_KM, covering_cells, encode_geohash
+from core.vin import normalize_vin
+from core.indexes.similarity_index import CATEGORICAL_FEATURES, NUMERIC_FEATURES
+from infrastructure.models import (
+    CarArchiveModel,
+    CarModel,
+    CarPriceHistoryModel,
+    CarStatsModel,
+    ImageArchiveModel,
+    ImageBlobModel,
+)
+from infrastructure.models.base_model import utc_now
+from infrastructure.models.cars_models import ImageModel
+from core.repositories import ICarRepository, IImageBlobRepository, IImageRepository
+from infrastructure.repositories.outbox_repository import OutboxRepository
+from infrastructure.repositories.row_count import count_rows
+from utils.query_cache import catalog_cache
+from utils.single_flight import SingleFlight
+
+T = TypeVar("T")
 
 
 class CarRepository(ICarRepository):
-    def __init__(self, session: AsyncSession):  # Принимаем AsyncSession
+    # Общий для всех экземпляров: совпадающие чтения разных запросов воркера
+    shared_reads = SingleFlight()
+
+    def __init__(self, session: AsyncSession, autocommit: bool = True):
         self.session = session
+        # False внутри UnitOfWork: коммитит он, один раз на все репозитории
+        self.autocommit = autocommit
+
+    async def _commit(self) -> None:
+        if self.autocommit:
+            await self.session.commit()
+            # В unit of work кэш сбрасывается после общего commit
+            catalog_cache.bump()
+
+    @staticmethod
+    def _values(data: CarEntity) -> Dict[str, Any]:
+        return dict(
+            make=data.make,
+            model=data.model,
+            year=data.year,
+            price=data.price,
+            mileage=data.mileage,
+            fuel_type=data.fuel_type,
+            engine_capacity=data.engine_capacity,
+            transmission=data.transmission,
+            body_style=data.body_style,
+            color=data.color,
+            description=data.description,
+            condition=data.condition,
+            vin=normalize_vin(data.vin) if data.vin else None,
+            features=",".join(data.features) if data.features else None,
+            latitude=data.latitude,
+            longitude=data.longitude,
+            status=data.status,
+            geohash=(
+                encode_geohash(data.latitude, data.longitude)
+                if data.latitude is not None and data.longitude is not None
+                else None
+            ),
+        )
 
     async def _to_entity(self, car_model: CarModel) -> CarEntity:
         """Преобразует объект SQLAlchemy CarModel в доменную сущность Car."""
+        state = inspect(car_model)
+        # Фото берутся, только если запрос загрузил их через selectinload
+        images_loaded = "images" in state.attrs and "images" not in state.unloaded
         return CarEntity(
             id=car_model.id,
             make=car_model.make,
@@ -36,20 +135,61 @@ class CarRepository(ICarRepository):
             condition=car_model.condition,
             vin=car_model.vin,
             features=car_model.features.split(",") if car_model.features else [],
-            images=[],  # Изображения загружаются через ImageRepository
+            latitude=car_model.latitude,
+            longitude=car_model.longitude,
+            images=(
+                [ImageRepository._to_entity(image) for image in car_model.images]
+                if images_loaded
+                else []
+            ),
             created_at=car_model.created_at,
             updated_at=car_model.updated_at,
+            version=car_model.version,
+            status=car_model.status,
+        )
+
+    async def _read_shared(
+        self,
+        key: Hashable,
+        stmt: Executable,
+        convert: Callable[[Result], Awaitable[T]],
+    ) -> T:
+        """Runs a read, sharing it with identical reads already in flight.
+
+        The key is built by the caller from the read's own arguments, so the
+        hot path never compiles the statement just to compare it. Inside a
+        unit of work nothing is shared: its transaction may have written
+        rows that other sessions must not see yet.
+        """
+
+        async def read() -> T:
+            return await convert(await self.session.execute(stmt))
+
+        if not self.autocommit:
+            return await read()
+        return await self.shared_reads.do(key, read)
+
+    @staticmethod
+    def _filter_key(car_filter: CarFilter) -> tuple:
+        return tuple(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in vars(car_filter).items()
         )
 
     async def get(self, **filters) -> Optional[CarEntity]:
         stmt = (
             select(CarModel).filter_by(**filters).options(selectinload(CarModel.images))
         )
-        result = await self.session.execute(stmt)
-        car_model = result.scalars().first()
-        if not car_model:
-            return None
-        return await self._to_entity(car_model)
+
+        async def convert(result: Result) -> Optional[CarEntity]:
+            car_model = result.scalars().first()
+            if not car_model:
+                return None
+            return await self._to_entity(car_model)
+
+        return await self._read_shared(
+            ("get", frozenset(filters.items())), stmt, convert
+        )
 
     async def get_multi(self, offset: int, limit: int, **filters) -> List[CarEntity]:
         stmt = (
@@ -63,100 +203,716 @@ class CarRepository(ICarRepository):
         car_models = result.scalars().all()
         return [await self._to_entity(car_model) for car_model in car_models]
 
+    async def get_many(self, ids: List[UUID]) -> List[CarEntity]:
+        """Возвращает активные машины в порядке ids, пропуская остальные."""
+        if not ids:
+            return []
+        stmt = (
+            select(CarModel)
+            .where(CarModel.id.in_(ids), CarModel.status == "active")
+            .options(selectinload(CarModel.images))
+        )
+        result = await self.session.execute(stmt)
+        by_id = {car_model.id: car_model for car_model in result.scalars().all()}
+        return [
+            await self._to_entity(by_id[car_id]) for car_id in ids if car_id in by_id
+        ]
+
+    @staticmethod
+    def _features_query():
+        names = NUMERIC_FEATURES + CATEGORICAL_FEATURES
+        stmt = select(CarModel.id, *(getattr(CarModel, name) for name in names))
+        # Снятые с продажи машины не должны попадать в похожие
+        return names, stmt.where(CarModel.status == "active")
+
+    async def get_features(self, ids: List[UUID]) -> List[Tuple[UUID, Dict[str, Any]]]:
+        """Reads only the columns the similarity index needs for active cars."""
+        names, stmt = self._features_query()
+        result = await self.session.execute(stmt.where(CarModel.id.in_(ids)))
+        return [(row[0], dict(zip(names, row[1:]))) for row in result]
+
+    async def iter_features(
+        self, chunk_size: int = 10_000
+    ) -> AsyncIterator[List[Tuple[UUID, Dict[str, Any]]]]:
+        """Streams the features of all active cars in chunks of chunk_size."""
+        names, stmt = self._features_query()
+        result = await self.session.stream(
+            stmt.execution_options(yield_per=chunk_size)
+        )
+        async for rows in result.partitions():
+            yield [(row[0], dict(zip(names, row[1:]))) for row in rows]
+
+    async def get_archived(self, car_id: UUID) -> Optional[CarEntity]:
+        car_model = await self.session.get(CarArchiveModel, car_id)
+        if car_model is None:
+            return None
+        car = await self._to_entity(car_model)
+        # Между архивными таблицами нет связи, фото читаются отдельным запросом
+        images = await self.session.scalars(
+            select(ImageArchiveModel).where(ImageArchiveModel.car_id == car_id)
+        )
+        car.images = [ImageRepository._to_entity(image) for image in images]
+        return car
+
+    async def expire_listings(self, older_than: timedelta) -> int:
+        """Снимает активные объявления, не обновлявшиеся дольше older_than."""
+        result = await self.session.execute(
+            update(CarModel)
+            .where(
+                CarModel.status == "active",
+                CarModel.updated_at < utc_now() - older_than,
+            )
+            .values(status="expired", version=CarModel.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        await self._commit()
+        return result.rowcount
+
+    async def archive_listings(self, batch_size: int) -> List[UUID]:
+        """Moves up to batch_size inactive cars and their images to the archive.
+
+        One statement of data-modifying CTEs deletes the rows from the hot
+        tables and inserts them into the archive ones. SKIP LOCKED lets it
+        run next to writes; locked cars are picked up by the next batch.
+        """
+        victims = (
+            select(CarModel.id)
+            .where(CarModel.status != "active")
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .cte("victims")
+        )
+        image_columns = [
+            column.name
+            for column in ImageArchiveModel.__table__.columns
+            if column.name in ImageModel.__table__.columns
+        ]
+        moved_images = (
+            delete(ImageModel)
+            .where(ImageModel.car_id.in_(select(victims.c.id)))
+            .returning(*(ImageModel.__table__.c[name] for name in image_columns))
+            .cte("moved_images")
+        )
+        archived_images = (
+            insert(ImageArchiveModel)
+            .from_select(image_columns, select(moved_images))
+            .cte("archived_images")
+        )
+        car_columns = [
+            column.name
+            for column in CarArchiveModel.__table__.columns
+            if column.name in CarModel.__table__.columns
+        ]
+        moved_cars = (
+            delete(CarModel)
+            .where(CarModel.id.in_(select(victims.c.id)))
+            .returning(*(CarModel.__table__.c[name] for name in car_columns))
+            .cte("moved_cars")
+        )
+        stmt = (
+            insert(CarArchiveModel)
+            .from_select(car_columns, select(moved_cars))
+            .returning(CarArchiveModel.id)
+            .add_cte(archived_images)
+        )
+        ids = list((await self.session.scalars(stmt)).all())
+        if ids:
+            await OutboxRepository(self.session).add_many(
+                "car.archived", [{"car_id": str(car_id)} for car_id in ids]
+            )
+        await self._commit()
+        return ids
+
+    async def get_version(self, car_id: UUID) -> Optional[int]:
+        return await self.session.scalar(
+            select(CarModel.version).where(CarModel.id == car_id)
+        )
+
+    async def get_ids_by_vins(self, vins: List[str]) -> Dict[str, UUID]:
+        """Один запрос по уникальному индексу: vin = ANY(массив одним параметром)."""
+        stmt = select(CarModel.vin, CarModel.id).where(
+            CarModel.vin == any_(bindparam("vins", vins, type_=ARRAY(String)))
+        )
+        result = await self.session.execute(stmt)
+        return dict(result.all())
+
+    async def get_suggest_terms(self) -> List[Tuple[str, str, int]]:
+        """(kind, value, cars) for every make, model and feature in the catalog."""
+        feature = func.unnest(func.string_to_array(CarModel.features, ","))
+        features = select(func.trim(feature).label("value")).subquery()
+        columns = (
+            ("make", CarModel.make),
+            ("model", CarModel.model),
+            ("feature", features.c.value),
+        )
+        stmt = union_all(
+            *(
+                select(literal_column(f"'{kind}'"), column, func.count())
+                .group_by(column)
+                for kind, column in columns
+            )
+        )
+        result = await self.session.execute(stmt)
+        return [(kind, value, count) for kind, value, count in result if value]
+
     async def create(self, data: CarEntity) -> CarEntity:
         if data is None:
             raise ValueError("Data cannot be None")
+        return (await self.create_many([data]))[0]
 
-        car_model = CarModel(
-            make=data.make,
-            model=data.model,
-            year=data.year,
-            price=data.price,
-            mileage=data.mileage,
-            fuel_type=data.fuel_type,
-            engine_capacity=data.engine_capacity,
-            transmission=data.transmission,
-            body_style=data.body_style,
-            color=data.color,
-            description=data.description,
-            condition=data.condition,
-            vin=data.vin,
-            features=",".join(data.features) if data.features else None,
-            # images = data.images  #  Убрано!  Изображения создаются через ImageRepository
+    async def create_many(self, cars: List[CarEntity]) -> List[CarEntity]:
+        """Вставляет машины одним INSERT ... RETURNING, без refresh после commit."""
+        if not cars:
+            return []
+        result = await self.session.scalars(
+            insert(CarModel).returning(CarModel, sort_by_parameter_order=True),
+            [self._values(car) for car in cars],
         )
-        self.session.add(car_model)
-        await self.session.commit()
-        await self.session.refresh(car_model)
-        return await self._to_entity(car_model)
+        car_models = result.all()
+        await self.session.execute(
+            insert(CarPriceHistoryModel),
+            [
+                {"car_id": car.id, "old_price": None, "new_price": car.price}
+                for car in car_models
+            ],
+        )
+        await OutboxRepository(self.session).add_many(
+            "car.created", [{"car_id": str(car.id)} for car in car_models]
+        )
+        await self._commit()
+        return [await self._to_entity(car_model) for car_model in car_models]
+
+    async def update(
+        self, car_id: UUID, data: CarEntity, expected_version: Optional[int] = None
+    ) -> Optional[CarEntity]:
+        """Обновляет машину, если ее версия равна expected_version (если задана).
 
-    async def update(self, car_id: UUID, data: CarEntity) -> Optional[CarEntity]:
+        Returns None when the car is missing or its version has moved on.
+        """
+        # Старая цена читается тем же UPDATE ... FROM, поэтому запись в историю
+        # не требует отдельного SELECT
+        old = select(CarModel.id, CarModel.price.label("old_price")).where(
+            CarModel.id == car_id
+        )
+        if expected_version is None:
+            old = old.with_for_update()
+        else:
+            # Версия меняется при любой записи, так что цена из снимка запроса
+            # совпадает с ценой строки этой версии - блокировка не нужна
+            old = old.where(CarModel.version == expected_version)
+        old = old.subquery()
         stmt = (
             update(CarModel)
-            .values(
-                make=data.make,
-                model=data.model,
-                year=data.year,
-                price=data.price,
-                mileage=data.mileage,
-                fuel_type=data.fuel_type,
-                engine_capacity=data.engine_capacity,
-                transmission=data.transmission,
-                body_style=data.body_style,
-                color=data.color,
-                description=data.description,
-                condition=data.condition,
-                vin=data.vin,
-                features=",".join(data.features) if data.features else None,
-                # images = data.images # Убрано!
-            )
-            .where(CarModel.id == car_id)
-            .returning(CarModel)
+            .values(**self._values(data), version=CarModel.version + 1)
+            .where(CarModel.id == old.c.id)
+            .returning(CarModel, old.c.old_price)
         )
+        if expected_version is not None:
+            stmt = stmt.where(CarModel.version == expected_version)
         result = await self.session.execute(stmt)
-        car_model = result.scalars().first()
-        if not car_model:
+        row = result.first()
+        if not row:
             return None
-        await self.session.commit()  # Добавили commit
-        return await self._to_entity(car_model)
+        car_model, old_price = row
+        if car_model.price != old_price:
+            await self._record_price_change(car_model.id, old_price, car_model.price)
+        await OutboxRepository(self.session).add(
+            "car.updated",
+            {
+                "car_id": str(car_model.id),
+                "price_changed": car_model.price != old_price,
+            },
+        )
+        # RETURNING не загружает связи, фото читаются отдельным запросом
+        images = await self.session.scalars(
+            select(ImageModel).where(ImageModel.car_id == car_model.id)
+        )
+        car = await self._to_entity(car_model)
+        car.images = [ImageRepository._to_entity(image) for image in images]
+        await self._commit()
+        return car
 
-    async def delete(self, car_id: UUID) -> None:
-        stmt = delete(CarModel).where(CarModel.id == car_id)
-        await self.session.execute(stmt)
+    @staticmethod
+    def _filter_clauses(car_filter: CarFilter) -> list:
+        clauses = []
+        if car_filter.ids is not None:
+            clauses.append(CarModel.id.in_(car_filter.ids))
+        for name in ("make", "model", "body_style", "fuel_type", "condition"):
+            value = getattr(car_filter, name)
+            if value is not None:
+                # Регистр в каталоге не нормализован
+                clauses.append(func.lower(getattr(CarModel, name)) == value.lower())
+        if car_filter.min_year is not None:
+            clauses.append(CarModel.year >= car_filter.min_year)
+        if car_filter.max_year is not None:
+            clauses.append(CarModel.year <= car_filter.max_year)
+        if car_filter.min_price is not None:
+            clauses.append(CarModel.price >= car_filter.min_price)
+        if car_filter.max_price is not None:
+            clauses.append(CarModel.price <= car_filter.max_price)
+        return clauses
+
+    async def search(
+        self,
+        car_filter: CarFilter,
+        near: Optional[Tuple[float, float]] = None,
+        radius_km: Optional[float] = None,
+        offset: int = 0,
+        limit: int = 50,
+    ) -> List[Tuple[CarEntity, Optional[float]]]:
+        """Ищет машины по фильтру; с near - в радиусе radius_km, ближние первыми.
+
+        Candidates are pruned with index range scans over the geohash cells
+        covering the circle, then the exact haversine distance is checked.
+        """
+        stmt = (
+            select(CarModel)
+            .where(*self._search_clauses(car_filter, near, radius_km))
+            .options(selectinload(CarModel.images))
+            .offset(offset)
+            .limit(limit)
+        )
+        if near is None:
+            stmt = stmt.add_columns(null().label("distance_km")).order_by(
+                CarModel.created_at.desc(), CarModel.id
+            )
+        else:
+            distance = self._distance_km(*near).label("distance_km")
+            stmt = stmt.add_columns(distance).order_by(distance, CarModel.id)
+        key = (
+            "search",
+            self._filter_key(car_filter),
+            near,
+            radius_km,
+            offset,
+            limit,
+        )
+        return await self._read_shared(key, stmt, self._to_search_results)
+
+    async def count(
+        self,
+        car_filter: CarFilter,
+        near: Optional[Tuple[float, float]] = None,
+        radius_km: Optional[float] = None,
+        exact_limit: Optional[int] = None,
+    ) -> ResultCount:
+        """Сколько машин вернет search; точно - только до exact_limit."""
+        stmt = select(CarModel.id).where(
+            *self._search_clauses(car_filter, near, radius_km)
+        )
+        return await count_rows(self.session, stmt, exact_limit)
+
+    def _search_clauses(
+        self,
+        car_filter: CarFilter,
+        near: Optional[Tuple[float, float]],
+        radius_km: Optional[float],
+    ) -> list:
+        clauses = [CarModel.status == "active", *self._filter_clauses(car_filter)]
+        if near is not None:
+            lat, lon = near
+            cells = covering_cells(lat, lon, radius_km)
+            clauses += [
+                or_(
+                    *(
+                        and_(CarModel.geohash >= cell, CarModel.geohash < cell + "~")
+                        for cell in cells
+                    )
+                ),
+                self._distance_km(lat, lon) <= radius_km,
+            ]
+        return clauses
+
+    async def _to_search_results(
+        self, result: Result
+    ) -> List[Tuple[CarEntity, Optional[float]]]:
+        return [(await self._to_entity(car), km) for car, km in result.all()]
+
+    @staticmethod
+    def _distance_km(lat: float, lon: float):
+        """Haversine distance from (lat, lon) to the car, in SQL."""
+        dlat = func.radians(CarModel.latitude - lat) * 0.5
+        dlon = func.radians(CarModel.longitude - lon) * 0.5
+        a = func.power(func.sin(dlat), 2) + math.cos(math.radians(lat)) * func.cos(
+            func.radians(CarModel.latitude)
+        ) * func.power(func.sin(dlon), 2)
+        return 2 * EARTH_RADIUS_KM * func.asin(func.sqrt(func.least(1.0, a)))
+
+    async def bulk_update(self, car_filter: CarFilter, patch: CarPatch) -> List[UUID]:
+        """Applies the patch to every matching car in one UPDATE ... RETURNING.
+
+        Prices must stay positive: if the patch would take any matching car
+        to zero or below, nothing is updated and InvalidRequestError is raised.
+        """
+        values = {}
+        if patch.set_price is not None:
+            values["price"] = patch.set_price
+        elif patch.price_delta is not None:
+            values["price"] = CarModel.price + patch.price_delta
+        elif patch.price_percent is not None:
+            factor = 1 + patch.price_percent / 100
+            values["price"] = func.round(cast(CarModel.price * factor, Numeric), 2)
+        if patch.condition is not None:
+            values["condition"] = patch.condition
+        if not values:
+            return []
+        values["version"] = CarModel.version + 1
+        # Как в update: старые цены читаются в том же операторе под блокировкой
+        old = (
+            select(CarModel.id, CarModel.price.label("old_price"))
+            .where(*self._filter_clauses(car_filter))
+            .with_for_update()
+            .subquery()
+        )
+        stmt = (
+            update(CarModel)
+            .values(**values)
+            .where(CarModel.id == old.c.id)
+            .returning(CarModel.id, old.c.old_price, CarModel.price)
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            rows = (await self.session.execute(stmt)).all()
+        except IntegrityError as exc:
+            if "ck_cars_price_positive" not in str(exc.orig):
+                raise
+            if self.autocommit:
+                await self.session.rollback()
+            # Оператор откатывается целиком: ни одна цена не меняется
+            raise InvalidRequestError("The price change would make some prices <= 0")
+        changes = [
+            {"car_id": car_id, "old_price": old_price, "new_price": new_price}
+            for car_id, old_price, new_price in rows
+            if new_price != old_price
+        ]
+        if changes:
+            await self.session.execute(insert(CarPriceHistoryModel), changes)
+        changed = {change["car_id"] for change in changes}
+        await OutboxRepository(self.session).add_many(
+            "car.updated",
+            [
+                {"car_id": str(car_id), "price_changed": car_id in changed}
+                for car_id, _, _ in rows
+            ],
+        )
+        await self._commit()
+        return [car_id for car_id, _, _ in rows]
+
+    async def bulk_delete(self, car_filter: CarFilter) -> List[UUID]:
+        """Deletes every matching car and its images in one statement.
+
+        The matching ids are locked once and feed both deletes, so images
+        and cars are removed for exactly the same set of rows.
+        """
+        targets = (
+            select(CarModel.id)
+            .where(*self._filter_clauses(car_filter))
+            .with_for_update()
+            .cte("targets")
+        )
+        # У images нет ON DELETE CASCADE в БД
+        images = (
+            delete(ImageModel)
+            .where(ImageModel.car_id.in_(select(targets.c.id)))
+            .cte("deleted_images")
+        )
+        stmt = (
+            delete(CarModel)
+            .where(CarModel.id.in_(select(targets.c.id)))
+            .returning(CarModel.id)
+            .add_cte(images)
+            .execution_options(synchronize_session=False)
+        )
+        ids = list((await self.session.scalars(stmt)).all())
+        await OutboxRepository(self.session).add_many(
+            "car.deleted", [{"car_id": str(car_id)} for car_id in ids]
+        )
+        await self._commit()
+        return ids
+
+    async def get_price_history(
+        self, car_id: UUID, limit: int = 100
+    ) -> List[CarPriceChangeEntity]:
+        stmt = (
+            select(CarPriceHistoryModel)
+            .where(CarPriceHistoryModel.car_id == car_id)
+            .order_by(CarPriceHistoryModel.changed_at.desc())
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return [
+            CarPriceChangeEntity(
+                id=change.id,
+                car_id=change.car_id,
+                old_price=change.old_price,
+                new_price=change.new_price,
+                changed_at=change.changed_at,
+            )
+            for change in result.scalars().all()
+        ]
+
+    async def get_stats(
+        self, dimensions: Optional[List[str]] = None
+    ) -> List[CarStatEntity]:
+        """Читает агрегаты из car_stats; они отстают на период fold_stats."""
+        stmt = select(CarStatsModel).order_by(
+            CarStatsModel.dimension, CarStatsModel.count.desc()
+        )
+        if dimensions is not None:
+            stmt = stmt.where(CarStatsModel.dimension.in_(dimensions))
+        result = await self.session.execute(stmt)
+        return [
+            CarStatEntity(
+                dimension=stat.dimension,
+                value=stat.value,
+                count=stat.count,
+                price_sum=stat.price_sum,
+                min_price=stat.min_price,
+                max_price=stat.max_price,
+            )
+            for stat in result.scalars().all()
+        ]
+
+    async def fold_stats(self) -> int:
+        """Сворачивает накопленные дельты в car_stats; возвращает число групп."""
+        folded = await self.session.scalar(select(func.car_stats_fold()))
         await self.session.commit()
+        return folded
+
+    async def create_price_history_partitions(self, months_ahead: int) -> None:
+        """Создает месячные секции car_price_history на months_ahead вперед."""
+        await self.session.execute(
+            text(
+                "SELECT create_car_price_history_partition("
+                "(date_trunc('month', now()) + make_interval(months => i))::date) "
+                "FROM generate_series(0, :months_ahead) AS i"
+            ),
+            {"months_ahead": months_ahead},
+        )
+        await self._commit()
+
+    async def _record_price_change(
+        self, car_id: UUID, old_price: Optional[float], new_price: float
+    ) -> None:
+        """Пишет изменение цены в текущую транзакцию (коммитит вызывающий)."""
+        await self.session.execute(
+            insert(CarPriceHistoryModel).values(
+                car_id=car_id, old_price=old_price, new_price=new_price
+            )
+        )
+
+    async def delete(self, car_id: UUID) -> None:
+        stmt = delete(CarModel).where(CarModel.id == car_id).returning(CarModel.id)
+        result = await self.session.execute(stmt)
+        if result.scalar() is not None:
+            await OutboxRepository(self.session).add(
+                "car.deleted", {"car_id": str(car_id)}
+            )
+        await self._commit()
 
 
 class ImageRepository(IImageRepository):
-    def __init__(self, session: AsyncSession):  # Принимаем AsyncSession
+    def __init__(self, session: AsyncSession, autocommit: bool = True):
         self.session = session
+        self.autocommit = autocommit
+
+    async def _commit(self) -> None:
+        if self.autocommit:
+            await self.session.commit()
+            # В unit of work кэш сбрасывается после общего commit
+            catalog_cache.bump()
+
+    @staticmethod
+    def _to_entity(image: ImageModel) -> ImageEntity:
+        return ImageEntity(
+            id=image.id,
+            car_id=image.car_id,
+            url=image.url,
+            description=image.description,
+            is_main=image.is_main,
+            created_at=image.created_at,
+            uploaded_at=image.created_at,  # отдельной колонки нет, это время загрузки
+            blob_sha256=image.blob_sha256,
+        )
+
+    async def get(self, **filters) -> Optional[ImageEntity]:
+        result = await self.session.execute(select(ImageModel).filter_by(**filters))
+        image = result.scalars().first()
+        return self._to_entity(image) if image else None
+
+    async def get_multi(self, offset: int, limit: int, **filters) -> List[ImageEntity]:
+        stmt = select(ImageModel).filter_by(**filters).offset(offset).limit(limit)
+        result = await self.session.execute(stmt)
+        return [self._to_entity(image) for image in result.scalars().all()]
 
     async def get_by_car_id(self, car_id: UUID) -> List[ImageEntity]:
         stmt = select(ImageModel).where(ImageModel.car_id == car_id)
         result = await self.session.execute(stmt)
-        return [
-            ImageEntity(
-                id=image.id,
-                car_id=image.car_id,
-                url=image.url,
-                description=image.description,
-                is_main=image.is_main,
-                created_at=image.created_at,
-                uploaded_at=image.uploaded_at,
-            )
-            for image in result.scalars().all()
-        ]
+        return [self._to_entity(image) for image in result.scalars().all()]
 
     async def create(self, image: ImageEntity) -> ImageEntity:
 
         if image is None:
             raise ValueError("Image cannot be None")
 
-        image_model = ImageModel(**image.__dict__)
-        self.session.add(image_model)
-        await self.session.commit()
-        await self.session.refresh(image_model)
-        return ImageEntity(**image_model.__dict__)
+        return (await self.create_many([image]))[0]
+
+    async def create_many(self, images: List[ImageEntity]) -> List[ImageEntity]:
+        """Вставляет все изображения одним INSERT ... RETURNING."""
+        if not images:
+            return []
+        result = await self.session.scalars(
+            insert(ImageModel).returning(ImageModel, sort_by_parameter_order=True),
+            [
+                {
+                    "id": image.id,
+                    "car_id": image.car_id,
+                    "url": image.url,
+                    "description": image.description,
+                    "is_main": image.is_main,
+                    "blob_sha256": image.blob_sha256,
+                }
+                for image in images
+            ],
+        )
+        image_models = result.all()
+        await OutboxRepository(self.session).add_many(
+            "image.created",
+            [
+                {"image_id": str(image.id), "car_id": str(image.car_id)}
+                for image in image_models
+            ],
+        )
+        await self._commit()
+        return [self._to_entity(image) for image in image_models]
+
+    async def update(self, data: ImageEntity, **filters) -> Optional[ImageEntity]:
+        stmt = (
+            update(ImageModel)
+            .filter_by(**filters)
+            .values(url=data.url, description=data.description, is_main=data.is_main)
+            .returning(ImageModel)
+        )
+        image = (await self.session.scalars(stmt)).first()
+        await self._commit()
+        return self._to_entity(image) if image else None
 
     async def delete(self, image_id: UUID) -> None:
-        stmt = delete(ImageModel).where(ImageModel.id == image_id)
-        await self.session.execute(stmt)
-        await self.session.commit()
+        stmt = (
+            delete(ImageModel)
+            .where(ImageModel.id == image_id)
+            .returning(ImageModel.car_id)
+        )
+        car_id = (await self.session.execute(stmt)).scalar()
+        if car_id is not None:
+            await OutboxRepository(self.session).add(
+                "image.deleted", {"image_id": str(image_id), "car_id": str(car_id)}
+            )
+        await self._commit()
+
+
+class ImageBlobRepository(IImageBlobRepository):
+    """Content-addressed image objects. ref_count is kept by triggers."""
+
+    def __init__(self, session: AsyncSession, autocommit: bool = True):
+        self.session = session
+        self.autocommit = autocommit
+
+    async def _commit(self) -> None:
+        if self.autocommit:
+            await self.session.commit()
+
+    @staticmethod
+    def _to_entity(blob: ImageBlobModel) -> ImageBlobEntity:
+        return ImageBlobEntity(
+            sha256=blob.sha256,
+            size=blob.size,
+            content_type=blob.content_type,
+            ref_count=blob.ref_count,
+            uploaded=blob.uploaded,
+            created_at=blob.created_at,
+            released_at=blob.released_at,
+        )
+
+    @staticmethod
+    def _renew_lease():
+        # Неиспользуемый объект снова получает полный льготный срок до GC
+        return case(
+            (ImageBlobModel.ref_count == 0, func.now()),
+            else_=ImageBlobModel.released_at,
+        )
+
+    async def get(self, sha256: str) -> Optional[ImageBlobEntity]:
+        blob = await self.session.get(ImageBlobModel, sha256)
+        return self._to_entity(blob) if blob else None
+
+    async def reserve(self, blob: ImageBlobEntity) -> ImageBlobEntity:
+        """Returns the blob for the content, creating it before the upload.
+
+        Until the object is verified the size and type are only the client's
+        claim, so a newer claim replaces them.
+        """
+        stmt = pg_insert(ImageBlobModel).values(
+            sha256=blob.sha256,
+            size=blob.size,
+            content_type=blob.content_type,
+            released_at=func.now(),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ImageBlobModel.sha256],
+            set_={
+                "size": case(
+                    (ImageBlobModel.uploaded, ImageBlobModel.size),
+                    else_=stmt.excluded.size,
+                ),
+                "content_type": case(
+                    (ImageBlobModel.uploaded, ImageBlobModel.content_type),
+                    else_=stmt.excluded.content_type,
+                ),
+                "released_at": self._renew_lease(),
+            },
+        ).returning(ImageBlobModel)
+        reserved = (await self.session.scalars(stmt)).one()
+        await self._commit()
+        return self._to_entity(reserved)
+
+    async def mark_uploaded(self, sha256: str, size: int, content_type: str) -> bool:
+        result = await self.session.execute(
+            update(ImageBlobModel)
+            .where(ImageBlobModel.sha256 == sha256)
+            .values(
+                uploaded=True,
+                size=size,
+                content_type=content_type,
+                released_at=self._renew_lease(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self._commit()
+        return result.rowcount > 0
+
+    async def delete_released(self, older_than: timedelta, limit: int) -> List[str]:
+        """Deletes up to `limit` blobs unused for longer than `older_than`.
+
+        Returns their keys; the objects are removed from the storage after the
+        commit. A concurrent image insert either waits for the row lock and
+        then fails on the foreign key, or bumps ref_count first so the row no
+        longer qualifies when DELETE rechecks it.
+        """
+        victims = (
+            select(ImageBlobModel.sha256)
+            .where(
+                ImageBlobModel.ref_count == 0,
+                ImageBlobModel.released_at < func.now() - older_than,
+            )
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            delete(ImageBlobModel)
+            .where(ImageBlobModel.sha256.in_(victims), ImageBlobModel.ref_count == 0)
+            .returning(ImageBlobModel.sha256)
+        )
+        deleted = list((await self.session.scalars(stmt)).all())
+        await self._commit()
+        return deleted
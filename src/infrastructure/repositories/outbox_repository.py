@@ -0,0 +1,96 @@
+from datetime import timedelta
+from typing import Any, Dict, List
+from uuid import UUID
+
+from sqlalchemy import delete, func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.entities import OutboxMessage as OutboxMessageEntity
+from core.repositories import IOutboxRepository
+from infrastructure.models import OutboxModel
+
+
+class OutboxRepository(IOutboxRepository):
+    """Сообщения outbox. add не коммитит: запись идет в транзакции вызывающего."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def add(self, topic: str, payload: Dict[str, Any]) -> None:
+        await self.session.execute(
+            insert(OutboxModel).values(topic=topic, payload=payload)
+        )
+
+    async def add_many(self, topic: str, payloads: List[Dict[str, Any]]) -> None:
+        if payloads:
+            await self.session.execute(
+                insert(OutboxModel),
+                [{"topic": topic, "payload": payload} for payload in payloads],
+            )
+
+    async def claim(self, limit: int, lease: float) -> List[OutboxMessageEntity]:
+        """Leases up to `limit` due messages for `lease` seconds.
+
+        The lease is a column, not a row lock: the caller commits the claim
+        right away and runs the handlers outside of this transaction. Rows
+        of a worker that died mid-batch come back once their lease expires.
+        """
+        due = (
+            select(OutboxModel.id)
+            .where(
+                OutboxModel.failed_at.is_(None),
+                OutboxModel.available_at <= func.now(),
+                or_(
+                    OutboxModel.locked_until.is_(None),
+                    OutboxModel.locked_until <= func.now(),
+                ),
+            )
+            .order_by(OutboxModel.available_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(OutboxModel)
+            .where(OutboxModel.id.in_(due.scalar_subquery()))
+            .values(
+                attempts=OutboxModel.attempts + 1,
+                locked_until=func.now() + timedelta(seconds=lease),
+            )
+            .returning(OutboxModel)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(stmt)
+        return [
+            OutboxMessageEntity(
+                id=message.id,
+                topic=message.topic,
+                payload=message.payload,
+                attempts=message.attempts,
+                created_at=message.created_at,
+            )
+            for message in result.scalars().all()
+        ]
+
+    async def complete(self, ids: List[UUID]) -> None:
+        if ids:
+            await self.session.execute(
+                delete(OutboxModel).where(OutboxModel.id.in_(ids))
+            )
+
+    async def retry(self, message_id: UUID, error: str, delay: float) -> None:
+        await self.session.execute(
+            update(OutboxModel)
+            .where(OutboxModel.id == message_id)
+            .values(
+                last_error=error,
+                available_at=func.now() + timedelta(seconds=delay),
+                locked_until=None,
+            )
+        )
+
+    async def fail(self, message_id: UUID, error: str) -> None:
+        await self.session.execute(
+            update(OutboxModel)
+            .where(OutboxModel.id == message_id)
+            .values(last_error=error, failed_at=func.now(), locked_until=None)
+        )
@@ -0,0 +1,64 @@
+from typing import Any
+
+import orjson
+from sqlalchemy import Select, Table, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from core.entities import ResultCount
+
+RELTUPLES_QUERY = text(
+    "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"
+)
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) of a statement, keeping its bound parameters."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def count_rows(
+    session: AsyncSession, stmt: Select, exact_limit: int | None = None
+) -> ResultCount:
+    """Counts the rows of `stmt`, exactly up to `exact_limit`.
+
+    Without a limit this is a plain COUNT(*). With one, at most
+    exact_limit + 1 rows are counted; past that the total is the planner's
+    estimate, which costs no scan: pg_class.reltuples for a whole table or
+    the row estimate of EXPLAIN for a filtered query. An estimate is never
+    reported below the limit, as more rows are known to exist.
+    """
+    if exact_limit is None:
+        return ResultCount(await _count(session, stmt))
+    counted = await _count(session, stmt.limit(exact_limit + 1))
+    if counted <= exact_limit:
+        return ResultCount(counted)
+    estimate = await _estimate(session, stmt)
+    return ResultCount(max(estimate, exact_limit + 1), exact=False)
+
+
+async def _count(session: AsyncSession, stmt: Select) -> int:
+    return await session.scalar(select(func.count()).select_from(stmt.subquery()))
+
+
+async def _estimate(session: AsyncSession, stmt: Select) -> int:
+    froms = stmt.get_final_froms()
+    if stmt.whereclause is None and len(froms) == 1 and isinstance(froms[0], Table):
+        reltuples = await session.scalar(RELTUPLES_QUERY, {"table": froms[0].name})
+        # -1 - таблицу еще ни разу не анализировали
+        if reltuples is not None and reltuples >= 0:
+            return reltuples
+    plan: Any = await session.scalar(Explain(stmt))
+    if isinstance(plan, (str, bytes)):
+        plan = orjson.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -0,0 +1,92 @@
+from datetime import datetime
+from typing import List, Set
+from uuid import UUID
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.entities import SavedSearch as SavedSearchEntity
+from core.repositories import ISavedSearchRepository
+from infrastructure.models import SavedSearchModel
+
+
+class SavedSearchRepository(ISavedSearchRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @staticmethod
+    def _to_entity(search: SavedSearchModel) -> SavedSearchEntity:
+        return SavedSearchEntity(
+            id=search.id,
+            user_id=search.user_id,
+            name=search.name,
+            make=search.make,
+            model=search.model,
+            fuel_type=search.fuel_type,
+            min_price=search.min_price,
+            max_price=search.max_price,
+            min_year=search.min_year,
+            max_year=search.max_year,
+            min_mileage=search.min_mileage,
+            max_mileage=search.max_mileage,
+            created_at=search.created_at,
+        )
+
+    async def get_multi(
+        self, offset: int, limit: int, **filters
+    ) -> List[SavedSearchEntity]:
+        stmt = (
+            select(SavedSearchModel)
+            .filter_by(**filters)
+            .order_by(SavedSearchModel.created_at)
+            .offset(offset)
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return [self._to_entity(search) for search in result.scalars().all()]
+
+    async def get_all(self) -> List[SavedSearchEntity]:
+        result = await self.session.stream_scalars(select(SavedSearchModel))
+        return [self._to_entity(search) async for search in result]
+
+    async def get_created_since(self, since: datetime) -> List[SavedSearchEntity]:
+        stmt = select(SavedSearchModel).where(SavedSearchModel.created_at >= since)
+        result = await self.session.execute(stmt)
+        return [self._to_entity(search) for search in result.scalars().all()]
+
+    async def get_existing_ids(self, ids: List[UUID]) -> Set[UUID]:
+        if not ids:
+            return set()
+        result = await self.session.scalars(
+            select(SavedSearchModel.id).where(SavedSearchModel.id.in_(ids))
+        )
+        return set(result.all())
+
+    async def create(self, data: SavedSearchEntity) -> SavedSearchEntity:
+        search_model = SavedSearchModel(
+            user_id=data.user_id,
+            name=data.name,
+            make=data.make,
+            model=data.model,
+            fuel_type=data.fuel_type,
+            min_price=data.min_price,
+            max_price=data.max_price,
+            min_year=data.min_year,
+            max_year=data.max_year,
+            min_mileage=data.min_mileage,
+            max_mileage=data.max_mileage,
+        )
+        self.session.add(search_model)
+        await self.session.commit()
+        return self._to_entity(search_model)
+
+    async def delete(self, search_id: UUID, user_id: UUID) -> bool:
+        stmt = (
+            delete(SavedSearchModel)
+            .where(SavedSearchModel.id == search_id)
+            .where(SavedSearchModel.user_id == user_id)
+            .returning(SavedSearchModel.id)
+        )
+        result = await self.session.execute(stmt)
+        await self.session.commit()
+        return result.first() is not None
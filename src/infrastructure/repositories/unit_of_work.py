@@ -0,0 +1,22 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.repositories import IUnitOfWork
+from infrastructure.repositories.cars_repository import CarRepository, ImageRepository
+from infrastructure.repositories.outbox_repository import OutboxRepository
+from utils.query_cache import catalog_cache
+
+
+class UnitOfWork(IUnitOfWork):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.cars = CarRepository(session, autocommit=False)
+        self.images = ImageRepository(session, autocommit=False)
+        self.outbox = OutboxRepository(session)
+
+    async def commit(self) -> None:
+        await self.session.commit()
+        catalog_cache.bump()
+
+    async def rollback(self) -> None:
+        # После commit транзакции уже нет, и rollback ничего не делает
+        await self.session.rollback()
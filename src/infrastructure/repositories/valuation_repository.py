@@ -0,0 +1,77 @@
+from typing import List
+
+from sqlalchemy import column, func, select, table, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.entities import CarValuation
+from core.repositories import IValuationRepository
+from infrastructure.models import MatviewRefresh
+
+# Материализованное представление (миграция d5e2a7c41f83), в metadata не входит
+car_valuation_stats = table(
+    "car_valuation_stats",
+    column("make"),
+    column("model"),
+    column("year"),
+    column("mileage_band"),
+    column("listings"),
+    column("p10"),
+    column("p25"),
+    column("median"),
+    column("p75"),
+    column("p90"),
+)
+
+# Любое число, общее для всех воркеров: обновлять представление должен один
+REFRESH_LOCK_ID = 0x76616C75
+
+
+class ValuationRepository(IValuationRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_segment(
+        self, make: str, model: str, year: int, mileage_bands: List[int]
+    ) -> List[CarValuation]:
+        stats = car_valuation_stats.c
+        refreshed_at = (
+            select(MatviewRefresh.refreshed_at)
+            .where(MatviewRefresh.view_name == car_valuation_stats.name)
+            .scalar_subquery()
+        )
+        stmt = select(car_valuation_stats, refreshed_at.label("refreshed_at")).where(
+            stats.make == make.lower(),
+            stats.model == model.lower(),
+            stats.year == year,
+            stats.mileage_band.in_(mileage_bands),
+        )
+        result = await self.session.execute(stmt)
+        return [CarValuation(**row._mapping) for row in result]
+
+    async def refresh(self) -> bool:
+        """Refreshes the view unless another worker is already doing it.
+
+        CONCURRENTLY builds the new snapshot next to the old one, so readers
+        are never blocked while it runs. The refresh time is recorded in
+        the same transaction, so it always matches the visible snapshot.
+        """
+        locked = await self.session.scalar(
+            select(func.pg_try_advisory_xact_lock(REFRESH_LOCK_ID))
+        )
+        if not locked:
+            await self.session.rollback()
+            return False
+        await self.session.execute(
+            text("REFRESH MATERIALIZED VIEW CONCURRENTLY car_valuation_stats")
+        )
+        await self.session.execute(
+            pg_insert(MatviewRefresh)
+            .values(view_name=car_valuation_stats.name, refreshed_at=func.now())
+            .on_conflict_do_update(
+                index_elements=[MatviewRefresh.view_name],
+                set_={"refreshed_at": func.now()},
+            )
+        )
+        await self.session.commit()
+        return True
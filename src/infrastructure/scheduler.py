@@ -0,0 +1,288 @@
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from infrastructure.models import JobRun
+from infrastructure.postgres_db import database
+from utils.logger import get_logger
+
+logger = get_logger()
+
+# Первый ключ двухключевых advisory lock-ов планировщика, второй - hashtext(имени)
+LOCK_NAMESPACE = 0x6A6F62
+
+
+class CronSchedule:
+    """Five-field cron expression: minute hour day-of-month month day-of-week.
+
+    Fields accept "*", numbers, "a-b" ranges, "/step" and comma lists.
+    Day of week is 0-6 with Sunday as 0 (7 is also Sunday). Times are UTC.
+    """
+
+    RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 6))
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Invalid cron expression: {expression!r}")
+        self.expression = expression
+        parsed = [
+            self._parse(value, low, high)
+            for value, (low, high) in zip(fields, self.RANGES)
+        ]
+        self.minutes, self.hours, self.days, self.months, self.weekdays = parsed
+        # Как в cron: если ограничены оба поля дня, достаточно совпадения одного
+        self.days_restricted = fields[2] != "*"
+        self.weekdays_restricted = fields[4] != "*"
+
+    @staticmethod
+    def _parse(value: str, low: int, high: int) -> frozenset[int]:
+        weekday = high == 6
+        upper = 7 if weekday else high  # 7 - тоже воскресенье
+        result = set()
+        for part in value.split(","):
+            part, _, step = part.partition("/")
+            if part == "*":
+                start, end = low, high
+            elif "-" in part:
+                start, end = map(int, part.split("-", 1))
+            else:
+                start = end = int(part)
+                if step:
+                    end = high
+            if start < low or end > upper or start > end:
+                raise ValueError(f"Invalid cron field: {value!r}")
+            result.update(range(start, end + 1, int(step or 1)))
+        if weekday and 7 in result:
+            result = (result - {7}) | {0}
+        return frozenset(result)
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day = moment.day in self.days
+        weekday = (moment.isoweekday() % 7) in self.weekdays
+        if self.days_restricted and self.weekdays_restricted:
+            return day or weekday
+        return day and weekday
+
+    def next_after(self, moment: datetime) -> datetime:
+        moment = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + timedelta(days=366 * 5)
+        while moment < limit:
+            if moment.month not in self.months:
+                year, month = divmod(moment.month, 12)
+                moment = moment.replace(
+                    year=moment.year + year, month=month + 1, day=1, hour=0, minute=0
+                )
+            elif not self._day_matches(moment):
+                moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+            elif moment.hour not in self.hours:
+                moment = (moment + timedelta(hours=1)).replace(minute=0)
+            elif moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+            else:
+                return moment
+        raise ValueError(f"Cron expression never fires: {self.expression!r}")
+
+
+@dataclass
+class JobMetrics:
+    runs: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    skipped: int = 0  # не взята блокировка или задачу уже выполнил другой воркер
+    last_started_at: datetime | None = None
+    last_duration_ms: float | None = None
+    last_error: str | None = None
+
+
+@dataclass
+class Job:
+    name: str
+    func: Callable[[], Awaitable[object]]
+    interval: float | None = None  # секунды; либо interval, либо cron
+    cron: CronSchedule | None = None
+    jitter: float = 0.0
+    timeout: float | None = None
+    # False - задача выполняется в каждом воркере (например, локальные кэши)
+    single_instance: bool = True
+    metrics: JobMetrics = field(default_factory=JobMetrics)
+
+    def next_run(self, now: datetime) -> datetime:
+        if self.cron is not None:
+            return self.cron.next_after(now)
+        return now + timedelta(seconds=self.interval)
+
+    def due_after(self, scheduled_at: datetime) -> datetime:
+        """A run started after this moment already covers `scheduled_at`."""
+        if self.cron is not None:
+            # Слоты cron минутные; запас покрывает jitter (до 30 с) и разницу часов
+            return scheduled_at - timedelta(seconds=30)
+        # Таймеры воркеров не синхронизированы, поэтому с запасом в 10%
+        return scheduled_at - timedelta(seconds=self.interval * 0.9)
+
+
+class Scheduler:
+    """Periodic asyncio jobs shared across workers, processes and nodes.
+
+    Every worker keeps a timer per job. When it fires, the worker tries a
+    Postgres advisory lock for the job. The lock holder then checks the
+    job_runs table and runs the job only if no other worker has already
+    run it for this slot. A job therefore runs once per interval or cron
+    slot, however many workers there are.
+    """
+
+    def __init__(self):
+        self.jobs: dict[str, Job] = {}
+        self._tasks: list[asyncio.Task] = []
+
+    def add_job(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[object]],
+        *,
+        interval: float | None = None,
+        cron: str | None = None,
+        jitter: float = 0.0,
+        timeout: float | None = None,
+        single_instance: bool = True,
+    ) -> Job:
+        if (interval is None) == (cron is None):
+            raise ValueError("Exactly one of interval and cron must be given")
+        job = Job(
+            name=name,
+            func=func,
+            interval=interval,
+            cron=CronSchedule(cron) if cron is not None else None,
+            jitter=jitter,
+            timeout=timeout,
+            single_instance=single_instance,
+        )
+        self.jobs[name] = job
+        return job
+
+    def metrics(self) -> dict[str, JobMetrics]:
+        return {name: job.metrics for name, job in self.jobs.items()}
+
+    async def start(self):
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._loop(job)) for job in self.jobs.values()
+            ]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _loop(self, job: Job):
+        while True:
+            scheduled_at = job.next_run(datetime.now(timezone.utc))
+            delay = (scheduled_at - datetime.now(timezone.utc)).total_seconds()
+            await asyncio.sleep(max(0.0, delay) + random.uniform(0, job.jitter))
+            try:
+                await self.run(job, scheduled_at)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Scheduler failed to run job %s", job.name)
+
+    async def run(self, job: Job, scheduled_at: datetime | None = None) -> bool:
+        """Runs the job now if this worker wins it; returns whether it ran."""
+        if not job.single_instance:
+            await self._execute(job)
+            return True
+        scheduled_at = scheduled_at or datetime.now(timezone.utc)
+        async with database.engine.connect() as connection:
+            # Блокировка держится все время выполнения, без открытой транзакции
+            connection = await connection.execution_options(
+                isolation_level="AUTOCOMMIT"
+            )
+            key = (LOCK_NAMESPACE, func.hashtext(job.name))
+            if not await connection.scalar(select(func.pg_try_advisory_lock(*key))):
+                job.metrics.skipped += 1
+                return False
+            try:
+                if not await self._claim(connection, job, scheduled_at):
+                    job.metrics.skipped += 1
+                    return False
+                status, error, duration = await self._execute(job)
+                await self._record(connection, job, status, error, duration)
+                return True
+            finally:
+                await connection.scalar(select(func.pg_advisory_unlock(*key)))
+
+    async def _execute(self, job: Job) -> tuple[str, str | None, float]:
+        metrics = job.metrics
+        metrics.runs += 1
+        metrics.last_started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        status, error = "ok", None
+        try:
+            await asyncio.wait_for(job.func(), job.timeout)
+        except asyncio.TimeoutError:
+            status, error = "timeout", f"Timed out after {job.timeout} s"
+            metrics.timeouts += 1
+        except Exception as exc:
+            status, error = "failed", repr(exc)
+            metrics.failures += 1
+            logger.exception("Job %s failed", job.name)
+        duration = (time.perf_counter() - started) * 1000
+        metrics.last_duration_ms, metrics.last_error = duration, error
+        if status == "timeout":
+            logger.error("Job %s timed out after %s s", job.name, job.timeout)
+        elif status == "ok":
+            logger.info("Job %s finished in %.1f ms", job.name, duration)
+        return status, error, duration
+
+    @staticmethod
+    async def _claim(
+        connection: AsyncConnection, job: Job, scheduled_at: datetime
+    ) -> bool:
+        """Marks the job started unless another worker already ran this slot."""
+        stmt = (
+            pg_insert(JobRun)
+            .values(
+                name=job.name, last_started_at=func.now(), last_status="running", runs=1
+            )
+            .on_conflict_do_update(
+                index_elements=[JobRun.name],
+                set_={
+                    "last_started_at": func.now(),
+                    "last_status": "running",
+                    "runs": JobRun.runs + 1,
+                },
+                where=JobRun.last_started_at <= job.due_after(scheduled_at),
+            )
+            .returning(JobRun.name)
+        )
+        return (await connection.execute(stmt)).first() is not None
+
+    @staticmethod
+    async def _record(
+        connection: AsyncConnection,
+        job: Job,
+        status: str,
+        error: str | None,
+        duration: float,
+    ):
+        await connection.execute(
+            update(JobRun)
+            .where(JobRun.name == job.name)
+            .values(
+                last_finished_at=func.now(),
+                last_status=status,
+                last_error=error,
+                last_duration_ms=duration,
+            )
+        )
+
+
+scheduler = Scheduler()
@@ -0,0 +1,401 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import mimetypes
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterable
+from urllib.error import HTTPError
+from urllib.parse import quote, urlsplit
+from urllib.request import Request, urlopen
+
+from core.entities import StoredObject, UploadForm
+from core.repositories import IObjectStorage
+from settings import get_settings
+
+config = get_settings()
+
+# Так в images.url хранятся объекты из нашего бакета; внешние URL не меняются
+STORAGE_SCHEME = "storage://"
+
+
+def storage_url(key: str) -> str:
+    return STORAGE_SCHEME + key
+
+
+def object_key(url: str) -> str | None:
+    """Object key of an image stored in our bucket, None for external URLs."""
+    return url[len(STORAGE_SCHEME) :] if url.startswith(STORAGE_SCHEME) else None
+
+
+class S3Presigner:
+    """Presigns S3 requests locally with AWS Signature Version 4.
+
+    Each URL costs one SHA-256 of the canonical request and one HMAC. The
+    signing key depends only on the date, so it is derived once a day, and
+    a batch shares one timestamp and credential scope. This avoids building
+    a botocore request per URL.
+    """
+
+    ALGORITHM = "AWS4-HMAC-SHA256"
+
+    def __init__(self, bucket_url: str, region: str, access_key: str, secret_key: str):
+        parts = urlsplit(bucket_url.rstrip("/"))
+        self.base_url = f"{parts.scheme}://{parts.netloc}"
+        self.host = parts.netloc
+        self.base_path = parts.path
+        # path-style (http://host/<bucket>) или virtual-hosted (<bucket>.s3...)
+        self.bucket = parts.path.strip("/") or parts.netloc.split(".")[0]
+        self.region = region
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self._signing_keys: dict[str, bytes] = {}
+
+    def presign_get(
+        self, keys: Iterable[str], expires_in: int, now: datetime | None = None
+    ) -> dict[str, str]:
+        """Returns {key: URL} for GET requests valid `expires_in` seconds."""
+        return self.presign("GET", keys, expires_in, now)
+
+    def presign(
+        self,
+        method: str,
+        keys: Iterable[str],
+        expires_in: int,
+        now: datetime | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> dict[str, str]:
+        """Returns {key: URL}; the request must send exactly `headers`.
+
+        x-amz-* headers are only honored when signed, so they are part of
+        the signature like host.
+        """
+        now = now or datetime.now(timezone.utc)
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        scope = f"{amz_date[:8]}/{self.region}/s3/aws4_request"
+        signing_key = self._signing_key(amz_date[:8])
+        signed = {"host": self.host}
+        for name, value in (headers or {}).items():
+            signed[name.lower()] = value.strip()
+        names = sorted(signed)
+        canonical_headers = "".join(f"{name}:{signed[name]}\n" for name in names)
+        signed_headers = ";".join(names)
+        query = (
+            f"X-Amz-Algorithm={self.ALGORITHM}"
+            f"&X-Amz-Credential={quote(f'{self.access_key}/{scope}', safe='')}"
+            f"&X-Amz-Date={amz_date}"
+            f"&X-Amz-Expires={expires_in}"
+            f"&X-Amz-SignedHeaders={quote(signed_headers, safe='')}"
+        )
+        prefix = f"{self.ALGORITHM}\n{amz_date}\n{scope}\n"
+        urls = {}
+        for key in keys:
+            path = quote(f"{self.base_path}/{key}", safe="/~")
+            canonical_request = (
+                f"{method}\n{path}\n{query}\n{canonical_headers}\n"
+                f"{signed_headers}\nUNSIGNED-PAYLOAD"
+            )
+            digest = hashlib.sha256(canonical_request.encode()).hexdigest()
+            signature = hmac.new(
+                signing_key, (prefix + digest).encode(), hashlib.sha256
+            ).hexdigest()
+            urls[key] = f"{self.base_url}{path}?{query}&X-Amz-Signature={signature}"
+        return urls
+
+    def presign_post(
+        self,
+        key: str,
+        content_type: str,
+        size: int,
+        sha256: str,
+        expires_in: int,
+        now: datetime | None = None,
+    ) -> UploadForm:
+        """Browser-based upload form for exactly one object.
+
+        The signed policy pins the key, content type, size and SHA-256 of the
+        file. The storage checks the checksum while receiving the body and
+        rejects any other file without involving the API.
+        """
+        now = now or datetime.now(timezone.utc)
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        credential = f"{self.access_key}/{amz_date[:8]}/{self.region}/s3/aws4_request"
+        expires_at = now + timedelta(seconds=expires_in)
+        fields = {
+            "key": key,
+            "Content-Type": content_type,
+            "x-amz-checksum-algorithm": "SHA256",
+            "x-amz-checksum-sha256": base64.b64encode(bytes.fromhex(sha256)).decode(),
+            "x-amz-algorithm": self.ALGORITHM,
+            "x-amz-credential": credential,
+            "x-amz-date": amz_date,
+        }
+        policy = {
+            "expiration": expires_at.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "conditions": [
+                {"bucket": self.bucket},
+                ["content-length-range", size, size],
+                *({name: value} for name, value in fields.items()),
+            ],
+        }
+        encoded = base64.b64encode(json.dumps(policy).encode()).decode()
+        fields["policy"] = encoded
+        fields["x-amz-signature"] = hmac.new(
+            self._signing_key(amz_date[:8]), encoded.encode(), hashlib.sha256
+        ).hexdigest()
+        bucket_url = f"{self.base_url}{self.base_path}"
+        if not self.base_path:
+            bucket_url += "/"
+        return UploadForm(url=bucket_url, key=key, fields=fields, expires_at=expires_at)
+
+    def _signing_key(self, datestamp: str) -> bytes:
+        key = self._signing_keys.get(datestamp)
+        if key is None:
+            key = f"AWS4{self.secret_key}".encode()
+            for part in (datestamp, self.region, "s3", "aws4_request"):
+                key = hmac.new(key, part.encode(), hashlib.sha256).digest()
+            self._signing_keys = {datestamp: key}
+        return key
+
+
+class PresignedUrlCache:
+    """Presigned GET URLs by object key, reused until shortly before expiry.
+
+    A URL is handed out while at least `min_remaining` seconds of its
+    lifetime are left, so clients always get time to load it. Keys missing
+    from the cache are signed together in one batch by the storage backend.
+    """
+
+    def __init__(
+        self,
+        presigner: IObjectStorage,
+        expires_in: int = 3600,
+        min_remaining: int = 300,
+        max_entries: int = 100_000,
+    ):
+        self.presigner = presigner
+        self.expires_in = expires_in
+        self.min_remaining = min_remaining
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._urls: OrderedDict[str, tuple[str, float]] = OrderedDict()
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, str]:
+        now = time.time()
+        urls, missing = {}, []
+        for key in dict.fromkeys(keys):
+            cached = self._urls.get(key)
+            if cached is not None and cached[1] - now >= self.min_remaining:
+                self._urls.move_to_end(key)
+                urls[key] = cached[0]
+            else:
+                missing.append(key)
+        self.hits += len(urls)
+        self.misses += len(missing)
+        if missing:
+            signed_at = datetime.fromtimestamp(int(now), timezone.utc)
+            expires_at = int(now) + self.expires_in
+            for key, url in self.presigner.presign_get(
+                missing, self.expires_in, signed_at
+            ).items():
+                urls[key] = url
+                self._urls[key] = (url, expires_at)
+                self._urls.move_to_end(key)
+            while len(self._urls) > self.max_entries:
+                self._urls.popitem(last=False)
+        return urls
+
+    def resolve(self, urls: Iterable[str]) -> dict[str, str]:
+        """Maps image URLs to ones a browser can load; external URLs stay."""
+        urls = list(urls)
+        keys = {url: object_key(url) for url in urls}
+        signed = self.get_many(key for key in keys.values() if key is not None)
+        return {url: signed[key] if key else url for url, key in keys.items()}
+
+
+class S3Storage(IObjectStorage):
+    """Private S3 bucket. Clients upload to it directly with a presigned POST."""
+
+    # Без этого заголовка S3 не возвращает контрольную сумму в ответе на HEAD
+    CHECKSUM_HEADERS = {"x-amz-checksum-mode": "ENABLED"}
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, presigner: S3Presigner, timeout: float = 10.0):
+        self.presigner = presigner
+        self.timeout = timeout
+
+    def url(self, key: str) -> str:
+        return storage_url(key)
+
+    def presign_get(
+        self, keys: Iterable[str], expires_in: int, now: datetime | None = None
+    ) -> dict[str, str]:
+        return self.presigner.presign_get(keys, expires_in, now)
+
+    def create_upload(
+        self, key: str, content_type: str, size: int, sha256: str, expires_in: int
+    ) -> UploadForm:
+        return self.presigner.presign_post(
+            key, content_type, size, sha256, expires_in
+        )
+
+    async def head(self, key: str) -> StoredObject | None:
+        [url] = self.presigner.presign(
+            "HEAD", [key], 60, headers=self.CHECKSUM_HEADERS
+        ).values()
+        return await asyncio.to_thread(self._head, key, url)
+
+    async def sha256(self, key: str) -> str | None:
+        [url] = self.presigner.presign_get([key], 300).values()
+        return await asyncio.to_thread(self._sha256, url)
+
+    async def delete(self, keys: list[str]) -> None:
+        urls = list(self.presigner.presign("DELETE", keys, 60).values())
+        await asyncio.to_thread(self._delete, urls)
+
+    def _head(self, key: str, url: str) -> StoredObject | None:
+        try:
+            request = Request(url, method="HEAD", headers=self.CHECKSUM_HEADERS)
+            with urlopen(request, timeout=self.timeout) as resp:
+                checksum = resp.headers.get("x-amz-checksum-sha256")
+                return StoredObject(
+                    key=key,
+                    size=int(resp.headers["Content-Length"]),
+                    content_type=resp.headers.get("Content-Type"),
+                    sha256=base64.b64decode(checksum).hex() if checksum else None,
+                )
+        except HTTPError as exc:
+            # Без права на ListBucket S3 отвечает 403 и на отсутствующий объект
+            if exc.code in (403, 404):
+                return None
+            raise
+
+    def _sha256(self, url: str) -> str | None:
+        digest = hashlib.sha256()
+        try:
+            with urlopen(Request(url), timeout=self.timeout) as resp:
+                while chunk := resp.read(self.CHUNK_SIZE):
+                    digest.update(chunk)
+        except HTTPError as exc:
+            if exc.code in (403, 404):
+                return None
+            raise
+        return digest.hexdigest()
+
+    def _delete(self, urls: list[str]) -> None:
+        # DELETE идемпотентен: отсутствующий объект - тоже 204
+        for url in urls:
+            with urlopen(Request(url, method="DELETE"), timeout=self.timeout):
+                pass
+
+
+class LocalStorage(IObjectStorage):
+    """Directory standing in for the bucket in tests and local development.
+
+    Nothing accepts the upload form here; tests put files with `put`. The
+    content types are kept in memory and the checksum is computed on HEAD.
+    """
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        self._content_types: dict[str, str] = {}
+
+    def url(self, key: str) -> str:
+        return storage_url(key)
+
+    def presign_get(
+        self, keys: Iterable[str], expires_in: int, now: datetime | None = None
+    ) -> dict[str, str]:
+        # Файлы доступны напрямую, подписывать и ограничивать по времени нечего
+        return {key: self._path(key).as_uri() for key in keys}
+
+    def create_upload(
+        self, key: str, content_type: str, size: int, sha256: str, expires_in: int
+    ) -> UploadForm:
+        return UploadForm(
+            url=self.root.resolve().as_uri() + "/",
+            key=key,
+            fields={"key": key, "Content-Type": content_type},
+            expires_at=datetime.now(timezone.utc) + timedelta(seconds=expires_in),
+        )
+
+    def put(self, key: str, data: bytes, content_type: str | None = None) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        self._content_types[key] = content_type or mimetypes.guess_type(key)[0]
+
+    async def head(self, key: str) -> StoredObject | None:
+        try:
+            data = self._path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+        return StoredObject(
+            key=key,
+            size=len(data),
+            content_type=self._content_types.get(key, mimetypes.guess_type(key)[0]),
+            sha256=hashlib.sha256(data).hexdigest(),
+        )
+
+    async def sha256(self, key: str) -> str | None:
+        try:
+            return hashlib.sha256(self._path(key).read_bytes()).hexdigest()
+        except FileNotFoundError:
+            return None
+
+    async def delete(self, keys: list[str]) -> None:
+        for key in keys:
+            self._path(key).unlink(missing_ok=True)
+            self._content_types.pop(key, None)
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root.resolve()):
+            raise ValueError(f"Invalid object key: {key!r}")
+        return path
+
+
+object_storage: S3Storage | LocalStorage | None = None
+
+
+def get_object_storage() -> S3Storage | LocalStorage:
+    """
+    Возвращает хранилище изображений, выбранное в настройках
+    """
+    global object_storage
+
+    if not object_storage:
+        if config.storage_backend == "local":
+            object_storage = LocalStorage(config.storage_local_dir)
+        else:
+            object_storage = S3Storage(
+                S3Presigner(
+                    config.storage_bucket_url,
+                    config.storage_region,
+                    config.storage_access_key,
+                    config.storage_secret_key,
+                )
+            )
+    return object_storage
+
+
+image_urls: PresignedUrlCache | None = None
+
+
+def get_image_urls() -> PresignedUrlCache:
+    """
+    Возвращает кэш подписанных ссылок на изображения
+    """
+    global image_urls
+
+    if image_urls is None:
+        # Ссылки подписывает то хранилище, в котором лежат объекты
+        image_urls = PresignedUrlCache(
+            get_object_storage(), expires_in=config.presigned_url_ttl_seconds
+        )
+    return image_urls
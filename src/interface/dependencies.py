@@ -1,16 +1,36 @@
 import logging
 from typing import AsyncGenerator, Generator
-from fastapi import Depends
+from fastapi import Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.exceptions import ForbiddenError
 from core.services import UserService
 from core.services.auth_service import AuthService
 from infrastructure.postgres_db import database
 from infrastructure.repositories import UserRepository
 from infrastructure.repositories import TokenRepository
 
-from core.services import CarService
-from infrastructure.repositories import CarRepository
+from core.entities import User
+from core.indexes import saved_search_index, similarity_index
+from core.services import (
+    CarService,
+    ImageUploadService,
+    SavedSearchService,
+    ValuationService,
+)
+from infrastructure.repositories import (
+    CarRepository,
+    ImageBlobRepository,
+    ImageRepository,
+    SavedSearchRepository,
+    UnitOfWork,
+    ValuationRepository,
+)
+from infrastructure.storage import get_object_storage
+from settings import get_settings
+from utils.query_cache import catalog_cache
+
+config = get_settings()
 
 
 async def get_user_service(session: AsyncSession = Depends(database.get_db_session)):
@@ -29,6 +49,75 @@ async def get_auth_service(session: AsyncSession = Depends(database.get_db_sessi
 
 async def get_car_service(session: AsyncSession = Depends(database.get_db_session)):
     car_repository = CarRepository(session)
-    service = CarService(car_repository)
+    service = CarService(
+        car_repository,
+        similarity_index,
+        UnitOfWork(session),
+        query_cache=catalog_cache,
+    )
     yield service
- 
\ No newline at end of file
+
+
+async def get_image_upload_service(
+    session: AsyncSession = Depends(database.get_db_session),
+):
+    service = ImageUploadService(
+        ImageRepository(session),
+        ImageBlobRepository(session),
+        CarRepository(session),
+        get_object_storage(),
+        max_size=config.image_upload_max_bytes,
+        upload_ttl=config.image_upload_ttl_seconds,
+    )
+    yield service
+
+
+async def get_saved_search_service(
+    session: AsyncSession = Depends(database.get_db_session),
+):
+    repository = SavedSearchRepository(session)
+    service = SavedSearchService(repository, saved_search_index)
+    yield service
+
+
+async def get_valuation_service(
+    session: AsyncSession = Depends(database.get_db_session),
+):
+    repository = ValuationRepository(session)
+    service = ValuationService(repository, config.valuation_min_listings)
+    yield service
+
+
+async def get_current_user(
+    request: Request, auth_service: AuthService = Depends(get_auth_service)
+) -> User:
+    access_token = request.cookies.get("access_token")
+    if not access_token:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    user = await auth_service.verify_access_token(access_token)
+    if not user:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    return user
+
+
+async def get_current_superuser(user: User = Depends(get_current_user)) -> User:
+    if not user.is_superuser:
+        raise ForbiddenError("Superuser access required")
+    return user
+
+
+async def get_streaming_user(request: Request) -> User:
+    """Like get_current_user, but gives the pooled connection back right away.
+
+    Streaming responses keep their dependencies alive until the stream ends,
+    so they must not hold a request-scoped session.
+    """
+    access_token = request.cookies.get("access_token")
+    if not access_token:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    async with database.session_factory() as session:
+        auth_service = AuthService(UserRepository(session), TokenRepository(session))
+        user = await auth_service.verify_access_token(access_token)
+    if not user:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    return user
@@ -0,0 +1,130 @@
+import asyncio
+from uuid import UUID
+
+from core.entities import CarEvent
+from core.indexes import (
+    SimilarityIndex,
+    SuggestIndex,
+    similarity_index,
+    suggest_index,
+)
+from core.services import CarService
+from infrastructure.postgres_db import database
+from infrastructure.repositories import CarRepository
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+class IndexSync:
+    """Runs the database reads of an index sync as tracked background tasks."""
+
+    def __init__(self):
+        self._tasks: set[asyncio.Task] = set()
+
+    def _spawn(self, coroutine):
+        task = asyncio.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._done)
+
+    def _done(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("%s failed", type(self).__name__, exc_info=task.exception())
+
+
+class SimilarityIndexSync(IndexSync):
+    """Keeps the feature matrix of this worker in step with the catalog.
+
+    Full rows from the car_events feed are applied in place. Truncated
+    events are re-read from the database, and a resync after a lost LISTEN
+    connection reloads the whole matrix. Cars that change while a reload is
+    running are re-read once it finishes, because the loaded snapshot may
+    predate them.
+    """
+
+    def __init__(self, index: SimilarityIndex):
+        super().__init__()
+        self.index = index
+        self._reloading = False
+        self._missed: set[UUID] = set()
+
+    async def reload(self) -> int:
+        if self._reloading:
+            return len(self.index)
+        self._reloading, self._missed = True, set()
+        try:
+            async with database.session_factory() as session:
+                service = CarService(
+                    CarRepository(session), similarity_index=self.index
+                )
+                count = await service.load_similarity_index()
+        finally:
+            self._reloading = False
+        if self._missed:
+            await self.refresh(list(self._missed))
+        logger.info("Loaded %d cars into the similarity index", count)
+        return count
+
+    async def refresh(self, car_ids: list[UUID]) -> None:
+        async with database.session_factory() as session:
+            service = CarService(CarRepository(session), similarity_index=self.index)
+            await service.refresh_similarity(car_ids)
+
+    def on_car_event(self, event: CarEvent):
+        if event.op == "resync":
+            self._spawn(self.reload())
+            return
+        if self._reloading:
+            self._missed.add(event.car_id)
+        if event.op == "delete" or (
+            event.car is not None and event.car.get("status") != "active"
+        ):
+            self.index.remove(event.car_id)
+        elif event.truncated:
+            self._spawn(self.refresh([event.car_id]))
+        else:
+            self.index.upsert(event.car_id, event.car)
+
+
+class SuggestIndexSync(IndexSync):
+    """Keeps the typeahead counts of this worker in step with the catalog.
+
+    Events carry the row before and after the change, so counts move
+    without a database read. Truncated events have nothing to diff and
+    trigger a reload. Events seen during a reload may or may not be in the
+    loaded snapshot and are dropped; the periodic reload job corrects the
+    few counts they could skew.
+    """
+
+    def __init__(self, index: SuggestIndex):
+        super().__init__()
+        self.index = index
+        self._reloading = False
+
+    async def reload(self) -> int:
+        if self._reloading:
+            return len(self.index)
+        self._reloading = True
+        try:
+            async with database.session_factory() as session:
+                service = CarService(CarRepository(session), suggest_index=self.index)
+                count = await service.load_suggest_index()
+        finally:
+            self._reloading = False
+        logger.info("Loaded %d terms into the suggest index", count)
+        return count
+
+    def on_car_event(self, event: CarEvent):
+        if self._reloading:
+            return
+        if event.op == "resync" or event.truncated:
+            self._spawn(self.reload())
+        elif event.op == "delete":
+            self.index.apply(old=event.car)
+        else:
+            self.index.apply(old=event.old, new=event.car)
+
+
+similarity_sync = SimilarityIndexSync(similarity_index)
+suggest_sync = SuggestIndexSync(suggest_index)
@@ -0,0 +1,176 @@
+from datetime import timedelta
+
+from core.indexes import saved_search_index
+from core.services import (
+    BannedTokensService,
+    CarService,
+    ImageUploadService,
+    SavedSearchService,
+    ValuationService,
+)
+from infrastructure.postgres_db import database
+from infrastructure.repositories import (
+    CarRepository,
+    ImageBlobRepository,
+    ImageRepository,
+    SavedSearchRepository,
+    TokenRepository,
+    ValuationRepository,
+)
+from infrastructure.scheduler import scheduler
+from infrastructure.storage import get_object_storage
+from interface.index_sync import similarity_sync, suggest_sync
+from settings import get_settings
+from utils.logger import get_logger
+from utils.rate_limiter import PostgresRateLimitBackend, refill_window
+
+config = get_settings()
+logger = get_logger()
+
+
+async def purge_banned_refresh_tokens():
+    """Отозванные токены старше срока жизни refresh токена уже не нужны."""
+    async with database.session_factory() as session:
+        service = BannedTokensService(TokenRepository(session))
+        purged = await service.purge_expired(
+            timedelta(days=config.refresh_token_expire_days)
+        )
+    logger.info("Purged %d expired banned refresh tokens", purged)
+
+
+async def purge_rate_limit_buckets():
+    """Простоявшая дольше периода наполнения корзина снова полна."""
+    purged = await PostgresRateLimitBackend().purge_idle(refill_window())
+    logger.info("Purged %d idle rate limit buckets", purged)
+
+
+async def refresh_valuation_stats():
+    async with database.session_factory() as session:
+        await ValuationService(ValuationRepository(session)).refresh()
+
+
+async def create_price_history_partitions():
+    async with database.session_factory() as session:
+        await CarService(CarRepository(session)).create_price_history_partitions()
+
+
+async def fold_car_stats():
+    async with database.session_factory() as session:
+        await CarService(CarRepository(session)).fold_stats()
+
+
+async def archive_listings():
+    async with database.session_factory() as session:
+        archived = await CarService(CarRepository(session)).archive_listings(
+            timedelta(days=config.listing_expire_days), config.archive_batch_size
+        )
+    logger.info("Archived %d sold and expired listings", archived)
+
+
+async def collect_image_blobs():
+    async with database.session_factory() as session:
+        service = ImageUploadService(
+            ImageRepository(session),
+            ImageBlobRepository(session),
+            CarRepository(session),
+            get_object_storage(),
+            max_size=config.image_upload_max_bytes,
+            upload_ttl=config.image_upload_ttl_seconds,
+        )
+        collected = await service.collect_garbage(
+            timedelta(seconds=config.image_blobs_grace_seconds),
+            config.image_blobs_gc_batch_size,
+        )
+    logger.info("Deleted %d unreferenced image blobs", collected)
+
+
+async def reload_saved_search_index():
+    """Индекс живет в памяти воркера и видит только свои изменения поисков."""
+    async with database.session_factory() as session:
+        service = SavedSearchService(SavedSearchRepository(session), saved_search_index)
+        await service.load_index()
+
+
+def register_jobs():
+    scheduler.add_job(
+        "purge_banned_refresh_tokens",
+        purge_banned_refresh_tokens,
+        interval=config.banned_tokens_purge_seconds,
+        jitter=60,
+        timeout=120,
+    )
+    if config.rate_limit_backend == "postgres":
+        scheduler.add_job(
+            "purge_rate_limit_buckets",
+            purge_rate_limit_buckets,
+            interval=config.rate_limit_purge_seconds,
+            jitter=60,
+            timeout=120,
+        )
+    scheduler.add_job(
+        "refresh_valuation_stats",
+        refresh_valuation_stats,
+        interval=config.valuation_refresh_seconds,
+        jitter=10,
+        timeout=600,
+    )
+    scheduler.add_job(
+        "create_price_history_partitions",
+        create_price_history_partitions,
+        cron="0 3 * * *",
+        jitter=20,
+        timeout=120,
+    )
+    scheduler.add_job(
+        "fold_car_stats",
+        fold_car_stats,
+        interval=config.car_stats_fold_seconds,
+        jitter=5,
+        timeout=120,
+    )
+    scheduler.add_job(
+        "archive_listings",
+        archive_listings,
+        interval=config.archive_interval_seconds,
+        jitter=30,
+        timeout=600,
+    )
+    scheduler.add_job(
+        "collect_image_blobs",
+        collect_image_blobs,
+        interval=config.image_blobs_gc_seconds,
+        jitter=60,
+        timeout=600,
+    )
+
+
+def register_worker_jobs():
+    """Jobs that keep this worker's in-memory indexes fresh.
+
+    They run in every worker whether or not it takes part in the cluster
+    jobs above, since each worker serves requests from its own indexes.
+    """
+    scheduler.add_job(
+        "reload_saved_search_index",
+        reload_saved_search_index,
+        interval=config.saved_searches_reload_seconds,
+        jitter=30,
+        timeout=120,
+        single_instance=False,
+    )
+    scheduler.add_job(
+        "reload_similarity_index",
+        similarity_sync.reload,
+        interval=config.similarity_reload_seconds,
+        jitter=60,
+        timeout=300,
+        single_instance=False,
+    )
+    scheduler.add_job(
+        "reload_suggest_index",
+        suggest_sync.reload,
+        interval=config.suggest_reload_seconds,
+        jitter=60,
+        timeout=120,
+        single_instance=False,
+    )
@@ -3,10 +3,21 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.responses import ORJSONResponse
 
+from infrastructure.car_events import car_events
+from infrastructure.outbox import outbox_dispatcher
+from infrastructure.postgres_db import database
+from infrastructure.scheduler import scheduler
+from interface import outbox_handlers  # noqa: F401 - регистрирует обработчики
+from interface.index_sync import similarity_sync, suggest_sync
+from interface.jobs import register_jobs, register_worker_jobs
+from interface.routers import admin_api
 from interface.routers import auth_api
 from interface.routers import cars_api
+from interface.routers import saved_searches_api
+from interface.warmup import load_indexes, warm_up
 from settings import get_settings
 from utils.logger import get_logger
+from utils.query_cache import catalog_cache
 
 config = get_settings()
 logger = get_logger()
@@ -16,7 +27,31 @@ logger = get_logger()
 async def lifespan(app: FastAPI):
     """Инициализация настроек до запуска сервиса"""
     logger.info(app)
-    yield
+    database.connect()
+    # Слушаем изменения до загрузки индексов, чтобы не пропустить их
+    car_events.add_listener(similarity_sync.on_car_event)
+    car_events.add_listener(suggest_sync.on_car_event)
+    # Записи других воркеров приходят сюда же и сбрасывают кэш запросов
+    car_events.add_listener(catalog_cache.bump)
+    # NOTIFY о записи в cars будит диспетчер в каждом воркере
+    car_events.add_listener(outbox_dispatcher.wake)
+    await car_events.start()
+    await warm_up()
+    await load_indexes()
+    await outbox_dispatcher.start()
+    # Индексы в памяти обновляются в каждом воркере, общие задачи - только
+    # там, где включен планировщик
+    register_worker_jobs()
+    if config.scheduler_enabled:
+        register_jobs()
+    await scheduler.start()
+    try:
+        yield
+    finally:
+        await scheduler.stop()
+        await outbox_dispatcher.stop()
+        await car_events.stop()
+        await database.disconnect()
 
 
 app = FastAPI(
@@ -29,5 +64,7 @@ app = FastAPI(
     lifespan=lifespan,
     debug=config.is_debug_mode,
 )
+app.include_router(admin_api)
 app.include_router(auth_api)
 app.include_router(cars_api)
+app.include_router(saved_searches_api)
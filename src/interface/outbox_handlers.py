@@ -0,0 +1,24 @@
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.entities import OutboxMessage
+from core.indexes import saved_search_index
+from core.services import SavedSearchService
+from infrastructure.outbox import outbox_dispatcher
+from infrastructure.repositories import CarRepository, SavedSearchRepository
+
+
+@outbox_dispatcher.register("car.created")
+@outbox_dispatcher.register("car.updated")
+async def match_saved_searches(session: AsyncSession, message: OutboxMessage):
+    """Finds buyers whose saved searches the new or changed car satisfies.
+
+    Matches are only logged for now: there is no notification channel yet
+    to deliver them through.
+    """
+    car = await CarRepository(session).get(id=UUID(message.payload["car_id"]))
+    if car is None or car.status != "active":
+        return  # машину уже удалили или сняли с продажи
+    service = SavedSearchService(SavedSearchRepository(session), saved_search_index)
+    await service.match_car(car)
@@ -0,0 +1,47 @@
+from typing import Awaitable, Callable, Literal
+
+from fastapi import Response
+
+from core.entities import ResultCount
+from settings import get_settings
+
+config = get_settings()
+
+# none - без X-Total-Count, auto - точно до count_exact_limit, дальше
+# оценка планировщика, exact - всегда полный COUNT(*)
+CountMode = Literal["none", "auto", "exact"]
+DEFAULT_COUNT_MODE: CountMode = "auto"
+
+
+def known_total(offset: int, limit: int, returned: int) -> ResultCount | None:
+    """The exact total when the page itself shows it: a short page is the last."""
+    if returned < limit and (returned or not offset):
+        return ResultCount(offset + returned)
+    return None
+
+
+def set_total_count(response: Response, count: ResultCount) -> None:
+    """Sets X-Total-Count; X-Total-Count-Exact is false for estimates."""
+    response.headers["X-Total-Count"] = str(count.value)
+    response.headers["X-Total-Count-Exact"] = "true" if count.exact else "false"
+
+
+async def report_total(
+    response: Response,
+    mode: CountMode,
+    offset: int,
+    limit: int,
+    returned: int,
+    count: Callable[[int | None], Awaitable[ResultCount]],
+) -> None:
+    """Sets the total of a listing page as `mode` asks.
+
+    `count` takes the exact limit (None for a full count) and is only
+    called when the page itself does not show the total.
+    """
+    if mode == "none":
+        return
+    total = known_total(offset, limit, returned)
+    if total is None:
+        total = await count(None if mode == "exact" else config.count_exact_limit)
+    set_total_count(response, total)
@@ -1,7 +1,11 @@
+from .admin_api import router as admin_api
 from .auth_api import router as auth_api
 from .cars_api import router as cars_api
+from .saved_searches_api import router as saved_searches_api
 
 __all__ = [
+    "admin_api",
     "auth_api",
     "cars_api",
+    "saved_searches_api",
 ]
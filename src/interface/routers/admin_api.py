@@ -0,0 +1,102 @@
+from fastapi import APIRouter, Depends, Query, Response
+
+from core.entities import CarFilter, CarPatch, User
+from core.services import CarService, UserService
+from interface.dependencies import (
+    get_car_service,
+    get_current_superuser,
+    get_user_service,
+)
+from interface.pagination import DEFAULT_COUNT_MODE, CountMode, report_total
+from interface.schemas.admin_schemas import (
+    BulkDeleteRequest,
+    BulkResult,
+    BulkUpdateRequest,
+    QueryCacheStats,
+)
+from interface.schemas.auth_schemas import UserResponse
+from utils.query_cache import catalog_cache
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.post("/cars/bulk-update", response_model=BulkResult)
+async def bulk_update_cars(
+    data: BulkUpdateRequest,
+    user: User = Depends(get_current_superuser),
+    car_service: CarService = Depends(get_car_service),
+):
+    """
+    Apply a price or condition change to every car matching the filter.
+    """
+    ids = await car_service.bulk_update(
+        CarFilter(**data.filter.model_dump()), CarPatch(**data.patch.model_dump())
+    )
+    return BulkResult(affected=len(ids), ids=ids)
+
+
+@router.post("/cars/bulk-delete", response_model=BulkResult)
+async def bulk_delete_cars(
+    data: BulkDeleteRequest,
+    user: User = Depends(get_current_superuser),
+    car_service: CarService = Depends(get_car_service),
+):
+    """
+    Delete every car matching the filter, e.g. all sold listings.
+    """
+    ids = await car_service.bulk_delete(CarFilter(**data.filter.model_dump()))
+    return BulkResult(affected=len(ids), ids=ids)
+
+
+@router.get("/users", response_model=list[UserResponse])
+async def list_users(
+    response: Response,
+    is_active: bool | None = None,
+    is_superuser: bool | None = None,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    count: CountMode = DEFAULT_COUNT_MODE,
+    user: User = Depends(get_current_superuser),
+    user_service: UserService = Depends(get_user_service),
+):
+    """
+    List users, oldest first. X-Total-Count carries the total: exact up to
+    a limit with count=auto, past it a planner estimate; count=exact always
+    runs a full COUNT(*).
+    """
+    filters = {
+        name: value
+        for name, value in (("is_active", is_active), ("is_superuser", is_superuser))
+        if value is not None
+    }
+    users = await user_service.get_users(offset, limit, **filters)
+    await report_total(
+        response,
+        count,
+        offset,
+        limit,
+        len(users),
+        lambda exact_limit: user_service.count_users(exact_limit, **filters),
+    )
+    return users
+
+
+@router.get("/cache", response_model=QueryCacheStats)
+async def get_query_cache_stats(user: User = Depends(get_current_superuser)):
+    """
+    Query cache counters of the worker that serves the request.
+    """
+    stats = catalog_cache.stats
+    return QueryCacheStats(
+        generation=catalog_cache.generation,
+        entries=len(catalog_cache),
+        rows=catalog_cache.rows,
+        max_rows=catalog_cache.max_rows,
+        ttl_seconds=catalog_cache.ttl,
+        hits=stats.hits,
+        misses=stats.misses,
+        stale=stats.stale,
+        expired=stats.expired,
+        evictions=stats.evictions,
+        hit_rate=stats.hit_rate,
+    )
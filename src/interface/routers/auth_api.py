@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.entities import User
+from core.entities import Token, User
 from interface.dependencies import get_auth_service
 from core.services.auth_service import AuthService
 from interface.schemas import UserCreate, UserResponse, TokenResponse
@@ -14,6 +14,7 @@ from core.exceptions import (
     InvalidTokenError,
 )
 from settings import get_settings
+from utils.rate_limiter import RateLimit, RateLimiter
 
 config = get_settings()
 
@@ -21,13 +22,27 @@ config = get_settings()
 router = APIRouter(prefix="/auth", tags=["auth"])
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")  # for swagger
 
+# bcrypt на каждый вызов - ограничиваем и по IP, и по логину
+token_ip_limiter = RateLimiter(
+    "auth_token_ip", RateLimit.parse(config.auth_token_rate_limit_ip)
+)
+token_username_limiter = RateLimiter(
+    "auth_token_username", RateLimit.parse(config.auth_token_rate_limit_username)
+)
+register_ip_limiter = RateLimiter(
+    "auth_register_ip", RateLimit.parse(config.auth_register_rate_limit_ip)
+)
+
 
 @router.post(
     "/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED
 )
 async def register_user(
-    user_create: UserCreate, auth_service: AuthService = Depends(get_auth_service)
+    user_create: UserCreate,
+    request: Request,
+    auth_service: AuthService = Depends(get_auth_service),
 ):
+    await register_ip_limiter.check(request.client.host if request.client else None)
     try:
         created_user = await auth_service.register(
             user_create.email, user_create.password
@@ -42,44 +57,39 @@ async def register_user(
 @router.post("/token", response_model=TokenResponse)  #  Используем /token
 async def login_for_access_token(
     response: Response,
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     auth_service: AuthService = Depends(get_auth_service),
 ):
     """Logs in a user and returns access and refresh tokens (ROPCG)."""
+    await token_ip_limiter.check(request.client.host if request.client else None)
+    await token_username_limiter.check(form_data.username.lower())
     try:
         token = await auth_service.login(
             form_data.username, form_data.password, form_data.scopes
         )
         print(token.access_token_expires)
-        response.set_cookie(
-            key="access_token",
-            value=token.access_token,
-            httponly=True,
-            secure=True if not config.is_debug_mode else False,
-            samesite="lax",
-            expires=token.access_token_expires,
-        )
-        response.set_cookie(
-            key="refresh_token",
-            value=token.refresh_token,
-            httponly=True,
-            secure=True if not config.is_debug_mode else False,
-            samesite="lax",
-            expires=token.refresh_token_expires,
-        )
-
-        return TokenResponse(
-            token_type=token.token_type,
-            scopes=token.scopes,
-            access_token_expires=token.access_token_expires,
-            refresh_token_expires=token.refresh_token_expires,
-        )
+        return _set_token_cookies(response, token)
     except (NotFoundError, InvalidCredentials) as e:
         raise HTTPException(status_code=401, detail="Incorrect email or password")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/refresh", response_model=TokenResponse)
+async def refresh_tokens(
+    response: Response,
+    request: Request,
+    auth_service: AuthService = Depends(get_auth_service),
+):
+    """Rotates the refresh token from the cookie and issues a new token pair."""
+    refresh_token = request.cookies.get("refresh_token")
+    if not refresh_token:
+        raise InvalidTokenError("Refresh token is missing")
+    token = await auth_service.refresh(refresh_token)
+    return _set_token_cookies(response, token)
+
+
 @router.post("/logout")
 async def logout(
     response: Response,
@@ -92,3 +102,29 @@ async def logout(
     response.delete_cookie("access_token")
     response.delete_cookie("refresh_token")
     return {"message": "Successfully logged out"}
+
+
+def _set_token_cookies(response: Response, token: Token) -> TokenResponse:
+    response.set_cookie(
+        key="access_token",
+        value=token.access_token,
+        httponly=True,
+        secure=True if not config.is_debug_mode else False,
+        samesite="lax",
+        expires=token.access_token_expires,
+    )
+    response.set_cookie(
+        key="refresh_token",
+        value=token.refresh_token,
+        httponly=True,
+        secure=True if not config.is_debug_mode else False,
+        samesite="lax",
+        expires=token.refresh_token_expires,
+    )
+
+    return TokenResponse(
+        token_type=token.token_type,
+        scopes=token.scopes,
+        access_token_expires=token.access_token_expires,
+        refresh_token_expires=token.refresh_token_expires,
+    )
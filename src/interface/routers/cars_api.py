@@ -1,10 +1,51 @@
+import asyncio
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Request
+
+import orjson
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 
 from core.services.auth_service import AuthService
-from interface.schemas.cars_schemas import CarCreate
-from interface.dependencies import get_auth_service, get_car_service
-from core.services.car_service import CarService
+from interface.schemas.cars_schemas import (
+    CarBase,
+    CarCreate,
+    CarResponse,
+    CarSearchResult,
+    CarStatResponse,
+    ImageCompleteRequest,
+    ImageResponse,
+    ImageUploadRequest,
+    ImageUploadResponse,
+    PriceChangeResponse,
+    SimilarCarResponse,
+    SuggestionResponse,
+    ValuationResponse,
+    VinCheckRequest,
+    VinCheckResult,
+)
+from interface.pagination import DEFAULT_COUNT_MODE, CountMode, report_total
+from interface.dependencies import (
+    get_auth_service,
+    get_car_service,
+    get_current_user,
+    get_image_upload_service,
+    get_streaming_user,
+    get_valuation_service,
+)
+from core.entities import Car, CarEvent, CarFilter, User
+from core.indexes import SUGGEST_KINDS, suggest_index
+from core.services.car_service import CarService, car_etag
+from core.services.image_service import ImageUploadService
+from core.services.valuation_service import (
+    ALL_MILEAGES,
+    MILEAGE_BAND,
+    ValuationService,
+)
+from infrastructure.car_events import CarEventFilter, Subscription, car_events
+from infrastructure.storage import get_image_urls
+from settings import get_settings
+
+config = get_settings()
 
 router = APIRouter(prefix="/cars", tags=["cars"])
 
@@ -23,21 +64,47 @@ async def create_car(
     if not access_token or not await auth_service.verify_access_token(access_token):
         raise HTTPException(status_code=401, detail="Unauthorized")
     try:
-        car = await car_service.create_car(data)
+        car = await car_service.create_car(data, images=data.images)
         return {"car": car}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/vin-check", response_model=list[VinCheckResult])
+async def check_vins(
+    data: VinCheckRequest,
+    user: User = Depends(get_current_user),
+    car_service: CarService = Depends(get_car_service),
+):
+    """
+    Decode VINs offline and report which of them are already listed.
+    Lets importers dedupe a feed with a single request.
+    """
+    results = await car_service.check_vins(data.vins)
+    return [
+        VinCheckResult(
+            vin=info.vin,
+            valid=info.valid,
+            exists=car_id is not None,
+            car_id=car_id,
+            make=info.make,
+            model_year=info.model_year,
+            check_digit_valid=info.check_digit_valid,
+        )
+        for info, car_id in results
+    ]
+
+
 @router.get("/get")
 async def get_car(
     car_id: UUID,
     request: Request,
+    response: Response,
     car_service: CarService = Depends(get_car_service),
     auth_service: AuthService = Depends(get_auth_service),
 ):
     """
-    Get a car by ID.
+    Get a car by ID. The ETag header carries its version for If-Match.
     """
     access_token = request.cookies.get("access_token")
     if not access_token or not await auth_service.verify_access_token(access_token):
@@ -46,6 +113,373 @@ async def get_car(
         car = await car_service.get_car_by_id(car_id)
         if not car:
             raise HTTPException(status_code=404, detail="Car not found")
-        return {"car": car}
+        response.headers["ETag"] = car_etag(car.version)
+        return {"car": _car_responses([car])[0]}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.put("/{car_id}")
+async def update_car(
+    car_id: UUID,
+    data: CarBase,
+    response: Response,
+    if_match: str | None = Header(None),
+    user: User = Depends(get_current_user),
+    car_service: CarService = Depends(get_car_service),
+):
+    """
+    Replace a car. Requires If-Match with the ETag from the last read; if the
+    car has changed since, nothing is written and 412 returns the new ETag.
+    """
+    if if_match is None:
+        raise HTTPException(status_code=428, detail="If-Match header is required")
+    car = await car_service.update_car(car_id, data, _parse_if_match(if_match))
+    if car is None:
+        raise HTTPException(status_code=404, detail="Car not found")
+    response.headers["ETag"] = car_etag(car.version)
+    return {"car": _car_responses([car])[0]}
+
+
+def _parse_if_match(value: str) -> int | None:
+    """Version from If-Match; None for "*", which matches any version."""
+    value = value.strip()
+    if value == "*":
+        return None
+    version = value.removeprefix("W/").strip('"')
+    if not version.isdigit():
+        raise HTTPException(status_code=400, detail="Invalid If-Match header")
+    return int(version)
+
+
+STATS_DIMENSIONS = ("make", "body_style", "year")
+
+
+@router.get("/stats", response_model=dict[str, list[CarStatResponse]])
+async def get_stats(
+    request: Request,
+    dimension: list[str] | None = Query(
+        None, description="Any of: make, body_style, year. All by default"
+    ),
+    car_service: CarService = Depends(get_car_service),
+    auth_service: AuthService = Depends(get_auth_service),
+):
+    """
+    Get count and average/min/max price by make, body style and year.
+    The aggregates trail car writes by up to CAR_STATS_FOLD_SECONDS.
+    """
+    access_token = request.cookies.get("access_token")
+    if not access_token or not await auth_service.verify_access_token(access_token):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    if dimension and not set(dimension) <= set(STATS_DIMENSIONS):
+        raise HTTPException(status_code=400, detail="Unknown stats dimension")
+    return await car_service.get_stats(dimension or None)
+
+
+@router.get("/valuation", response_model=ValuationResponse)
+async def get_valuation(
+    make: str,
+    model: str,
+    year: int,
+    request: Request,
+    mileage: int | None = Query(None, ge=0),
+    valuation_service: ValuationService = Depends(get_valuation_service),
+    auth_service: AuthService = Depends(get_auth_service),
+):
+    """
+    Get market price percentiles for a make/model/year and mileage band.
+    """
+    access_token = request.cookies.get("access_token")
+    if not access_token or not await auth_service.verify_access_token(access_token):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    valuation = await valuation_service.get_valuation(make, model, year, mileage)
+    if valuation is None:
+        raise HTTPException(status_code=404, detail="No listings for this segment")
+    banded = valuation.mileage_band != ALL_MILEAGES
+    return ValuationResponse(
+        make=valuation.make,
+        model=valuation.model,
+        year=valuation.year,
+        mileage_from=valuation.mileage_band * MILEAGE_BAND if banded else None,
+        mileage_to=(valuation.mileage_band + 1) * MILEAGE_BAND if banded else None,
+        listings=valuation.listings,
+        p10=valuation.p10,
+        p25=valuation.p25,
+        median=valuation.median,
+        p75=valuation.p75,
+        p90=valuation.p90,
+        refreshed_at=valuation.refreshed_at,
+    )
+
+
+@router.get("/suggest", response_model=list[SuggestionResponse])
+async def suggest(
+    q: str = Query(..., min_length=1, max_length=100),
+    kind: list[str] | None = Query(
+        None, description="Any of: make, model, feature. All by default"
+    ),
+    limit: int = Query(10, ge=1, le=50),
+):
+    """
+    Typeahead over makes, models and features, most popular first.
+    Served from the in-memory index of this worker, without database access.
+    """
+    if kind and not set(kind) <= set(SUGGEST_KINDS):
+        raise HTTPException(status_code=400, detail="Unknown suggestion kind")
+    return [
+        {"kind": term_kind, "value": value, "count": count}
+        for term_kind, value, count in suggest_index.suggest(q, limit, kind or None)
+    ]
+
+
+@router.get("/search", response_model=list[CarSearchResult])
+async def search_cars(
+    request: Request,
+    response: Response,
+    make: str | None = None,
+    model: str | None = None,
+    body_style: str | None = None,
+    fuel_type: str | None = None,
+    condition: str | None = None,
+    min_year: int | None = None,
+    max_year: int | None = None,
+    min_price: float | None = Query(None, ge=0),
+    max_price: float | None = Query(None, ge=0),
+    near: str | None = Query(None, description="Point as 'lat,lon'"),
+    radius_km: float | None = Query(None, gt=0, le=1000),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    count: CountMode = DEFAULT_COUNT_MODE,
+    car_service: CarService = Depends(get_car_service),
+    auth_service: AuthService = Depends(get_auth_service),
+):
+    """
+    Search cars by attributes and, optionally, within radius_km of a point.
+    With `near` the results are ordered by distance, nearest first.
+    X-Total-Count carries the number of matches: exact up to a limit with
+    count=auto, past it a planner estimate (X-Total-Count-Exact is false);
+    count=exact always runs a full COUNT(*).
+    """
+    access_token = request.cookies.get("access_token")
+    if not access_token or not await auth_service.verify_access_token(access_token):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    point = None
+    if near is not None:
+        point = _parse_point(near)
+        if radius_km is None:
+            raise HTTPException(status_code=400, detail="radius_km is required")
+    car_filter = CarFilter(
+        make=make,
+        model=model,
+        body_style=body_style,
+        fuel_type=fuel_type,
+        condition=condition,
+        min_year=min_year,
+        max_year=max_year,
+        min_price=min_price,
+        max_price=max_price,
+    )
+    results = await car_service.search_cars(
+        car_filter, near=point, radius_km=radius_km, offset=offset, limit=limit
+    )
+    await report_total(
+        response,
+        count,
+        offset,
+        limit,
+        len(results),
+        lambda exact_limit: car_service.count_cars(
+            car_filter, near=point, radius_km=radius_km, exact_limit=exact_limit
+        ),
+    )
+    cars = _car_responses([car for car, _ in results])
+    return [
+        {"car": car, "distance_km": distance}
+        for car, (_, distance) in zip(cars, results)
+    ]
+
+
+def _parse_point(value: str) -> tuple[float, float]:
+    try:
+        lat, lon = (float(part) for part in value.split(","))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="near must be 'lat,lon'")
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise HTTPException(status_code=400, detail="near is out of range")
+    return lat, lon
+
+
+@router.get("/{car_id}/price-history", response_model=list[PriceChangeResponse])
+async def get_price_history(
+    car_id: UUID,
+    request: Request,
+    limit: int = Query(100, ge=1, le=1000),
+    car_service: CarService = Depends(get_car_service),
+    auth_service: AuthService = Depends(get_auth_service),
+):
+    """
+    Get price changes of a car, newest first.
+    """
+    access_token = request.cookies.get("access_token")
+    if not access_token or not await auth_service.verify_access_token(access_token):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    return await car_service.get_price_history(car_id, limit=limit)
+
+
+@router.get("/{car_id}/similar", response_model=list[SimilarCarResponse])
+async def get_similar_cars(
+    car_id: UUID,
+    request: Request,
+    limit: int = Query(10, ge=1, le=100),
+    car_service: CarService = Depends(get_car_service),
+    auth_service: AuthService = Depends(get_auth_service),
+):
+    """
+    Get the cars most similar to the given one, nearest first.
+    """
+    access_token = request.cookies.get("access_token")
+    if not access_token or not await auth_service.verify_access_token(access_token):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    similar = await car_service.get_similar_cars(car_id, limit=limit)
+    if similar is None:
+        raise HTTPException(status_code=404, detail="Car not found")
+    cars = _car_responses([car for car, _ in similar])
+    return [
+        {"car": car, "distance": distance} for car, (_, distance) in zip(cars, similar)
+    ]
+
+
+@router.post("/{car_id}/images/upload-url", response_model=ImageUploadResponse)
+async def create_image_upload(
+    car_id: UUID,
+    data: ImageUploadRequest,
+    user: User = Depends(get_current_user),
+    image_service: ImageUploadService = Depends(get_image_upload_service),
+):
+    """
+    Get a presigned form for uploading one image straight to the storage.
+    The storage enforces the content type, size and SHA-256 of the file.
+    Content that is already stored needs no upload: "uploaded" is true.
+    """
+    blob, form = await image_service.create_upload(
+        car_id, data.content_type, data.size, data.sha256
+    )
+    if form is None:
+        return ImageUploadResponse(sha256=blob.sha256, uploaded=True)
+    return ImageUploadResponse(
+        sha256=blob.sha256,
+        uploaded=False,
+        url=form.url,
+        fields=form.fields,
+        expires_at=form.expires_at,
+    )
+
+
+@router.post("/{car_id}/images/complete", response_model=ImageResponse)
+async def complete_image_upload(
+    car_id: UUID,
+    data: ImageCompleteRequest,
+    user: User = Depends(get_current_user),
+    image_service: ImageUploadService = Depends(get_image_upload_service),
+):
+    """
+    Attach an uploaded image to the car once the object is in the storage.
+    """
+    image = await image_service.complete_upload(
+        car_id, data.sha256, description=data.description, is_main=data.is_main
+    )
+    response = ImageResponse.model_validate(image)
+    response.url = get_image_urls().resolve([response.url])[response.url]
+    return response
+
+
+def _car_responses(cars: list[Car]) -> list[CarResponse]:
+    """Builds car responses with loadable image URLs, presigned in one batch.
+
+    Entities may be shared through the query cache, so URLs are replaced
+    on the response copies only.
+    """
+    responses = [CarResponse.model_validate(car) for car in cars]
+    images = [image for response in responses for image in response.images]
+    urls = get_image_urls().resolve(image.url for image in images)
+    for image in images:
+        image.url = urls[image.url]
+    return responses
+
+
+SSE_EVENT_NAMES = {"insert": "created", "update": "updated", "delete": "deleted"}
+
+
+@router.get("/stream")
+async def stream_car_events(
+    request: Request,
+    make: str | None = None,
+    model: str | None = None,
+    min_price: float | None = None,
+    max_price: float | None = None,
+    events: str | None = Query(
+        None, description="Comma separated subset of: created, updated, deleted"
+    ),
+    user: User = Depends(get_streaming_user),
+):
+    """
+    Server-Sent Events feed of catalog changes.
+    """
+    ops = None
+    if events:
+        names = {name.strip() for name in events.split(",")}
+        unknown = names - set(SSE_EVENT_NAMES.values())
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=(
+                    f"Unknown events: {', '.join(sorted(unknown))}; "
+                    f"valid: {', '.join(SSE_EVENT_NAMES.values())}"
+                ),
+            )
+        ops = frozenset(op for op, name in SSE_EVENT_NAMES.items() if name in names)
+    subscription = car_events.subscribe(
+        CarEventFilter(
+            ops=ops,
+            make=make.casefold() if make else None,
+            model=model.casefold() if model else None,
+            min_price=min_price,
+            max_price=max_price,
+        )
+    )
+    return StreamingResponse(
+        _sse_stream(request, subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _sse_stream(request: Request, subscription: Subscription):
+    try:
+        while True:
+            try:
+                event = await subscription.get(config.car_events_heartbeat_seconds)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield b": ping\n\n"
+                continue
+            if event is None:  # клиент не успевал читать и был отключен
+                yield b"event: dropped\ndata: {}\n\n"
+                break
+            yield _format_sse(event)
+    finally:
+        car_events.unsubscribe(subscription)
+
+
+def _format_sse(event: CarEvent) -> bytes:
+    name = SSE_EVENT_NAMES.get(event.op, event.op)
+    data = orjson.dumps(
+        {
+            "id": event.car_id,
+            "car": event.car,
+            "old": event.old,
+            "truncated": event.truncated,
+        }
+    )
+    return b"event: " + name.encode() + b"\ndata: " + data + b"\n\n"
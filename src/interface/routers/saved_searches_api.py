@@ -0,0 +1,53 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from core.entities import SavedSearch, User
+from core.services import SavedSearchService
+from interface.dependencies import get_current_user, get_saved_search_service
+from interface.schemas.saved_search_schemas import (
+    SavedSearchCreate,
+    SavedSearchResponse,
+)
+
+router = APIRouter(prefix="/saved-searches", tags=["saved searches"])
+
+
+@router.post(
+    "", response_model=SavedSearchResponse, status_code=status.HTTP_201_CREATED
+)
+async def create_saved_search(
+    data: SavedSearchCreate,
+    user: User = Depends(get_current_user),
+    service: SavedSearchService = Depends(get_saved_search_service),
+):
+    """
+    Save a search to be alerted about matching cars.
+    """
+    return await service.create(SavedSearch(user_id=user.id, **data.model_dump()))
+
+
+@router.get("", response_model=list[SavedSearchResponse])
+async def get_saved_searches(
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    user: User = Depends(get_current_user),
+    service: SavedSearchService = Depends(get_saved_search_service),
+):
+    """
+    List saved searches of the current user.
+    """
+    return await service.get_user_searches(user.id, offset=offset, limit=limit)
+
+
+@router.delete("/{search_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_saved_search(
+    search_id: UUID,
+    user: User = Depends(get_current_user),
+    service: SavedSearchService = Depends(get_saved_search_service),
+):
+    """
+    Delete a saved search of the current user.
+    """
+    if not await service.delete(search_id, user.id):
+        raise HTTPException(status_code=404, detail="Saved search not found")
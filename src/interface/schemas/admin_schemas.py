@@ -0,0 +1,69 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, UUID4, model_validator
+
+
+class CarFilterSchema(BaseModel):
+    ids: Optional[List[UUID4]] = None
+    make: Optional[str] = None
+    model: Optional[str] = None
+    body_style: Optional[str] = None
+    fuel_type: Optional[str] = None
+    condition: Optional[str] = None
+    min_year: Optional[int] = None
+    max_year: Optional[int] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+
+    @model_validator(mode="after")
+    def check_not_empty(self):
+        # Пустой фильтр задел бы весь каталог
+        if all(value is None for value in self.model_dump().values()):
+            raise ValueError("At least one filter condition is required")
+        return self
+
+
+class CarPatchSchema(BaseModel):
+    set_price: Optional[float] = Field(None, gt=0)
+    price_delta: Optional[float] = None
+    price_percent: Optional[float] = Field(None, gt=-100)
+    condition: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_patch(self):
+        prices = [self.set_price, self.price_delta, self.price_percent]
+        if sum(value is not None for value in prices) > 1:
+            raise ValueError(
+                "Only one of set_price, price_delta, price_percent may be given"
+            )
+        if all(value is None for value in prices) and self.condition is None:
+            raise ValueError("The patch changes nothing")
+        return self
+
+
+class BulkUpdateRequest(BaseModel):
+    filter: CarFilterSchema
+    patch: CarPatchSchema
+
+
+class BulkDeleteRequest(BaseModel):
+    filter: CarFilterSchema
+
+
+class BulkResult(BaseModel):
+    affected: int
+    ids: List[UUID4]
+
+
+class QueryCacheStats(BaseModel):
+    generation: int
+    entries: int
+    rows: int
+    max_rows: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    stale: int
+    expired: int
+    evictions: int
+    hit_rate: float
@@ -1,5 +1,13 @@
-from pydantic import BaseModel, HttpUrl, UUID4, validator
-from typing import List, Optional
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    HttpUrl,
+    UUID4,
+    model_validator,
+    validator,
+)
+from typing import List, Literal, Optional
 from datetime import datetime
 
 
@@ -29,11 +37,31 @@ class ImageResponse(ImageBase):
         from_attributes = True
 
 
+class ImageUploadRequest(BaseModel):
+    content_type: Literal["image/jpeg", "image/png", "image/webp"]
+    size: int = Field(..., gt=0)  # байт
+    sha256: str = Field(..., pattern="^[0-9a-f]{64}$")  # hex содержимого файла
+
+
+class ImageUploadResponse(BaseModel):
+    sha256: str
+    uploaded: bool  # такое содержимое уже есть - загружать не нужно
+    url: Optional[str] = None  # куда отправить multipart/form-data POST
+    fields: dict[str, str] = {}  # поля формы, файл передается последним полем "file"
+    expires_at: Optional[datetime] = None
+
+
+class ImageCompleteRequest(BaseModel):
+    sha256: str = Field(..., pattern="^[0-9a-f]{64}$")
+    description: Optional[str] = None
+    is_main: bool = False
+
+
 class CarBase(BaseModel):
     make: str
     model: str
     year: int
-    price: float
+    price: float = Field(..., gt=0)  # как и CHECK в таблице
     mileage: int
     fuel_type: str
     engine_capacity: float
@@ -44,10 +72,19 @@ class CarBase(BaseModel):
     condition: str = "Used"
     vin: Optional[str] = None
     features: List[str] = []
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
+    status: Literal["active", "sold", "expired"] = "active"
+
+    @model_validator(mode="after")
+    def check_location(self):
+        if (self.latitude is None) != (self.longitude is None):
+            raise ValueError("latitude and longitude must be given together")
+        return self
 
 
 class CarCreate(CarBase):
-    pass  # Features are optional
+    images: List[ImageBase] = []  # создаются в той же транзакции, что и машина
 
 
 class CarUpdate(CarBase):
@@ -72,6 +109,74 @@ class CarResponse(CarBase):
     images: List[ImageResponse] = []  # Include images in the response
     created_at: datetime
     updated_at: datetime
+    version: int
+
+    class Config:
+        from_attributes = True
+
+
+class PriceChangeResponse(BaseModel):
+    old_price: Optional[float] = None
+    new_price: float
+    changed_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class SimilarCarResponse(BaseModel):
+    car: CarResponse
+    distance: float
+
+
+class ValuationResponse(BaseModel):
+    make: str
+    model: str
+    year: int
+    mileage_from: Optional[int] = None  # None - оценка по всем пробегам года
+    mileage_to: Optional[int] = None
+    listings: int
+    p10: float
+    p25: float
+    median: float
+    p75: float
+    p90: float
+    refreshed_at: datetime
+
+
+class CarStatResponse(BaseModel):
+    value: str
+    count: int
+    avg_price: float
+    min_price: float
+    max_price: float
 
     class Config:
         from_attributes = True
+
+
+class CarSearchResult(BaseModel):
+    car: CarResponse
+    distance_km: Optional[float] = None
+
+
+class SuggestionResponse(BaseModel):
+    kind: str  # make, model или feature
+    value: str
+    count: int
+
+
+class VinCheckRequest(BaseModel):
+    vins: List[str] = Field(..., min_length=1, max_length=10_000)
+
+
+class VinCheckResult(BaseModel):
+    model_config = ConfigDict(protected_namespaces=())  # поле model_year
+
+    vin: str
+    valid: bool
+    exists: bool
+    car_id: Optional[UUID4] = None
+    make: Optional[str] = None
+    model_year: Optional[int] = None
+    check_digit_valid: Optional[bool] = None
@@ -0,0 +1,35 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, UUID4, model_validator
+
+
+class SavedSearchBase(BaseModel):
+    name: str
+    make: Optional[str] = None
+    model: Optional[str] = None
+    fuel_type: Optional[str] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    min_year: Optional[int] = None
+    max_year: Optional[int] = None
+    min_mileage: Optional[int] = None
+    max_mileage: Optional[int] = None
+
+
+class SavedSearchCreate(SavedSearchBase):
+    @model_validator(mode="after")
+    def check_ranges(self):
+        for name in ("price", "year", "mileage"):
+            low, high = getattr(self, f"min_{name}"), getattr(self, f"max_{name}")
+            if low is not None and high is not None and low > high:
+                raise ValueError(f"min_{name} must not be greater than max_{name}")
+        return self
+
+
+class SavedSearchResponse(SavedSearchBase):
+    id: UUID4
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,74 @@
+import asyncio
+import time
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.indexes import saved_search_index
+from core.services import SavedSearchService
+from core.services.auth_service import get_password_context
+from infrastructure.postgres_db import database
+from interface.index_sync import similarity_sync, suggest_sync
+from infrastructure.repositories import (
+    CarRepository,
+    SavedSearchRepository,
+    TokenRepository,
+    UserRepository,
+)
+from settings import get_settings
+from utils.logger import get_logger
+
+config = get_settings()
+logger = get_logger()
+
+
+async def _prime_statements(session: AsyncSession):
+    """Runs the hot repository queries once so they are compiled and prepared."""
+    await UserRepository(session).get(email="")
+    await TokenRepository(session).is_banned("")
+    await CarRepository(session).get(id=uuid4())
+
+
+async def _load_indexes():
+    async with database.session_factory() as session:
+        service = SavedSearchService(SavedSearchRepository(session), saved_search_index)
+        count = await service.load_index()
+    logger.info("Loaded %d saved searches into the index", count)
+    await asyncio.gather(similarity_sync.reload(), suggest_sync.reload())
+
+
+async def load_indexes():
+    """Fills the in-memory indexes before the worker reports readiness.
+
+    Unlike the warm-up this is required: a worker with empty indexes would
+    answer similar-car and suggestion requests with nothing. Failures are
+    retried with backoff, and the last one fails the startup.
+    """
+    for attempt in range(1, config.index_load_attempts + 1):
+        try:
+            await _load_indexes()
+            return
+        except Exception:
+            if attempt == config.index_load_attempts:
+                raise
+            delay = min(2 ** (attempt - 1), 30)
+            logger.exception(
+                "Loading indexes failed (attempt %d), retrying in %d s", attempt, delay
+            )
+            await asyncio.sleep(delay)
+
+
+async def warm_up():
+    """
+    Прогрев воркера до того, как он начнет принимать запросы
+    """
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(
+            database.warm_up(config.warmup_connections, _prime_statements),
+            asyncio.to_thread(get_password_context),
+        )
+    except Exception:
+        logger.exception("Warm-up failed, continuing with a cold worker")
+        return
+    logger.info("Warm-up finished in %.1f ms", (time.perf_counter() - started) * 1000)
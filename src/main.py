@@ -1,13 +1,34 @@
 import logging
 import uvicorn
 
+from settings import get_settings
+
+config = get_settings()
 
 
 if __name__ == '__main__':
-    uvicorn.run(
-        "interface.main:app",
-        host="0.0.0.0",
-        port=8000,
-        log_level=logging.DEBUG,
-        reload=True,
-    )
\ No newline at end of file
+    if config.is_debug_mode:
+        uvicorn.run(
+            "interface.main:app",
+            host=config.server_host,
+            port=config.server_port,
+            log_level=logging.DEBUG,
+            reload=True,
+        )
+    else:
+        # Каждый воркер - отдельный процесс со своим event loop и пулом БД,
+        # SIGTERM дает in-flight запросам до server_graceful_timeout секунд
+        uvicorn.run(
+            "interface.main:app",
+            host=config.server_host,
+            port=config.server_port,
+            workers=config.server_workers,
+            # uvloop, где он установлен (его нет под Windows), иначе asyncio
+            loop="auto",
+            http="httptools",
+            backlog=config.server_backlog,
+            timeout_keep_alive=config.server_keepalive,
+            timeout_graceful_shutdown=config.server_graceful_timeout,
+            proxy_headers=True,
+            log_level=logging.INFO,
+        )
@@ -4,3 +4,14 @@ from infrastructure.models import Profile
 from infrastructure.models import BannedRefreshToken
 from infrastructure.models import CarModel
 from infrastructure.models import ImageModel
+from infrastructure.models import RateLimitBucket
+from infrastructure.models import CarPriceHistoryModel
+from infrastructure.models import SavedSearchModel
+from infrastructure.models import CarStatsModel
+from infrastructure.models import OutboxModel
+from infrastructure.models import JobRun
+from infrastructure.models import CarArchiveModel
+from infrastructure.models import ImageArchiveModel
+from infrastructure.models import ImageBlobModel
+from infrastructure.models import CarStatsDeltaModel
+from infrastructure.models import MatviewRefresh
@@ -0,0 +1,32 @@
+"""Check car price positive
+
+Revision ID: 7c2e9a4b1d56
+Revises: 6b8d4f2a0c13
+Create Date: 2026-10-19 21:40:27.194053
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e9a4b1d56'
+down_revision: Union[str, None] = '6b8d4f2a0c13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # NOT VALID не сканирует таблицу под блокировкой записи, проверка
+    # существующих строк идет отдельно и запись не останавливает
+    op.execute(
+        "ALTER TABLE cars ADD CONSTRAINT ck_cars_price_positive "
+        "CHECK (price > 0) NOT VALID"
+    )
+    op.execute("ALTER TABLE cars VALIDATE CONSTRAINT ck_cars_price_positive")
+
+
+def downgrade() -> None:
+    op.drop_constraint('ck_cars_price_positive', 'cars', type_='check')
@@ -0,0 +1,64 @@
+"""Normalize car VINs
+
+Revision ID: b5d1e9a3c7f2
+Revises: a2f6c8e1d4b9
+Create Date: 2026-10-19 23:02:51.637480
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d1e9a3c7f2'
+down_revision: Union[str, None] = 'a2f6c8e1d4b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+# Строки, совпадающие после нормализации, делят один VIN, а cars.vin уникален.
+# Его получает строка, уже записанная в нормальной форме, затем активная,
+# затем обновленная последней; остальные сохраняют исходное значение
+RANKED_VINS = """
+    SELECT id, vin, upper(btrim(vin)) AS normalized,
+        row_number() OVER (
+            PARTITION BY upper(btrim(vin))
+            ORDER BY vin = upper(btrim(vin)) DESC,
+                status = 'active' DESC,
+                updated_at DESC
+        ) AS rank
+    FROM cars
+"""
+
+
+def upgrade() -> None:
+    op.execute(f"""
+        UPDATE cars SET vin = ranked.normalized
+        FROM ({RANKED_VINS}) AS ranked
+        WHERE cars.id = ranked.id
+            AND ranked.rank = 1
+            AND cars.vin <> ranked.normalized
+    """)
+    collisions = op.get_bind().execute(sa.text(f"""
+        SELECT id, vin, normalized FROM ({RANKED_VINS}) AS ranked
+        WHERE rank > 1
+        ORDER BY normalized
+    """))
+    for car_id, vin, normalized in collisions:
+        logger.warning(
+            "Car %s keeps VIN %r: %s already belongs to another car",
+            car_id, vin, normalized,
+        )
+    op.execute("""
+        UPDATE cars_archive SET vin = upper(btrim(vin))
+        WHERE vin <> upper(btrim(vin))
+    """)
+
+
+def downgrade() -> None:
+    # Исходное написание не сохраняется, откатывать нечего
+    pass
@@ -0,0 +1,58 @@
+"""Add car events notify trigger
+
+Revision ID: c3f8a61b2d90
+Revises: b71e04d9c5a2
+Create Date: 2026-10-19 13:25:48.117036
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f8a61b2d90'
+down_revision: Union[str, None] = 'b71e04d9c5a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # NOTIFY доставляется только после COMMIT; payload ограничен 8000 байт,
+    # поэтому длинные строки отправляются без данных машины (truncated)
+    op.execute("""
+        CREATE FUNCTION notify_car_change() RETURNS trigger AS $$
+        DECLARE
+            car_id uuid := CASE WHEN TG_OP = 'DELETE' THEN OLD.id ELSE NEW.id END;
+            payload text;
+        BEGIN
+            payload := jsonb_build_object(
+                'op', lower(TG_OP),
+                'id', car_id,
+                'car', CASE WHEN TG_OP = 'DELETE'
+                    THEN to_jsonb(OLD) - 'description'
+                    ELSE to_jsonb(NEW) - 'description' END,
+                'old', CASE WHEN TG_OP = 'UPDATE'
+                    THEN to_jsonb(OLD) - 'description' END
+            )::text;
+            IF octet_length(payload) > 7900 THEN
+                payload := jsonb_build_object(
+                    'op', lower(TG_OP), 'id', car_id, 'truncated', true
+                )::text;
+            END IF;
+            PERFORM pg_notify('car_events', payload);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER cars_notify_change
+        AFTER INSERT OR UPDATE OR DELETE ON cars
+        FOR EACH ROW EXECUTE FUNCTION notify_car_change()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER cars_notify_change ON cars")
+    op.execute("DROP FUNCTION notify_car_change()")
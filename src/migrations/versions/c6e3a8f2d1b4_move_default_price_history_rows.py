@@ -0,0 +1,82 @@
+"""Move rows out of the default price history partition
+
+Revision ID: c6e3a8f2d1b4
+Revises: b5d1e9a3c7f2
+Create Date: 2026-10-20 10:14:37.215904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6e3a8f2d1b4'
+down_revision: Union[str, None] = 'b5d1e9a3c7f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE TABLE ... PARTITION OF падает, если в DEFAULT уже есть строки
+    # нового месяца (например, планировщик не работал). Секция создается
+    # отдельной таблицей, строки переносятся в нее из DEFAULT, затем она
+    # подключается. Блокировка DEFAULT не дает вставкам попасть туда между
+    # переносом и ATTACH
+    op.execute("""
+        CREATE OR REPLACE FUNCTION create_car_price_history_partition(month date)
+        RETURNS void AS $$
+        DECLARE
+            start_at date := date_trunc('month', month)::date;
+            end_at date := (start_at + interval '1 month')::date;
+            partition_name text := 'car_price_history_' || to_char(start_at, 'YYYY_MM');
+        BEGIN
+            IF to_regclass(partition_name) IS NOT NULL THEN
+                RETURN;
+            END IF;
+            LOCK TABLE car_price_history_default IN SHARE ROW EXCLUSIVE MODE;
+            EXECUTE format(
+                'CREATE TABLE %I (LIKE car_price_history INCLUDING DEFAULTS)',
+                partition_name
+            );
+            EXECUTE format(
+                'WITH moved AS (DELETE FROM car_price_history_default '
+                'WHERE changed_at >= %L AND changed_at < %L RETURNING *) '
+                'INSERT INTO %I SELECT * FROM moved',
+                start_at, end_at, partition_name
+            );
+            EXECUTE format(
+                'ALTER TABLE car_price_history ATTACH PARTITION %I '
+                'FOR VALUES FROM (%L) TO (%L)',
+                partition_name, start_at, end_at
+            );
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    # Переносит строки, уже накопившиеся в DEFAULT за прошедшие месяцы
+    op.execute("""
+        SELECT create_car_price_history_partition(month::date)
+        FROM (
+            SELECT DISTINCT date_trunc('month', changed_at) AS month
+            FROM car_price_history_default
+        ) AS months
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION create_car_price_history_partition(month date)
+        RETURNS void AS $$
+        DECLARE
+            start_at date := date_trunc('month', month)::date;
+            partition_name text := 'car_price_history_' || to_char(start_at, 'YYYY_MM');
+        BEGIN
+            EXECUTE format(
+                'CREATE TABLE IF NOT EXISTS %I PARTITION OF car_price_history '
+                'FOR VALUES FROM (%L) TO (%L)',
+                partition_name, start_at, (start_at + interval '1 month')::date
+            );
+        END;
+        $$ LANGUAGE plpgsql
+    """)
@@ -0,0 +1,52 @@
+"""Create car valuation stats view
+
+Revision ID: d5e2a7c41f83
+Revises: c3f8a61b2d90
+Create Date: 2026-10-19 14:02:11.480215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5e2a7c41f83'
+down_revision: Union[str, None] = 'c3f8a61b2d90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Полосы пробега по 20000; строка с mileage_band = -1 - все пробеги года.
+    # Уникальный индекс обязателен для REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.execute("""
+        CREATE MATERIALIZED VIEW car_valuation_stats AS
+        SELECT
+            lower(make) AS make,
+            lower(model) AS model,
+            year,
+            coalesce(mileage / 20000, -1) AS mileage_band,
+            count(*) AS listings,
+            percentile_cont(0.1) WITHIN GROUP (ORDER BY price) AS p10,
+            percentile_cont(0.25) WITHIN GROUP (ORDER BY price) AS p25,
+            percentile_cont(0.5) WITHIN GROUP (ORDER BY price) AS median,
+            percentile_cont(0.75) WITHIN GROUP (ORDER BY price) AS p75,
+            percentile_cont(0.9) WITHIN GROUP (ORDER BY price) AS p90,
+            now() AS refreshed_at
+        FROM cars
+        GROUP BY GROUPING SETS (
+            (lower(make), lower(model), year, mileage / 20000),
+            (lower(make), lower(model), year)
+        )
+        WITH DATA
+    """)
+    op.execute("""
+        CREATE UNIQUE INDEX ix_car_valuation_stats_segment
+        ON car_valuation_stats (make, model, year, mileage_band)
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS car_valuation_stats")
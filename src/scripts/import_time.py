@@ -0,0 +1,62 @@
+"""
+Замер времени импорта приложения.
+
+    python scripts/import_time.py [module] [--runs N] [--top N]
+
+Each run imports the module in a fresh interpreter with `-X importtime`
+and reports the median cumulative time plus the slowest top-level imports.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent
+
+
+def measure(module: str) -> dict[str, int]:
+    """Returns the cumulative import time in microseconds for every module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        timings[name.strip()] = int(cumulative)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("module", nargs="?", default="interface.main")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    samples = defaultdict(list)
+    for _ in range(args.runs):
+        for name, cumulative in measure(args.module).items():
+            samples[name].append(cumulative)
+
+    total = statistics.median(samples[args.module])
+    print(f"{args.module}: {total / 1000:.1f} ms (median of {args.runs} runs)")
+    slowest = sorted(
+        ((statistics.median(values), name) for name, values in samples.items()),
+        reverse=True,
+    )
+    for cumulative, name in slowest[1 : args.top + 1]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+    lazy = [name for name in ("passlib", "boto3", "numpy") if name in samples]
+    print("heavy optional modules imported:", ", ".join(lazy) or "none")
+
+
+if __name__ == "__main__":
+    main()
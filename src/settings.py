@@ -29,6 +29,121 @@ class Settings(BaseSettings):
     )
     refresh_token_expire_days: int = Field(os.environ.get("REFRESH_TOKEN_EXPIRE_DAYS"))
 
+    server_host: str = Field(os.environ.get("SERVER_HOST", "0.0.0.0"))
+    server_port: int = Field(os.environ.get("SERVER_PORT", 8000))
+    server_workers: int = Field(os.environ.get("SERVER_WORKERS", os.cpu_count() or 1))
+    server_keepalive: int = Field(os.environ.get("SERVER_KEEPALIVE", 5))
+    server_backlog: int = Field(os.environ.get("SERVER_BACKLOG", 2048))
+    server_graceful_timeout: int = Field(os.environ.get("SERVER_GRACEFUL_TIMEOUT", 30))
+
+    # Пул соединений создается отдельно в каждом воркере
+    db_pool_size: int = Field(os.environ.get("DB_POOL_SIZE", 10))
+    db_max_overflow: int = Field(os.environ.get("DB_MAX_OVERFLOW", 10))
+    db_pool_timeout: int = Field(os.environ.get("DB_POOL_TIMEOUT", 30))
+    db_pool_recycle: int = Field(os.environ.get("DB_POOL_RECYCLE", 1800))
+    warmup_connections: int = Field(os.environ.get("WARMUP_CONNECTIONS", 5))
+
+    car_events_buffer_size: int = Field(os.environ.get("CAR_EVENTS_BUFFER_SIZE", 100))
+    car_events_heartbeat_seconds: float = Field(
+        os.environ.get("CAR_EVENTS_HEARTBEAT_SECONDS", 15)
+    )
+    # Проверка LISTEN соединения: без ответа на SELECT 1 оно считается потерянным
+    car_events_ping_seconds: float = Field(
+        os.environ.get("CAR_EVENTS_PING_SECONDS", 30)
+    )
+
+    outbox_batch_size: int = Field(os.environ.get("OUTBOX_BATCH_SIZE", 100))
+    outbox_poll_seconds: float = Field(os.environ.get("OUTBOX_POLL_SECONDS", 5))
+    outbox_max_attempts: int = Field(os.environ.get("OUTBOX_MAX_ATTEMPTS", 10))
+    # Сколько сообщения пачки закреплены за воркером, пока идут обработчики
+    outbox_lease_seconds: float = Field(os.environ.get("OUTBOX_LEASE_SECONDS", 300))
+
+    # Общие для кластера задачи; индексы воркера обновляются и без них
+    scheduler_enabled: bool = Field(os.environ.get("SCHEDULER_ENABLED", True))
+    banned_tokens_purge_seconds: float = Field(
+        os.environ.get("BANNED_TOKENS_PURGE_SECONDS", 3600)
+    )
+    saved_searches_reload_seconds: float = Field(
+        os.environ.get("SAVED_SEARCHES_RELOAD_SECONDS", 300)
+    )
+    suggest_reload_seconds: float = Field(os.environ.get("SUGGEST_RELOAD_SECONDS", 900))
+    similarity_reload_seconds: float = Field(
+        os.environ.get("SIMILARITY_RELOAD_SECONDS", 900)
+    )
+    # Без индексов воркер не стартует; попытки идут с паузой 1, 2, 4... секунд
+    index_load_attempts: int = Field(os.environ.get("INDEX_LOAD_ATTEMPTS", 5))
+
+    # Как часто дельты car_stats сворачиваются - на столько отстает статистика
+    car_stats_fold_seconds: float = Field(os.environ.get("CAR_STATS_FOLD_SECONDS", 30))
+
+    archive_interval_seconds: float = Field(
+        os.environ.get("ARCHIVE_INTERVAL_SECONDS", 600)
+    )
+    # Активное объявление без изменений дольше этого срока становится expired
+    listing_expire_days: int = Field(os.environ.get("LISTING_EXPIRE_DAYS", 90))
+    archive_batch_size: int = Field(os.environ.get("ARCHIVE_BATCH_SIZE", 1000))
+
+    # Корень приватного бакета: https://<bucket>.s3.<region>.amazonaws.com
+    # или http://localhost:9000/<bucket> для S3-совместимого хранилища
+    storage_bucket_url: str = Field(
+        os.environ.get("STORAGE_BUCKET_URL", "http://localhost:9000/car-images")
+    )
+    storage_region: str = Field(os.environ.get("STORAGE_REGION", "us-east-1"))
+    storage_access_key: str = Field(os.environ.get("STORAGE_ACCESS_KEY", ""))
+    storage_secret_key: str = Field(os.environ.get("STORAGE_SECRET_KEY", ""))
+    presigned_url_ttl_seconds: int = Field(
+        os.environ.get("PRESIGNED_URL_TTL_SECONDS", 3600)
+    )
+    # "s3" или "local" - каталог вместо бакета для тестов и разработки
+    storage_backend: str = Field(os.environ.get("STORAGE_BACKEND", "s3"))
+    storage_local_dir: str = Field(os.environ.get("STORAGE_LOCAL_DIR", "storage"))
+    image_upload_max_bytes: int = Field(
+        os.environ.get("IMAGE_UPLOAD_MAX_BYTES", 10 * 1024 * 1024)
+    )
+    image_upload_ttl_seconds: int = Field(
+        os.environ.get("IMAGE_UPLOAD_TTL_SECONDS", 900)
+    )
+    image_blobs_gc_seconds: float = Field(
+        os.environ.get("IMAGE_BLOBS_GC_SECONDS", 3600)
+    )
+    # Неиспользуемый объект удаляется не раньше; должен быть больше срока загрузки
+    image_blobs_grace_seconds: int = Field(
+        os.environ.get("IMAGE_BLOBS_GRACE_SECONDS", 86400)
+    )
+    image_blobs_gc_batch_size: int = Field(
+        os.environ.get("IMAGE_BLOBS_GC_BATCH_SIZE", 1000)
+    )
+
+    query_cache_ttl_seconds: float = Field(
+        os.environ.get("QUERY_CACHE_TTL_SECONDS", 30)
+    )
+    # Лимит памяти кэша - суммарное число машин во всех закэшированных страницах
+    query_cache_max_rows: int = Field(os.environ.get("QUERY_CACHE_MAX_ROWS", 50_000))
+    # До этого числа результаты списков считаются точно, дальше - оценка
+    count_exact_limit: int = Field(os.environ.get("COUNT_EXACT_LIMIT", 10_000))
+
+    valuation_refresh_seconds: float = Field(
+        os.environ.get("VALUATION_REFRESH_SECONDS", 300)
+    )
+    valuation_min_listings: int = Field(os.environ.get("VALUATION_MIN_LISTINGS", 5))
+
+    # Лимиты в формате "<запросов>/<секунд>"
+    rate_limit_backend: str = Field(os.environ.get("RATE_LIMIT_BACKEND", "memory"))
+    auth_token_rate_limit_ip: str = Field(
+        os.environ.get("AUTH_TOKEN_RATE_LIMIT_IP", "20/60")
+    )
+    auth_token_rate_limit_username: str = Field(
+        os.environ.get("AUTH_TOKEN_RATE_LIMIT_USERNAME", "5/60")
+    )
+    auth_register_rate_limit_ip: str = Field(
+        os.environ.get("AUTH_REGISTER_RATE_LIMIT_IP", "5/60")
+    )
+    # Как часто удалять из rate_limit_buckets корзины, простоявшие дольше
+    # периода наполнения (только для RATE_LIMIT_BACKEND=postgres)
+    rate_limit_purge_seconds: float = Field(
+        os.environ.get("RATE_LIMIT_PURGE_SECONDS", 3600)
+    )
+
     @property
     def database_url(self) -> Optional[PostgresDsn]:
         return (
@@ -36,6 +151,14 @@ class Settings(BaseSettings):
             f"{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
         )
 
+    @property
+    def postgres_dsn(self) -> str:
+        """DSN для прямых соединений asyncpg (без драйвера SQLAlchemy)."""
+        return (
+            f"postgresql://{self.postgres_user}:{self.postgres_password}@"
+            f"{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
+        )
+
 
 settings: Settings | None = None
 
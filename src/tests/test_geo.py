@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from core.geo import (
+    GEOHASH_PRECISION,
+    cell_size,
+    covering_cells,
+    encode_geohash,
+    haversine_km,
+)
+
+
+def test_encode_geohash_known_value():
+    assert encode_geohash(57.64911, 10.40744, 11) == "u4pruydqqvj"
+
+
+def test_cell_size_halves_with_each_bit():
+    assert cell_size(1) == (45.0, 45.0)
+    assert cell_size(2) == (45.0 / 8, 45.0 / 4)
+
+
+@pytest.mark.parametrize(
+    "lat, lon, radius_km",
+    [
+        (55.7558, 37.6173, 0.5),
+        (55.7558, 37.6173, 25),
+        (-33.8688, 151.2093, 3),
+        (0.0, 179.99, 10),  # круг пересекает антимеридиан
+        (78.2232, 15.6267, 40),  # высокая широта
+    ],
+)
+def test_covering_cells_contain_every_point_of_the_circle(lat, lon, radius_km):
+    cells = covering_cells(lat, lon, radius_km)
+    assert 0 < len(cells) <= 16
+    rng = random.Random(0)
+    for _ in range(2000):
+        # Точки на сетке вокруг центра, отобранные по точному расстоянию
+        point_lat = lat + rng.uniform(-1, 1) * radius_km / 111
+        point_lon = lon + rng.uniform(-1, 1) * radius_km / 20
+        point_lon = (point_lon + 180) % 360 - 180
+        if (
+            abs(point_lat) > 90
+            or haversine_km(lat, lon, point_lat, point_lon) > radius_km
+        ):
+            continue
+        geohash = encode_geohash(point_lat, point_lon)
+        assert any(geohash.startswith(cell) for cell in cells)
+
+
+def test_covering_cells_get_finer_as_the_radius_shrinks():
+    precisions = [
+        len(covering_cells(55.7558, 37.6173, radius_km)[0])
+        for radius_km in (100, 10, 1, 0.1, 0.001)
+    ]
+    assert precisions == sorted(precisions)
+    assert precisions[-1] == GEOHASH_PRECISION
+
+
+def test_covering_cells_matches_everything_for_huge_radius():
+    assert covering_cells(10.0, 10.0, 30_000) == [""]
@@ -0,0 +1,141 @@
+import asyncio
+import hashlib
+from dataclasses import replace
+from datetime import timedelta
+from uuid import uuid4
+
+import pytest
+
+from core.entities import ImageBlob, StoredObject, UploadForm
+from core.exceptions import InvalidRequestError
+from core.services.image_service import ImageUploadService, blob_key
+
+CONTENT = b"\xff\xd8\xff\xe0 not really a jpeg"
+SHA256 = hashlib.sha256(CONTENT).hexdigest()
+
+
+class FakeCars:
+    def __init__(self, *ids):
+        self.ids = set(ids)
+
+    async def get_version(self, car_id):
+        return 1 if car_id in self.ids else None
+
+
+class FakeImages:
+    def __init__(self):
+        self.created = []
+
+    async def create(self, image):
+        self.created.append(image)
+        return image
+
+
+class FakeBlobs:
+    def __init__(self):
+        self.blobs: dict[str, ImageBlob] = {}
+
+    async def get(self, sha256):
+        return self.blobs.get(sha256)
+
+    async def reserve(self, blob):
+        return self.blobs.setdefault(blob.sha256, blob)
+
+    async def mark_uploaded(self, sha256, size, content_type):
+        self.blobs[sha256] = replace(
+            self.blobs[sha256], size=size, content_type=content_type, uploaded=True
+        )
+        return True
+
+    async def delete_released(self, older_than, limit):
+        return []
+
+
+class FakeStorage:
+    def __init__(self):
+        self.objects: dict[str, tuple[bytes, str]] = {}
+        self.forms = 0
+
+    def url(self, key):
+        return f"s3://bucket/{key}"
+
+    def create_upload(self, key, content_type, size, sha256, expires_in):
+        self.forms += 1
+        return UploadForm(url="https://storage.example", key=key)
+
+    async def head(self, key):
+        if key not in self.objects:
+            return None
+        content, content_type = self.objects[key]
+        return StoredObject(key=key, size=len(content), content_type=content_type)
+
+    async def sha256(self, key):
+        return hashlib.sha256(self.objects[key][0]).hexdigest()
+
+    async def delete(self, keys):
+        for key in keys:
+            self.objects.pop(key, None)
+
+
+@pytest.fixture
+def car_id():
+    return uuid4()
+
+
+@pytest.fixture
+def storage():
+    return FakeStorage()
+
+
+@pytest.fixture
+def service(car_id, storage):
+    return ImageUploadService(
+        FakeImages(),
+        FakeBlobs(),
+        FakeCars(car_id),
+        storage,
+        max_size=1024,
+        upload_ttl=300,
+    )
+
+
+def test_identical_content_is_uploaded_once(service, storage, car_id):
+    blob, form = asyncio.run(
+        service.create_upload(car_id, "image/jpeg", len(CONTENT), SHA256)
+    )
+    assert form.key == blob_key(SHA256)
+    storage.objects[form.key] = (CONTENT, "image/jpeg")
+    image = asyncio.run(service.complete_upload(car_id, SHA256, is_main=True))
+    assert image.blob_sha256 == SHA256
+    assert image.url == storage.url(blob_key(SHA256))
+
+    blob, form = asyncio.run(
+        service.create_upload(car_id, "image/jpeg", len(CONTENT), SHA256)
+    )
+    assert blob.uploaded
+    assert form is None
+    assert storage.forms == 1
+
+
+def test_mismatched_content_is_deleted(service, storage, car_id):
+    asyncio.run(service.create_upload(car_id, "image/jpeg", len(CONTENT), SHA256))
+    storage.objects[blob_key(SHA256)] = (b"something else", "image/jpeg")
+    with pytest.raises(InvalidRequestError):
+        asyncio.run(service.complete_upload(car_id, SHA256))
+    assert blob_key(SHA256) not in storage.objects
+    assert not service.blobs_repository.blobs[SHA256].uploaded
+
+
+@pytest.mark.parametrize(
+    "content_type, size", [("text/html", 10), ("image/png", 0), ("image/png", 2048)]
+)
+def test_upload_is_validated_before_signing(
+    service, storage, car_id, content_type, size
+):
+    with pytest.raises(InvalidRequestError):
+        asyncio.run(service.create_upload(car_id, content_type, size, SHA256))
+    assert storage.forms == 0
+
+
+def test_collect_garbage_without_released_blobs(service):
+    assert asyncio.run(service.collect_garbage(timedelta(hours=1), 100)) == 0
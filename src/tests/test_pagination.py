@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+from fastapi import Response
+
+from core.entities import ResultCount
+from interface import pagination
+from interface.pagination import report_total
+
+
+class Counter:
+    def __init__(self, total: ResultCount):
+        self.total = total
+        self.calls = []
+
+    async def __call__(self, exact_limit):
+        self.calls.append(exact_limit)
+        return self.total
+
+
+def report(mode, offset, limit, returned, counter):
+    response = Response()
+    asyncio.run(report_total(response, mode, offset, limit, returned, counter))
+    return response.headers
+
+
+def test_a_short_page_needs_no_count():
+    counter = Counter(ResultCount(0))
+    headers = report("auto", 20, 10, 3, counter)
+    assert headers["X-Total-Count"] == "23"
+    assert headers["X-Total-Count-Exact"] == "true"
+    assert counter.calls == []
+
+
+@pytest.mark.parametrize("mode, exact_limit", [("auto", 100), ("exact", None)])
+def test_a_full_page_is_counted(monkeypatch, mode, exact_limit):
+    monkeypatch.setattr(pagination.config, "count_exact_limit", 100)
+    counter = Counter(ResultCount(101, exact=False))
+    headers = report(mode, 0, 10, 10, counter)
+    assert counter.calls == [exact_limit]
+    assert headers["X-Total-Count"] == "101"
+    assert headers["X-Total-Count-Exact"] == "false"
+
+
+def test_count_none_skips_the_total():
+    counter = Counter(ResultCount(5))
+    assert "X-Total-Count" not in report("none", 0, 10, 5, counter)
+    assert counter.calls == []
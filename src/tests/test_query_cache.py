@@ -0,0 +1,72 @@
+import asyncio
+
+from utils.query_cache import QueryCache
+
+
+def test_make_key_normalizes_filters():
+    assert QueryCache.make_key("cars", make=" BMW ", model=None, limit=10) == (
+        QueryCache.make_key("cars", limit=10, make="bmw")
+    )
+    assert QueryCache.make_key("cars", make="bmw") != QueryCache.make_key(
+        "cars", make="audi"
+    )
+
+
+def test_bump_expires_older_generations():
+    cache = QueryCache()
+    cache.put("key", [1, 2])
+    assert cache.get("key") == [1, 2]
+    cache.bump()
+    assert cache.get("key") is None
+    assert cache.stats.stale == 1
+    assert len(cache) == 0 and cache.rows == 0
+
+
+def test_put_skips_results_read_before_a_bump():
+    cache = QueryCache()
+    generation = cache.generation
+    cache.bump()
+    cache.put("key", [1], generation)
+    assert cache.get("key") is None
+
+
+def test_get_or_load_does_not_cache_a_read_overlapping_a_write():
+    async def main():
+        cache = QueryCache()
+
+        async def load():
+            cache.bump()  # запись в каталог, пока идет чтение
+            return [1]
+
+        value = await cache.get_or_load("key", load)
+        return cache, value
+
+    cache, value = asyncio.run(main())
+    assert value == [1]
+    assert len(cache) == 0
+
+
+def test_expired_entries_are_dropped():
+    cache = QueryCache(ttl=0)
+    cache.put("key", [1])
+    assert cache.get("key") is None
+    assert cache.stats.expired == 1
+
+
+def test_eviction_is_bounded_by_rows():
+    cache = QueryCache(max_rows=5)
+    cache.put("a", [1, 2])
+    cache.put("b", [1, 2])
+    cache.get("a")  # "a" становится самым свежим
+    cache.put("c", [1, 2])
+    assert cache.get("b") is None
+    assert cache.get("a") == [1, 2] and cache.get("c") == [1, 2]
+    assert cache.rows == 4
+    assert cache.stats.evictions == 1
+
+
+def test_pages_larger_than_the_budget_are_not_cached():
+    cache = QueryCache(max_rows=2)
+    cache.put("key", [1, 2, 3])
+    assert cache.get("key") is None
+    assert cache.rows == 0
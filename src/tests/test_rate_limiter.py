@@ -0,0 +1,85 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from core.exceptions import TooManyRequestsError
+from utils import rate_limiter
+from utils.rate_limiter import (
+    InMemoryRateLimitBackend,
+    RateLimit,
+    RateLimiter,
+    refill_window,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", clock)
+    return clock
+
+
+def test_parse():
+    limit = RateLimit.parse("5/60")
+    assert limit == RateLimit(capacity=5, period=60.0)
+    assert limit.rate == pytest.approx(5 / 60)
+
+
+@pytest.mark.parametrize("value", ["0/60", "5/0", "-1/10", "5", "x/10"])
+def test_parse_rejects_invalid_limits(value):
+    with pytest.raises(ValueError):
+        RateLimit.parse(value)
+
+
+def test_bucket_allows_a_burst_then_refills(clock):
+    backend = InMemoryRateLimitBackend()
+    limit = RateLimit(capacity=2, period=10)
+
+    def hit():
+        return asyncio.run(backend.hit("key", limit))
+
+    assert hit() == (True, 0.0)
+    assert hit() == (True, 0.0)
+    allowed, retry_after = hit()
+    assert not allowed
+    assert retry_after == pytest.approx(5.0)
+    clock.now += 5
+    assert hit()[0]
+    assert not hit()[0]
+
+
+def test_buckets_are_per_key_and_bounded(clock):
+    backend = InMemoryRateLimitBackend(max_keys=2)
+    limit = RateLimit(capacity=1, period=60)
+    for key in ("a", "b", "c"):
+        assert asyncio.run(backend.hit(key, limit))[0]
+    assert len(backend._buckets) == 2
+    # "a" вытеснен и начинает с полной корзины
+    assert asyncio.run(backend.hit("a", limit))[0]
+    assert not asyncio.run(backend.hit("c", limit))[0]
+
+
+def test_limiter_raises_with_retry_after(clock):
+    limiter = RateLimiter(
+        "login", RateLimit(capacity=1, period=30), InMemoryRateLimitBackend()
+    )
+    asyncio.run(limiter.check("10.0.0.1"))
+    with pytest.raises(TooManyRequestsError) as error:
+        asyncio.run(limiter.check("10.0.0.1"))
+    assert error.value.status_code == 429
+    assert error.value.headers == {"Retry-After": "30"}
+    asyncio.run(limiter.check(None))  # без идентификатора не ограничивается
+
+
+def test_refill_window_is_the_longest_configured_period(monkeypatch):
+    monkeypatch.setattr(rate_limiter.config, "auth_token_rate_limit_username", "3/900")
+    assert refill_window() == timedelta(seconds=900)
@@ -0,0 +1,99 @@
+import random
+from uuid import uuid4
+
+from core.entities import Car, SavedSearch
+from core.indexes.saved_search_index import IntervalTree, SavedSearchIndex
+
+
+def make_car(**overrides):
+    values = dict(
+        make="Toyota",
+        model="Camry",
+        year=2018,
+        price=20_000,
+        mileage=60_000,
+        fuel_type="Petrol",
+        engine_capacity=2.5,
+        transmission="Automatic",
+        body_style="Sedan",
+        color="White",
+    )
+    return Car(**{**values, **overrides})
+
+
+def search(**predicates):
+    return SavedSearch(user_id=uuid4(), name="search", **predicates)
+
+
+def test_interval_tree_stab_matches_brute_force():
+    rng = random.Random(1)
+    intervals = {}
+    for key in range(300):
+        low = rng.uniform(0, 100)
+        intervals[key] = (low, low + rng.uniform(0, 30))
+    tree = IntervalTree(min_pending=8)
+    tree.load(intervals)
+    # Добавления и удаления проходят и через отложенный список, и через перестройку
+    for key in range(300, 340):
+        low = rng.uniform(0, 100)
+        intervals[key] = (low, low + rng.uniform(0, 30))
+        tree.add(key, *intervals[key])
+    for key in rng.sample(sorted(intervals), 60):
+        del intervals[key]
+        tree.remove(key)
+    for point in [rng.uniform(-10, 140) for _ in range(200)] + [0.0, 100.0]:
+        expected = {
+            key for key, (low, high) in intervals.items() if low <= point <= high
+        }
+        assert set(tree.stab(point)) == expected
+
+
+def test_interval_tree_ignores_empty_intervals_and_replaces_keys():
+    tree = IntervalTree()
+    tree.add("empty", 5, 1)
+    tree.add("key", 0, 1)
+    tree.add("key", 10, 20)
+    assert len(tree) == 1
+    assert tree.stab(0.5) == []
+    assert tree.stab(15) == ["key"]
+
+
+def test_match_by_equality_range_and_unconstrained_anchors():
+    by_make = search(make=" toyota ", max_price=25_000)
+    by_price = search(min_price=15_000, max_price=21_000)
+    by_year = search(min_year=2020)
+    everything = search()
+    other_make = search(make="Honda")
+    index = SavedSearchIndex()
+    index.load([by_make, by_price, by_year, everything, other_make])
+    matched = {s.id for s in index.match(make_car())}
+    assert matched == {by_make.id, by_price.id, everything.id}
+
+
+def test_match_checks_every_predicate_not_just_the_anchor():
+    narrow = search(make="Toyota", model="Corolla")
+    index = SavedSearchIndex()
+    index.load([narrow])
+    assert index.match(make_car()) == []
+    assert index.match(make_car(model="corolla")) == [narrow]
+
+
+def test_add_and_remove_after_load():
+    first = search(max_mileage=80_000)
+    index = SavedSearchIndex()
+    index.load([first])
+    second = search(fuel_type="petrol")
+    index.add(second)
+    assert {s.id for s in index.match(make_car())} == {first.id, second.id}
+    index.remove(first.id)
+    index.remove(first.id)
+    assert index.match(make_car()) == [second]
+    assert len(index) == 1
+
+
+def test_load_records_the_snapshot_time():
+    index = SavedSearchIndex()
+    assert index.as_of is None
+    snapshot = make_car().created_at
+    index.load([], snapshot)
+    assert index.as_of == snapshot
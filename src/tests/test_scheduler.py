@@ -0,0 +1,57 @@
+from datetime import datetime
+
+import pytest
+
+from infrastructure.scheduler import CronSchedule
+
+
+def test_parse_fields():
+    schedule = CronSchedule("*/15 9-17 1,15 * 1-5")
+    assert schedule.minutes == {0, 15, 30, 45}
+    assert schedule.hours == set(range(9, 18))
+    assert schedule.days == {1, 15}
+    assert schedule.months == set(range(1, 13))
+    assert schedule.weekdays == {1, 2, 3, 4, 5}
+
+
+def test_parse_sunday_as_seven_and_step_from_number():
+    assert CronSchedule("0 0 * * 7").weekdays == {0}
+    assert CronSchedule("5/20 * * * *").minutes == {5, 25, 45}
+
+
+@pytest.mark.parametrize(
+    "expression",
+    ["* * * *", "60 * * * *", "* 24 * * *", "* * 0 * *", "* * * 13 *", "5-1 * * * *"],
+)
+def test_invalid_expressions(expression):
+    with pytest.raises(ValueError):
+        CronSchedule(expression)
+
+
+@pytest.mark.parametrize(
+    "expression, moment, expected",
+    [
+        ("*/15 * * * *", datetime(2026, 1, 1, 10, 7, 30), datetime(2026, 1, 1, 10, 15)),
+        # Ровно в слот - следующий запуск, а не текущий
+        ("0 3 * * *", datetime(2026, 1, 1, 3, 0), datetime(2026, 1, 2, 3, 0)),
+        ("30 23 31 12 *", datetime(2026, 6, 1), datetime(2026, 12, 31, 23, 30)),
+        ("0 0 1 * *", datetime(2026, 12, 15), datetime(2027, 1, 1)),
+        ("0 0 29 2 *", datetime(2026, 3, 1), datetime(2028, 2, 29)),
+        # 2026-01-05 - понедельник
+        ("0 9 * * 1", datetime(2026, 1, 5, 9, 1), datetime(2026, 1, 12, 9, 0)),
+    ],
+)
+def test_next_after(expression, moment, expected):
+    assert CronSchedule(expression).next_after(moment) == expected
+
+
+def test_day_of_month_or_day_of_week_when_both_restricted():
+    # 13-е число или пятница, как в cron
+    schedule = CronSchedule("0 0 13 * 5")
+    assert schedule.next_after(datetime(2026, 2, 1)) == datetime(2026, 2, 6)
+    assert schedule.next_after(datetime(2026, 2, 10)) == datetime(2026, 2, 13)
+
+
+def test_never_firing_expression():
+    with pytest.raises(ValueError):
+        CronSchedule("0 0 31 2 *").next_after(datetime(2026, 1, 1))
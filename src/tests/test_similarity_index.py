@@ -0,0 +1,105 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from core.indexes.similarity_index import SimilarityIndex
+
+
+def car(price, year=2018, make="BMW", body_style="Sedan"):
+    return {
+        "price": price,
+        "year": year,
+        "mileage": 50_000,
+        "engine_capacity": 2.0,
+        "make": make,
+        "body_style": body_style,
+        "fuel_type": "Petrol",
+        "transmission": "Automatic",
+    }
+
+
+def test_similar_returns_the_nearest_first():
+    ids = [uuid4() for _ in range(4)]
+    index = SimilarityIndex()
+    index.load(zip(ids, [car(10_000), car(11_000), car(30_000), car(10_500)]))
+    nearest = index.similar(car(10_000), k=3, exclude=ids[0])
+    assert [car_id for car_id, _ in nearest] == [ids[3], ids[1], ids[2]]
+    distances = [distance for _, distance in nearest]
+    assert distances == sorted(distances)
+
+
+def test_categorical_mismatch_adds_distance():
+    same, other = uuid4(), uuid4()
+    index = SimilarityIndex()
+    index.load([(same, car(10_000)), (other, car(10_000, make="Audi"))])
+    [(first, d1), (second, d2)] = index.similar(car(10_000), k=2)
+    assert (first, second) == (same, other)
+    assert d2 - d1 == pytest.approx(2.0)
+
+
+def test_queries_do_not_grow_the_vocabulary():
+    same, other = uuid4(), uuid4()
+    index = SimilarityIndex()
+    index.load([(same, car(10_000)), (other, car(10_000, make="Audi"))])
+    vocab = [dict(values) for values in index._vocab]
+    [(_, d1), (_, d2)] = index.similar(car(10_000, make="Lada"), k=2)
+    assert index._vocab == vocab
+    assert d1 == pytest.approx(d2)
+
+
+def test_upsert_and_remove_reuse_rows():
+    index = SimilarityIndex(capacity=2)
+    ids = [uuid4() for _ in range(3)]
+    for i, car_id in enumerate(ids):
+        index.upsert(car_id, car(10_000 + i * 1000))
+    assert len(index) == 3
+    index.remove(ids[1])
+    assert ids[1] not in index
+    index.remove(ids[1])  # повторное удаление ничего не ломает
+    newcomer = uuid4()
+    index.upsert(newcomer, car(11_000))
+    assert index._size == 3  # строка удаленной машины использована повторно
+    index.upsert(ids[0], car(11_100))
+    assert [car_id for car_id, _ in index.similar(car(11_000), k=2)] == [
+        newcomer,
+        ids[0],
+    ]
+
+
+def test_running_statistics_match_a_fresh_load():
+    rows = [(uuid4(), car(5_000 + i * 700, year=2000 + i)) for i in range(20)]
+    incremental = SimilarityIndex()
+    for car_id, values in rows:
+        incremental.upsert(car_id, values)
+    for car_id, _ in rows[::3]:
+        incremental.remove(car_id)
+    loaded = SimilarityIndex()
+    loaded.load(row for i, row in enumerate(rows) if i % 3)
+    query = car(9_000, year=2007)
+    expected = loaded.similar(query, k=5)
+    actual = incremental.similar(query, k=5)
+    assert [car_id for car_id, _ in actual] == [car_id for car_id, _ in expected]
+    assert [d for _, d in actual] == pytest.approx([d for _, d in expected], rel=1e-4)
+
+
+def test_load_chunks_swaps_in_the_full_matrix():
+    rows = [(uuid4(), car(5_000 + i)) for i in range(2500)]
+
+    async def chunks():
+        for start in range(0, len(rows), 1000):
+            yield rows[start : start + 1000]
+
+    index = SimilarityIndex()
+    index.upsert(uuid4(), car(1))
+    asyncio.run(index.load_chunks(chunks()))
+    assert len(index) == len(rows)
+    assert index.similar(car(5_000), k=1)[0][0] == rows[0][0]
+
+
+def test_similar_on_an_empty_or_single_car_index():
+    index = SimilarityIndex()
+    assert index.similar(car(10_000)) == []
+    only = uuid4()
+    index.upsert(only, car(10_000))
+    assert index.similar(car(10_000), exclude=only) == []
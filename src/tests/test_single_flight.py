@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+
+from utils.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_result():
+    async def main():
+        flight, calls = SingleFlight(), 0
+
+        async def load():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        results = await asyncio.gather(*(flight.do("key", load) for _ in range(5)))
+        return flight, calls, results
+
+    flight, calls, results = asyncio.run(main())
+    assert calls == 1
+    assert results == [1] * 5
+    assert (flight.stats.calls, flight.stats.shared) == (1, 4)
+
+
+def test_different_keys_run_separately():
+    async def main():
+        flight = SingleFlight()
+
+        async def load(value):
+            await asyncio.sleep(0.01)
+            return value
+
+        return await asyncio.gather(
+            flight.do("a", lambda: load("a")), flight.do("b", lambda: load("b"))
+        )
+
+    assert asyncio.run(main()) == ["a", "b"]
+
+
+def test_exception_reaches_every_waiter():
+    async def main():
+        flight = SingleFlight()
+
+        async def load():
+            await asyncio.sleep(0.01)
+            raise LookupError("boom")
+
+        return await asyncio.gather(
+            *(flight.do("key", load) for _ in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, LookupError) for result in results)
+
+
+def test_waiter_restarts_the_call_when_the_first_caller_is_cancelled():
+    async def main():
+        flight, started = SingleFlight(), []
+
+        async def load():
+            started.append(asyncio.current_task())
+            await asyncio.sleep(0.05)
+            return "done"
+
+        first = asyncio.create_task(flight.do("key", load))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(flight.do("key", load))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second, started, second
+
+    result, started, second = asyncio.run(main())
+    assert result == "done"
+    assert len(started) == 2
+    assert started[1] is second  # второй вызов выполняется в задаче ожидавшего
+
+
+def test_cancelled_waiter_does_not_cancel_the_call():
+    async def main():
+        flight = SingleFlight()
+
+        async def load():
+            await asyncio.sleep(0.02)
+            return "done"
+
+        first = asyncio.create_task(flight.do("key", load))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(flight.do("key", load))
+        await asyncio.sleep(0.005)
+        second.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await second
+        return await first, flight
+
+    result, flight = asyncio.run(main())
+    assert result == "done"
+    assert flight.stats.calls == 1
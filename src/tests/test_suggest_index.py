@@ -0,0 +1,59 @@
+from core.indexes.suggest_index import SuggestIndex
+
+
+def make_index():
+    index = SuggestIndex()
+    index.load(
+        [
+            ("make", "Toyota", 5),
+            ("make", "Tesla", 2),
+            ("model", "Touareg", 3),
+            ("feature", "Tow bar", 1),
+        ]
+    )
+    return index
+
+
+def test_suggest_ranks_by_popularity():
+    assert make_index().suggest("t") == [
+        ("make", "Toyota", 5),
+        ("model", "Touareg", 3),
+        ("make", "Tesla", 2),
+        ("feature", "Tow bar", 1),
+    ]
+
+
+def test_suggest_normalizes_prefix_and_filters_kinds():
+    index = make_index()
+    assert index.suggest("  TO ", kinds=["make"]) == [("make", "Toyota", 5)]
+    assert index.suggest("tow  b") == [("feature", "Tow bar", 1)]
+    assert index.suggest("") == []
+
+
+def test_apply_moves_counts_between_terms():
+    index = make_index()
+    old = {"make": "Toyota", "model": "Camry", "features": "Tow bar"}
+    new = {"make": "Tesla", "model": "Camry", "features": ["Sunroof"]}
+    index.apply(None, old)
+    assert ("model", "Camry", 1) in index.suggest("cam")
+    index.apply(old, new)
+    assert index.suggest("toy") == [("make", "Toyota", 5)]
+    assert index.suggest("tes") == [("make", "Tesla", 3)]
+    assert index.suggest("sun") == [("feature", "Sunroof", 1)]
+    assert index.suggest("tow") == [("feature", "Tow bar", 1)]
+
+
+def test_apply_drops_unused_terms():
+    index = make_index()
+    index.apply({"make": "Tesla"}, None)
+    index.apply({"make": "Tesla"}, None)
+    assert index.suggest("tes") == []
+    assert len(index) == 3
+
+
+def test_apply_keeps_the_sorted_order():
+    index = SuggestIndex()
+    for make in ("Volvo", "Audi", "Mazda", "Alfa Romeo"):
+        index.apply(None, {"make": make})
+    assert [value for _, value, _ in index.suggest("a")] == ["Alfa Romeo", "Audi"]
+    assert [value for _, value, _ in index.suggest("m")] == ["Mazda"]
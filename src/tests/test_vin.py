@@ -0,0 +1,51 @@
+import pytest
+
+from core.vin import decode_vin, normalize_vin
+
+
+def test_normalize_vin_trims_and_upper_cases():
+    assert normalize_vin("  1hgcm82633a004352\n") == "1HGCM82633A004352"
+
+
+def test_decode_vin_north_american_vin():
+    info = decode_vin("1HGCM82633A004352")
+    assert info.valid
+    assert info.make == "Honda"
+    assert info.model_year == 2003
+    assert info.check_digit_valid is True
+
+
+def test_decode_vin_check_digit_x():
+    info = decode_vin("1M8GDM9AXKP042788")
+    assert info.valid
+    assert info.make is None  # производителя нет в таблице WMI
+    assert info.check_digit_valid is True
+
+
+def test_decode_vin_detects_a_wrong_check_digit():
+    assert decode_vin("1HGCM82643A004352").check_digit_valid is False
+
+
+def test_decode_vin_skips_the_check_digit_outside_north_america():
+    info = decode_vin("WBA3A5C51CF256651")
+    assert info.make == "BMW"
+    assert info.check_digit_valid is None
+
+
+def test_decode_vin_picks_the_latest_year_for_a_reused_code():
+    # Код "A" означает 1980 и 2010, берется последний
+    assert decode_vin("1HGCM8263AA004352").model_year == 2010
+
+
+def test_decode_vin_unknown_year_code():
+    assert decode_vin("1HGCM826X0A004352").model_year is None
+
+
+@pytest.mark.parametrize(
+    "vin",
+    ["", "1HGCM82633A00435", "1HGCM82633A0043521", "1HGCM82633A00435O"],
+)
+def test_decode_vin_rejects_malformed_vins(vin):
+    info = decode_vin(vin)
+    assert not info.valid
+    assert info.make is None and info.model_year is None
@@ -0,0 +1,137 @@
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, TypeVar
+
+import orjson
+
+from settings import get_settings
+
+config = get_settings()
+
+T = TypeVar("T")
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    stale: int = 0  # записи прошлых поколений каталога, найденные при чтении
+    expired: int = 0  # записи с истекшим TTL
+    evictions: int = 0  # вытеснены из-за лимита памяти
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass
+class _Entry:
+    value: Any
+    generation: int
+    expires_at: float
+    rows: int
+
+
+class QueryCache:
+    """LRU cache of query result pages in the memory of the current worker.
+
+    Every entry is stamped with the catalog generation it was read at. A
+    catalog write bumps the generation, which expires all older entries at
+    once without enumerating keys; they are dropped when next read or
+    pushed out by the LRU. Memory is bounded by the total number of cached
+    rows, so a few large pages cannot crowd the limit past its budget.
+    """
+
+    def __init__(self, ttl: float = 30.0, max_rows: int = 50_000):
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self.generation = 0
+        self.stats = CacheStats()
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._rows = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def rows(self) -> int:
+        return self._rows
+
+    @staticmethod
+    def make_key(namespace: str, **params: Any) -> str:
+        """Hash of the parameters, equal for filters that select the same rows.
+
+        None values are dropped and strings are trimmed and lower-cased, as
+        the catalog filters compare them case-insensitively.
+        """
+        normalized = {
+            name: value.strip().lower() if isinstance(value, str) else value
+            for name, value in params.items()
+            if value is not None
+        }
+        payload = orjson.dumps(normalized, option=orjson.OPT_SORT_KEYS)
+        return f"{namespace}:{hashlib.blake2b(payload, digest_size=16).hexdigest()}"
+
+    def bump(self, *_) -> int:
+        """Expires everything cached so far; call after a catalog write."""
+        self.generation += 1
+        return self.generation
+
+    def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.generation != self.generation:
+                self.stats.stale += 1
+                self._discard(key)
+            elif entry.expires_at <= time.monotonic():
+                self.stats.expired += 1
+                self._discard(key)
+            else:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return entry.value
+        self.stats.misses += 1
+        return None
+
+    def put(self, key: str, value: Any, generation: int | None = None) -> None:
+        """Caches `value` read at `generation` (the current one by default)."""
+        generation = self.generation if generation is None else generation
+        rows = len(value) if isinstance(value, (list, tuple)) else 1
+        if generation != self.generation or rows > self.max_rows:
+            return  # результат устарел еще до записи в кэш
+        self._discard(key)
+        self._entries[key] = _Entry(
+            value, generation, time.monotonic() + self.ttl, rows
+        )
+        self._rows += rows
+        while self._rows > self.max_rows:
+            _, evicted = self._entries.popitem(last=False)
+            self._rows -= evicted.rows
+            self.stats.evictions += 1
+
+    async def get_or_load(self, key: str, load: Callable[[], Awaitable[T]]) -> T:
+        value = self.get(key)
+        if value is not None:
+            return value
+        # Поколение берется до запроса: запись во время чтения не попадет в кэш
+        generation = self.generation
+        value = await load()
+        self.put(key, value, generation)
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._rows = 0
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._rows -= entry.rows
+
+
+catalog_cache = QueryCache(
+    ttl=config.query_cache_ttl_seconds, max_rows=config.query_cache_max_rows
+)
@@ -0,0 +1,148 @@
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import timedelta
+
+from sqlalchemy import Float, case, cast, delete, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from core.exceptions import TooManyRequestsError
+from infrastructure.models import RateLimitBucket
+from infrastructure.postgres_db import database
+from settings import get_settings
+
+config = get_settings()
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    capacity: int  # размер корзины (допустимый всплеск)
+    period: float  # за сколько секунд корзина наполняется целиком
+
+    @property
+    def rate(self) -> float:
+        """Tokens added per second."""
+        return self.capacity / self.period
+
+    @classmethod
+    def parse(cls, value: str) -> "RateLimit":
+        """Parses a limit in the "<requests>/<seconds>" format, e.g. "5/60"."""
+        capacity, period = value.split("/", 1)
+        limit = cls(capacity=int(capacity), period=float(period))
+        if limit.capacity <= 0 or limit.period <= 0:
+            raise ValueError(f"Invalid rate limit: {value!r}")
+        return limit
+
+
+class InMemoryRateLimitBackend:
+    """Token buckets in the memory of the current worker."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, list[float]] = OrderedDict()
+
+    async def hit(self, key: str, limit: RateLimit) -> tuple[bool, float]:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = [float(limit.capacity), now]
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+
+        tokens = min(limit.capacity, bucket[0] + (now - bucket[1]) * limit.rate)
+        bucket[1] = now
+        if tokens >= 1:
+            bucket[0] = tokens - 1
+            return True, 0.0
+        bucket[0] = tokens
+        return False, (1 - tokens) / limit.rate
+
+
+class PostgresRateLimitBackend:
+    """Token buckets shared by all workers, updated with a single atomic upsert."""
+
+    async def hit(self, key: str, limit: RateLimit) -> tuple[bool, float]:
+        now = func.clock_timestamp()
+        elapsed = cast(func.extract("epoch", now - RateLimitBucket.updated_at), Float)
+        refilled = func.least(
+            float(limit.capacity), RateLimitBucket.tokens + elapsed * limit.rate
+        )
+        stmt = (
+            pg_insert(RateLimitBucket)
+            .values(key=key, tokens=limit.capacity - 1, allowed=True, updated_at=now)
+            .on_conflict_do_update(
+                index_elements=[RateLimitBucket.key],
+                set_={
+                    "tokens": case((refilled >= 1, refilled - 1), else_=refilled),
+                    "allowed": refilled >= 1,
+                    "updated_at": now,
+                },
+            )
+            .returning(RateLimitBucket.tokens, RateLimitBucket.allowed)
+        )
+        async with database.engine.begin() as connection:
+            tokens, allowed = (await connection.execute(stmt)).one()
+        if allowed:
+            return True, 0.0
+        return False, (1 - tokens) / limit.rate
+
+    async def purge_idle(self, older_than: timedelta) -> int:
+        """Deletes buckets not hit for `older_than`; returns how many.
+
+        A bucket idle for longer than its refill period is full again, so
+        dropping it is the same as starting a new one.
+        """
+        stmt = delete(RateLimitBucket).where(
+            RateLimitBucket.updated_at < func.clock_timestamp() - older_than
+        )
+        async with database.engine.begin() as connection:
+            result = await connection.execute(stmt)
+        return result.rowcount
+
+
+class RateLimiter:
+    def __init__(self, name: str, limit: RateLimit, backend=None):
+        self.name = name
+        self.limit = limit
+        self.backend = backend or get_rate_limit_backend()
+
+    async def check(self, identity: str | None) -> None:
+        """Takes a token for `identity` or raises TooManyRequestsError."""
+        if not identity:
+            return
+        allowed, retry_after = await self.backend.hit(
+            f"{self.name}:{identity}", self.limit
+        )
+        if not allowed:
+            raise TooManyRequestsError(retry_after=max(1, math.ceil(retry_after)))
+
+
+def refill_window() -> timedelta:
+    """The longest refill period among the configured limits."""
+    limits = (
+        config.auth_token_rate_limit_ip,
+        config.auth_token_rate_limit_username,
+        config.auth_register_rate_limit_ip,
+    )
+    return timedelta(seconds=max(RateLimit.parse(value).period for value in limits))
+
+
+rate_limit_backend: InMemoryRateLimitBackend | PostgresRateLimitBackend | None = None
+
+
+def get_rate_limit_backend():
+    """
+    Возвращает глобальный бэкенд лимитов запросов
+    """
+    global rate_limit_backend
+
+    if not rate_limit_backend:
+        if config.rate_limit_backend == "postgres":
+            rate_limit_backend = PostgresRateLimitBackend()
+        else:
+            rate_limit_backend = InMemoryRateLimitBackend()
+    return rate_limit_backend
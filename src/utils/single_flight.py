@@ -0,0 +1,56 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class SingleFlightStats:
+    calls: int = 0  # вызовы, выполненные на самом деле
+    shared: int = 0  # вызовы, получившие результат чужого вызова
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one.
+
+    The first caller runs the function; callers arriving while it is in
+    flight wait for its result or exception instead of repeating the work.
+    The call runs in the first caller's task, so it may use that request's
+    session. If that caller is cancelled, the call is cancelled with it and
+    one of the waiting callers starts it again.
+    """
+
+    def __init__(self):
+        self.stats = SingleFlightStats()
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        while (call := self._calls.get(key)) is not None:
+            try:
+                result = await asyncio.shield(call)
+            except asyncio.CancelledError:
+                # Отменили не нас, а первого вызвавшего - повторяем вызов сами
+                if not call.cancelled() or asyncio.current_task().cancelling():
+                    raise
+            else:
+                self.stats.shared += 1
+                return result
+
+        call = asyncio.get_running_loop().create_future()
+        self._calls[key] = call
+        self.stats.calls += 1
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            call.cancel()
+            raise
+        except BaseException as exc:
+            call.set_exception(exc)
+            call.exception()  # без ожидающих исключение не попадет в лог asyncio
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            del self._calls[key]